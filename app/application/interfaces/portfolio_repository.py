@@ -1,6 +1,8 @@
-from typing import Protocol, Sequence, Optional
+from typing import Protocol, Sequence, Optional, Tuple, List
+from uuid import UUID
 
 from app.infrastructure.models.portfolio_model import Portfolio
+from app.infrastructure.repositories._pagination import KeysetPage
 
 
 class IPortfolioRepository(Protocol):
@@ -8,7 +10,13 @@ class IPortfolioRepository(Protocol):
 
     async def get(self, portfolio_id: int) -> Optional[Portfolio]: ...
 
-    async def list(self, skip: int = 0, limit: int = 50, q: str | None = None) -> Sequence[Portfolio]: ...
+    async def version(self, portfolio_id: int, lock: bool = False) -> Optional[UUID]: ...
+
+    async def list(self, skip: int = 0, limit: int = 50, q: str | None = None, total_mode: str = "exact",
+                   fuzzy: bool = False) -> Tuple[Optional[int], List[Portfolio], bool]: ...
+
+    async def list_keyset(self, limit: int = 50, q: str | None = None,
+                          cursor: str | None = None, fuzzy: bool = False) -> KeysetPage[Portfolio]: ...
 
     async def update(self, portfolio_id: int, data: dict, concurrency_guid: str) -> Portfolio: ...
 
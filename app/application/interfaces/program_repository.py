@@ -1,9 +1,13 @@
 from typing import Protocol, Sequence, Optional
+from uuid import UUID
 from app.infrastructure.models.program_model import Program
+from app.infrastructure.repositories._pagination import KeysetPage
 
 class IProgramRepository(Protocol):
     async def create(self, data: dict) -> Program: ...
     async def get(self, program_id: int) -> Optional[Program]: ...
-    async def list_by_portfolio(self, portfolio_id: int, skip: int = 0, limit: int = 50, q: str | None = None) -> Sequence[Program]: ...
+    async def version(self, program_id: int, lock: bool = False) -> Optional[UUID]: ...
+    async def list_by_portfolio(self, portfolio_id: int, skip: int = 0, limit: int = 50, q: str | None = None, fuzzy: bool = False) -> Sequence[Program]: ...
+    async def list_by_portfolio_keyset(self, portfolio_id: int, limit: int = 50, q: str | None = None, cursor: str | None = None, fuzzy: bool = False) -> KeysetPage[Program]: ...
     async def update(self, program_id: int, data: dict, concurrency_guid: str) -> Program: ...
     async def soft_delete(self, program_id: int, concurrency_guid: str) -> Program: ...
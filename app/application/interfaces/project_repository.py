@@ -1,14 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Sequence, Mapping, Any
+import uuid
+from datetime import datetime
+from typing import Collection, Optional, Sequence, Mapping, Any, Tuple
 from app.infrastructure.models.project_model import Project
+from app.infrastructure.repositories._pagination import KeysetPage
 
 class IProjectRepository(ABC):
     @abstractmethod
-    async def list(self, limit: int = 50, offset: int = 0) -> Sequence[Project]: ...
+    async def list(self, limit: int = 50, offset: int = 0,
+                   project_ids: Optional[Collection[int]] = None) -> Sequence[Project]: ...
+    @abstractmethod
+    async def list_keyset(self, limit: int = 50, cursor: Optional[str] = None,
+                          project_ids: Optional[Collection[int]] = None) -> KeysetPage[Project]: ...
     @abstractmethod
     async def get_by_id(self, project_id: int) -> Optional[Project]: ...
     @abstractmethod
-    async def create(self, data: Mapping[str, Any]) -> Project: ...
+    async def version(self, project_id: int,
+                      lock: bool = False) -> Optional[Tuple[uuid.UUID, Optional[datetime], int]]: ...
+    @abstractmethod
+    async def create(self, data: Mapping[str, Any], manager_id: Optional[int] = None) -> Project: ...
     @abstractmethod
     async def update_partial(self, project_id: int, fields: Mapping[str, Any]) -> Optional[Project]: ...
     @abstractmethod
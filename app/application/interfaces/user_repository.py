@@ -1,20 +1,29 @@
 
 from abc import ABC, abstractmethod
-from typing import Optional, Sequence
-from app.infrastructure.models.user_model import User as UserModel
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+from app.infrastructure.models.user_model import User as UserModel, UserSnapshot
+from app.infrastructure.repositories._pagination import KeysetPage
 
 class IUserRepository(ABC):
     @abstractmethod
-    async def get_by_id(self, id_: int) -> Optional[UserModel]: ...
+    async def get_by_id(self, id_: int) -> Optional[UserSnapshot]: ...
     @abstractmethod
-    async def get_by_username(self, username: str) -> Optional[UserModel]: ...
+    async def get_by_username(self, username: str) -> Optional[UserSnapshot]: ...
     @abstractmethod
-    async def get_by_email(self, email: str) -> Optional[UserModel]: ...
+    async def get_by_email(self, email: str) -> Optional[UserSnapshot]: ...
     @abstractmethod
     async def create(self, user: UserModel) -> UserModel: ...
     @abstractmethod
+    async def existing_identities(self, usernames: Iterable[str], emails: Iterable[str]) -> Tuple[Set[str], Set[str]]: ...
+    @abstractmethod
+    async def bulk_create(self, rows: List[dict]) -> List[UserModel]: ...
+    @abstractmethod
+    async def bulk_set_flags(self, ids: Iterable[int], **flags: bool) -> List[int]: ...
+    @abstractmethod
     async def list(self, limit: int = 50, offset: int = 0) -> Sequence[UserModel]: ...
     @abstractmethod
+    async def list_keyset(self, limit: int = 50, cursor: Optional[str] = None) -> KeysetPage[UserModel]: ...
+    @abstractmethod
     async def update_fields(self, id_: int, fields: dict) -> Optional[UserModel]: ...
     @abstractmethod
     async def delete_user_and_return(self, id_: int) -> Optional[UserModel]: ...
@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import update
+from sqlalchemy import func, update
+from app.core.response_cache import program_tag
 from app.infrastructure.models.program_model import Program
+from app.infrastructure.repositories._utils import notify_response_cache
 
 class ProgramRulesService:
     """Cross-entity rules that require DB access but are business logic."""
@@ -15,4 +17,11 @@ class ProgramRulesService:
         )
         if skip_program_id:
             stmt = stmt.where(Program.id != skip_program_id)
-        await self.session.execute(stmt.values(is_default=False))
+        # A new version per demoted row, or their ETags would keep validating stale copies
+        res = await self.session.execute(
+            stmt.values(is_default=False, concurrency_guid=func.gen_random_uuid()).returning(Program.id)
+        )
+        ids = res.scalars().all()
+        if ids:
+            # Their cached single-program responses still say is_default=true
+            await notify_response_cache(self.session, *(program_tag(i) for i in ids))
@@ -1,6 +1,6 @@
 from sqlalchemy.exc import IntegrityError
 from app.application.interfaces.user_repository import IUserRepository
-from app.core.settings import get_password_hash
+from app.core.hashing import password_hasher
 from app.presentation.schemas.user_schema import UserCreate, UserOut, UserSummary
 from app.infrastructure.models.user_model import User as UserModel
 
@@ -20,7 +20,7 @@ class CreateUserUseCase:
         if await self.repo.get_by_email(email):
             raise ValueError("Email already exists")
 
-        hashed = get_password_hash(payload.password)
+        hashed = await password_hasher.hash(payload.password)
 
         model = UserModel(
             username=username,
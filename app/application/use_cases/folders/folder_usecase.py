@@ -0,0 +1,54 @@
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.models.folder_model import Folder
+from app.infrastructure.repositories.folder_repository_sqlalchemy import FolderRepository
+
+
+class CreateFolder:
+    def __init__(self, session: AsyncSession):
+        self.repo = FolderRepository(session)
+
+    async def __call__(self, project_id: int, name: str, parent_id: Optional[int] = None) -> Optional[Folder]:
+        return await self.repo.create(project_id, name, parent_id)
+
+
+class ListFolders:
+    def __init__(self, session: AsyncSession):
+        self.repo = FolderRepository(session)
+
+    async def __call__(self, project_id: int, root_id: Optional[int] = None) -> List[dict]:
+        return await self.repo.list(project_id, root_id)
+
+
+class GetFolder:
+    def __init__(self, session: AsyncSession):
+        self.repo = FolderRepository(session)
+
+    async def __call__(self, project_id: int, folder_id: int) -> Optional[Folder]:
+        return await self.repo.get(project_id, folder_id)
+
+
+class RenameFolder:
+    def __init__(self, session: AsyncSession):
+        self.repo = FolderRepository(session)
+
+    async def __call__(self, project_id: int, folder_id: int, name: str) -> Optional[Folder]:
+        return await self.repo.rename(project_id, folder_id, name)
+
+
+class MoveFolder:
+    def __init__(self, session: AsyncSession):
+        self.repo = FolderRepository(session)
+
+    async def __call__(self, project_id: int, folder_id: int, parent_id: Optional[int]) -> Optional[Folder]:
+        return await self.repo.move(project_id, folder_id, parent_id)
+
+
+class DeleteFolder:
+    def __init__(self, session: AsyncSession):
+        self.repo = FolderRepository(session)
+
+    async def __call__(self, project_id: int, folder_id: int) -> bool:
+        return await self.repo.delete(project_id, folder_id)
@@ -0,0 +1,24 @@
+from fastapi import HTTPException, status
+
+from app.application.interfaces.user_repository import IUserRepository
+from app.core.hashing import password_hasher
+from app.core.security import create_access_token
+from app.presentation.schemas.auth_schema import TokenRequest, TokenResponse
+
+
+class IssueTokenUseCase:
+    def __init__(self, repo: IUserRepository) -> None:
+        self.repo = repo
+
+    async def execute(self, payload: TokenRequest) -> TokenResponse:
+        user = await self.repo.get_by_username(payload.username.strip())
+        # Same answer for unknown user and wrong password
+        if not user or not await password_hasher.verify(payload.password, user.hashed_password):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password",
+                                headers={"WWW-Authenticate": "Bearer"})
+        if user.locked or not user.active or not user.approved:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                                detail="User is locked, inactive or not approved")
+        token, ttl = create_access_token(user.id, user.username, admin=user.admin, approved=user.approved,
+                                         locked=user.locked)
+        return TokenResponse(access_token=token, expires_in=ttl)
@@ -1,3 +1,6 @@
+from typing import Optional
+from uuid import UUID
+
 from fastapi import HTTPException
 from app.application.interfaces.portfolio_repository import IPortfolioRepository
 from app.presentation.schemas.portfolio_schema import PortfolioOut
@@ -16,3 +19,6 @@ class GetPortfolioUseCase:
         if not obj:
             raise HTTPException(status_code=404, detail="Portfolio not found")
         return PortfolioOut.model_validate(obj, from_attributes=True)
+
+    async def version(self, portfolio_id: int, lock: bool = False) -> Optional[UUID]:
+        return await self.repo.version(portfolio_id, lock=lock)
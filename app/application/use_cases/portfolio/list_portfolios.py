@@ -1,15 +1,22 @@
 from typing import Optional
 
 from app.application.interfaces.portfolio_repository import IPortfolioRepository
-from app.presentation.schemas.portfolio_schema import PortfolioPagedResult
+from app.presentation.schemas.portfolio_schema import PortfolioPagedResult, PortfolioCursorPage
 
 
 class ListPortfoliosUseCase:
     def __init__(self, repo: IPortfolioRepository) -> None:
         self.repo = repo
 
-    async def execute(self, skip: int = 0, limit: int = 50, q: Optional[str] = None) -> list[PortfolioPagedResult]:
-        total, items = await self.repo.list(skip=skip, limit=limit, q=q)
+    async def execute(self, skip: int = 0, limit: int = 50, q: Optional[str] = None,
+                      total_mode: str = "exact", fuzzy: bool = False) -> PortfolioPagedResult:
+        total, items, has_more = await self.repo.list(skip=skip, limit=limit, q=q, total_mode=total_mode, fuzzy=fuzzy)
         page = skip // limit + 1 if limit else 1
 
-        return {"total": total, "items": items, "page": page, "page_size": limit}
+        return {"total": total, "items": items, "page": page, "page_size": limit, "has_more": has_more}
+
+    async def execute_keyset(self, limit: int = 50, q: Optional[str] = None,
+                             cursor: Optional[str] = None, fuzzy: bool = False) -> PortfolioCursorPage:
+        page = await self.repo.list_keyset(limit=limit, q=q, cursor=cursor, fuzzy=fuzzy)
+        return {"items": page.items, "next_cursor": page.next_cursor, "prev_cursor": page.prev_cursor,
+                "page_size": limit}
@@ -1,3 +1,6 @@
+from typing import Optional
+from uuid import UUID
+
 from app.application.interfaces.portfolio_repository import IPortfolioRepository
 from app.presentation.schemas.portfolio_schema import PortfolioUpdate, PortfolioOut
 
@@ -6,9 +9,12 @@ class UpdatePortfolioUseCase:
     def __init__(self, repo: IPortfolioRepository) -> None:
         self.repo = repo
 
-    async def execute(self, portfolio_id: int, payload: PortfolioUpdate) -> PortfolioOut:
+    async def execute(self, portfolio_id: int, payload: PortfolioUpdate,
+                      concurrency_guid: Optional[UUID] = None) -> PortfolioOut:
         data = payload.model_dump(exclude_unset=True)
-        concurrency_guid = data.pop("concurrency_guid")
+        # An If-Match version checked by the route wins over the one in the body
+        body_guid = data.pop("concurrency_guid", None)
+        concurrency_guid = concurrency_guid or body_guid
         try:
             updated = await self.repo.update(portfolio_id, data, concurrency_guid)
         except Exception as e:
@@ -1,3 +1,6 @@
+from typing import Optional
+from uuid import UUID
+
 from fastapi import HTTPException
 from app.application.interfaces.program_repository import IProgramRepository
 from app.presentation.schemas.program_schema import ProgramOut
@@ -7,7 +10,10 @@ class GetProgramUseCase:
         self.repo = repo
 
     async def execute(self, program_id: int) -> ProgramOut:
-        obj = await self.repo.get_by_id(program_id)
+        obj = await self.repo.get(program_id)
         if not obj:
             raise HTTPException(status_code=404, detail="Program not found")
         return ProgramOut.model_validate(obj, from_attributes=True)
+
+    async def version(self, program_id: int, lock: bool = False) -> Optional[UUID]:
+        return await self.repo.version(program_id, lock=lock)
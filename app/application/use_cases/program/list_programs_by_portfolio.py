@@ -1,11 +1,22 @@
 from typing import Optional
 from app.application.interfaces.program_repository import IProgramRepository
-from app.presentation.schemas.program_schema import ProgramOut
+from app.presentation.schemas.program_schema import ProgramOut, ProgramCursorPage
 
 class ListProgramsByPortfolioUseCase:
     def __init__(self, repo: IProgramRepository) -> None:
         self.repo = repo
 
-    async def execute(self, portfolio_id: int, skip: int = 0, limit: int = 50, q: Optional[str] = None) -> list[ProgramOut]:
-        rows = await self.repo.list_by_portfolio(portfolio_id, skip=skip, limit=limit, q=q)
+    async def execute(self, portfolio_id: int, skip: int = 0, limit: int = 50, q: Optional[str] = None,
+                      fuzzy: bool = False) -> list[ProgramOut]:
+        rows = await self.repo.list_by_portfolio(portfolio_id, skip=skip, limit=limit, q=q, fuzzy=fuzzy)
         return [ProgramOut.model_validate(r, from_attributes=True) for r in rows]
+
+    async def execute_keyset(self, portfolio_id: int, limit: int = 50, q: Optional[str] = None,
+                             cursor: Optional[str] = None, fuzzy: bool = False) -> ProgramCursorPage:
+        page = await self.repo.list_by_portfolio_keyset(portfolio_id, limit=limit, q=q, cursor=cursor, fuzzy=fuzzy)
+        return ProgramCursorPage(
+            items=[ProgramOut.model_validate(r, from_attributes=True) for r in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            page_size=limit,
+        )
@@ -1,3 +1,6 @@
+from typing import Optional
+from uuid import UUID
+
 from app.application.interfaces.program_repository import IProgramRepository
 from app.application.services.program_rules import ProgramRulesService
 from app.presentation.schemas.program_schema import ProgramUpdate, ProgramOut
@@ -7,17 +10,20 @@ class UpdateProgramUseCase:
         self.repo = repo
         self.rules = rules
 
-    async def execute(self, program_id: int, payload: ProgramUpdate) -> ProgramOut:
+    async def execute(self, program_id: int, payload: ProgramUpdate,
+                      concurrency_guid: Optional[UUID] = None) -> ProgramOut:
         data = payload.model_dump(exclude_unset=True)
-        concurrency_guid = data.pop("concurrency_guid")
+        # An If-Match version checked by the route wins over the one in the body
+        body_guid = data.pop("concurrency_guid", None)
+        concurrency_guid = concurrency_guid or body_guid
         # Enforce default uniqueness if toggling on (and consider portfolio_id changes)
         if data.get("is_default"):
             # Need target portfolio_id (either new or current)
             # Simpler approach: prefetch current to know portfolio_id if not provided
-            current = await self.repo.get_by_id(program_id)
+            current = await self.repo.get(program_id)
             target_portfolio_id = data.get("portfolio_id") or (current.portfolio_id if current else None)
             if target_portfolio_id:
                 await self.rules.ensure_single_default_in_portfolio(target_portfolio_id, skip_program_id=program_id)
 
-        updated = await self.repo.update_with_concurrency(program_id, data, concurrency_guid)
+        updated = await self.repo.update(program_id, data, concurrency_guid)
         return ProgramOut.model_validate(updated, from_attributes=True)
@@ -7,7 +7,8 @@ class CreateProjectUseCase:
     def __init__(self, repo: IProjectRepository) -> None:
         self.repo = repo
 
-    async def execute(self, payload: ProjectCreate, existing_project_id: Optional[int] = None) -> ProjectOut:
+    async def execute(self, payload: ProjectCreate, existing_project_id: Optional[int] = None,
+                      manager_id: Optional[int] = None) -> ProjectOut:
         data = payload.model_dump(exclude_unset=True)
         if existing_project_id is not None:
             src = await self.repo.get_by_id(existing_project_id)
@@ -15,5 +16,5 @@ class CreateProjectUseCase:
                 src_dct = ProjectOut.model_validate(src, from_attributes=True).model_dump()
                 for k, v in src_dct.items():
                     data.setdefault(k, v)
-        created = await self.repo.create(data)
+        created = await self.repo.create(data, manager_id=manager_id)
         return ProjectOut.model_validate(created, from_attributes=True)
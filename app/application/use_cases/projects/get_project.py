@@ -1,13 +1,31 @@
+from typing import Optional
+
 from app.application.interfaces.project_repository import IProjectRepository
-from app.presentation.schemas.project_schema import ProjectOut, ProjectSummary
+from app.infrastructure.repositories.project_progress_repository_sqlalchemy import ProjectProgressRepository
+from app.presentation.schemas.project_schema import ProjectOut, ProjectSummary, ProjectProgressOut, ProgressRollup
 
 class GetProjectUseCase:
-    def __init__(self, repo: IProjectRepository) -> None:
+    def __init__(self, repo: IProjectRepository, progress: Optional[ProjectProgressRepository] = None) -> None:
         self.repo = repo
+        self.progress = progress
 
     async def execute_full(self, project_id: int) -> ProjectOut | None:
         obj = await self.repo.get_by_id(project_id)
-        return None if not obj else ProjectOut.model_validate(obj, from_attributes=True)
+        if not obj:
+            return None
+        out = ProjectOut.model_validate(obj, from_attributes=True)
+        if self.progress is not None:
+            # Persisted rollups (project-wide row first), never a live aggregate
+            rows = await self.progress.for_project(project_id)
+            if rows:
+                out.Progress = ProjectProgressOut.model_validate(rows[0], from_attributes=True)
+                out.Progress.releases = [ProgressRollup.model_validate(r, from_attributes=True) for r in rows[1:]]
+                out.PercentComplete = rows[0].percent_complete if rows[0].percent_complete is not None \
+                    else out.PercentComplete
+        return out
+
+    async def version(self, project_id: int, lock: bool = False) -> Optional[tuple]:
+        return await self.repo.version(project_id, lock=lock)
 
     async def execute_summary(self, project_id: int) -> ProjectSummary | None:
         obj = await self.repo.get_by_id(project_id)
@@ -1,10 +1,39 @@
+from typing import Collection, Optional, Sequence
+
 from app.application.interfaces.project_repository import IProjectRepository
-from app.presentation.schemas.project_schema import ProjectSummary
+from app.infrastructure.models.project_model import Project
+from app.infrastructure.repositories.project_progress_repository_sqlalchemy import ProjectProgressRepository
+from app.presentation.schemas.project_schema import ProjectSummary, ProjectCursorPage, ProgressRollup
 
 class ListProjectsUseCase:
-    def __init__(self, repo: IProjectRepository) -> None:
+    def __init__(self, repo: IProjectRepository, progress: Optional[ProjectProgressRepository] = None) -> None:
         self.repo = repo
+        self.progress = progress
+
+    async def _summaries(self, rows: Sequence[Project]) -> list[ProjectSummary]:
+        items = [ProjectSummary.model_validate(r, from_attributes=True) for r in rows]
+        if self.progress is not None:
+            # One lookup for the whole page against the persisted rollups
+            rollups = await self.progress.rollups([i.ProjectId for i in items])
+            for item in items:
+                rollup = rollups.get(item.ProjectId)
+                if rollup is not None:
+                    item.Progress = ProgressRollup.model_validate(rollup, from_attributes=True)
+                    if rollup.percent_complete is not None:
+                        item.PercentComplete = rollup.percent_complete
+        return items
+
+    async def execute(self, limit: int = 50, offset: int = 0,
+                      project_ids: Optional[Collection[int]] = None) -> list[ProjectSummary]:
+        rows = await self.repo.list(limit=limit, offset=offset, project_ids=project_ids)
+        return await self._summaries(rows)
 
-    async def execute(self, limit: int = 50, offset: int = 0) -> list[ProjectSummary]:
-        rows = await self.repo.list(limit=limit, offset=offset)
-        return [ProjectSummary.model_validate(r, from_attributes=True) for r in rows]
+    async def execute_keyset(self, limit: int = 50, cursor: Optional[str] = None,
+                             project_ids: Optional[Collection[int]] = None) -> ProjectCursorPage:
+        page = await self.repo.list_keyset(limit=limit, cursor=cursor, project_ids=project_ids)
+        return ProjectCursorPage(
+            items=await self._summaries(page.items),
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            page_size=limit,
+        )
@@ -1,15 +1,24 @@
 from typing import Optional
 
+from app.infrastructure.repositories.project_progress_repository_sqlalchemy import ProjectProgressRepository
+
+
 class RefreshProjectCachesUseCase:
     """
-    Business operation to recalculate task/test progress for a project.
-    This use case is framework-agnostic; async execution is orchestrated by presentation layer.
+    Business operation to recalculate test progress rollups for a project (or one release).
+    Only scopes touched since the last run are rebuilt unless force is set.
+    Runs in the caller's transaction, which commits it. This use case is framework-agnostic;
+    queued runs go through the job queue (refresh_project_progress jobs) instead.
     """
-    async def execute(self, project_id: int, release_id: Optional[int], run_async: bool) -> dict:
-        # Plug in your domain-specific recalculation service here.
-        # For now, return a stub payload describing the intent.
+    def __init__(self, repo: ProjectProgressRepository) -> None:
+        self.repo = repo
+
+    async def execute(self, project_id: int, release_id: Optional[int], force: bool = False) -> dict:
+        result = await self.repo.refresh(project_id=project_id, release_id=release_id, force=force)
         return {
             "project_id": project_id,
             "release_id": release_id,
-            "status": "queued" if run_async else "completed",
+            "status": "completed",
+            "rebuilt_projects": result["projects"],
+            "rebuilt_releases": result["releases"],
         }
@@ -0,0 +1,155 @@
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.application.interfaces.user_repository import IUserRepository
+from app.application.use_cases.testcases.import_test_cases import Record, iter_csv_records
+from app.core.hashing import password_hasher
+from app.presentation.schemas.user_schema import UserCreate, UserProvisionReport, UserProvisionResult
+
+# One multi-row INSERT per request; keeps the statement well under the bind parameter limit
+MAX_PROVISION_ROWS = 1000
+# A JSON array is parsed whole, so its size is capped instead of its row count while reading
+MAX_PROVISION_JSON_BYTES = MAX_PROVISION_ROWS * 4096
+
+
+def _too_many_rows() -> ValueError:
+    return ValueError(f"at most {MAX_PROVISION_ROWS} users per request")
+
+
+async def parse_user_records(format: str, chunks: AsyncIterator[bytes]) -> List[Record]:
+    """
+    CSV (header row of UserCreate field names) or a JSON array of UserCreate objects.
+    Stops reading as soon as the request is over the limit rather than buffering all of it.
+    """
+    if format == "csv":
+        records: List[Record] = []
+        async for r in iter_csv_records(chunks):
+            if len(records) >= MAX_PROVISION_ROWS:
+                raise _too_many_rows()
+            records.append(r)
+        return records
+    parts: List[bytes] = []
+    size = 0
+    async for c in chunks:
+        size += len(c)
+        if size > MAX_PROVISION_JSON_BYTES:
+            raise ValueError(f"request body over {MAX_PROVISION_JSON_BYTES} bytes")
+        parts.append(c)
+    body = b"".join(parts)
+    try:
+        data = json.loads(body or b"[]")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {e.msg}")
+    if not isinstance(data, list):
+        raise ValueError("expected a JSON array of users")
+    if len(data) > MAX_PROVISION_ROWS:
+        raise _too_many_rows()
+    return [
+        (n, rec, None) if isinstance(rec, dict) else (n, None, "each item must be a JSON object")
+        for n, rec in enumerate(data, start=1)
+    ]
+
+
+class ProvisionUsersUseCase:
+    """
+    Create many users at once: validate every row, check all usernames/emails against the
+    table in one query, hash the passwords in parallel on the hashing pool and insert the
+    survivors with one statement. Every row gets an outcome; bad rows never block good ones.
+    """
+
+    def __init__(self, repo: IUserRepository) -> None:
+        self.repo = repo
+
+    async def execute(self, records: List[Record]) -> UserProvisionReport:
+        if len(records) > MAX_PROVISION_ROWS:
+            raise _too_many_rows()
+        results: List[UserProvisionResult] = []
+        valid: List[Tuple[UserProvisionResult, UserCreate]] = []
+        seen_usernames: set = set()
+        seen_emails: set = set()
+
+        for row, rec, error in records:
+            username = rec.get("username") if isinstance(rec, dict) else None
+            result = UserProvisionResult(row=row, username=username if isinstance(username, str) else None,
+                                         status="failed")
+            results.append(result)
+            if error:
+                result.errors.append(error)
+                continue
+            try:
+                payload = UserCreate.model_validate(rec)
+            except ValidationError as e:
+                result.errors.extend(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+                continue
+            # Same normalization as CreateUserUseCase
+            payload.username = payload.username.strip()
+            payload.email = payload.email.strip().lower()
+            result.username = payload.username
+            if payload.username in seen_usernames:
+                result.errors.append("duplicate username earlier in this request")
+            if payload.email in seen_emails:
+                result.errors.append("duplicate email earlier in this request")
+            if result.errors:
+                continue
+            seen_usernames.add(payload.username)
+            seen_emails.add(payload.email)
+            valid.append((result, payload))
+
+        taken_usernames, taken_emails = await self.repo.existing_identities(seen_usernames, seen_emails)
+        ready: List[Tuple[UserProvisionResult, UserCreate]] = []
+        for result, payload in valid:
+            if payload.username in taken_usernames:
+                result.errors.append("Username already exists")
+            if payload.email in taken_emails:
+                result.errors.append("Email already exists")
+            if not result.errors:
+                ready.append((result, payload))
+
+        hashes = await password_hasher.hash_many([p.password for _, p in ready])
+        hashed_rows: List[Tuple[UserProvisionResult, UserCreate, str]] = []
+        for (result, payload), hashed in zip(ready, hashes):
+            if isinstance(hashed, BaseException):
+                # The pool was at capacity or kept failing; only this row is affected
+                detail = getattr(hashed, "detail", None) or str(hashed) or type(hashed).__name__
+                result.errors.append(f"password hashing failed: {detail}")
+            else:
+                hashed_rows.append((result, payload, hashed))
+        ready = [(result, payload) for result, payload, _ in hashed_rows]
+        created = {
+            u.username: u for u in await self.repo.bulk_create([
+                self._row(payload, hashed) for _, payload, hashed in hashed_rows
+            ])
+        }
+        for result, payload in ready:
+            user = created.get(payload.username)
+            if user is None:
+                # Lost a race with a concurrent insert of the same username/email
+                result.errors.append("Username or Email already exists")
+            else:
+                result.status, result.id = "created", user.id
+
+        n_created = sum(r.status == "created" for r in results)
+        return UserProvisionReport(rows=len(results), created=n_created, failed=len(results) - n_created,
+                                   results=results)
+
+    @staticmethod
+    def _row(payload: UserCreate, hashed: str) -> dict:
+        return {
+            "username": payload.username,
+            "email": payload.email,
+            "hashed_password": hashed,
+            "admin": payload.admin or False,
+            "active": True,
+            "approved": False,
+            "locked": False,
+            "department": payload.department,
+            "unit": payload.unit,
+            "first_name": payload.first_name,
+            "middle_name": payload.middle_name,
+            "last_name": payload.last_name,
+            "rss_token": payload.rss_token,
+        }
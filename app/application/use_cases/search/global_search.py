@@ -0,0 +1,21 @@
+from typing import Collection, Optional, Sequence
+
+from fastapi import HTTPException
+
+from app.infrastructure.repositories.search_index_repository_sqlalchemy import SearchIndexRepository, ENTITY_TYPES
+from app.presentation.schemas.search_schema import SearchResult
+
+
+class GlobalSearchUseCase:
+    def __init__(self, repo: SearchIndexRepository) -> None:
+        self.repo = repo
+
+    async def execute(self, q: str, types: Optional[Sequence[str]] = None, project_id: Optional[int] = None,
+                      portfolio_id: Optional[int] = None, project_ids: Optional[Collection[int]] = None,
+                      limit: int = 20, offset: int = 0) -> SearchResult:
+        unknown = set(types or []) - set(ENTITY_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown entity type(s): {', '.join(sorted(unknown))}")
+        items = await self.repo.search(q, entity_types=types, project_id=project_id, portfolio_id=portfolio_id,
+                                       project_ids=project_ids, limit=limit, offset=offset)
+        return SearchResult(q=q, items=items, limit=limit, offset=offset)
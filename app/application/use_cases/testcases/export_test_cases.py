@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.repositories.test_case_repository_sqlalchemy import TestCaseRepository
+
+EXPORT_FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Unserializable value {value!r}")
+
+
+class ExportTestCases:
+    """
+    Yields the export as text chunks (one chunk per batch) for a StreamingResponse.
+    Rows use the TestCaseOut field names; in CSV the steps column holds a JSON array,
+    the same layout the import endpoint accepts for steps.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, release_id: Optional[int], filters: Optional[dict],
+                       format: str = "ndjson", batch_size: int = 1000) -> AsyncIterator[str]:
+        header = [c.key for c in self.repo.EXPORT_COLUMNS] + ["steps"]
+        if format == "csv":
+            yield self._csv_line(header)
+
+        async for batch in self.repo.stream_for_export(project_id, release_id, filters, batch_size):
+            if format == "csv":
+                buf = io.StringIO()
+                writer = csv.writer(buf, lineterminator="\n")
+                for case in batch:
+                    case["steps"] = json.dumps(case["steps"])
+                    writer.writerow([
+                        case[k].isoformat() if isinstance(case[k], (datetime, date)) else case[k] for k in header
+                    ])
+                yield buf.getvalue()
+            else:
+                yield "".join(json.dumps(case, default=_json_default) + "\n" for case in batch)
+
+    @staticmethod
+    def _csv_line(values) -> str:
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerow(values)
+        return buf.getvalue()
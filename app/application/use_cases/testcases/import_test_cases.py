@@ -0,0 +1,178 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.repositories.test_case_repository_sqlalchemy import TestCaseRepository
+from app.presentation.schemas.testcase_schema import ImportReport, ImportRowError, TestCaseImportRow
+
+IMPORT_FORMATS = ("ndjson", "csv")
+# Cap the error list so a completely broken file cannot blow up the response
+MAX_REPORTED_ERRORS = 1000
+
+# (1-based record number, parsed record or None, parse error or None)
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into text lines (newline kept) without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    row = 0
+    async for line in _iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, None, f"invalid JSON: {e.msg}"
+            continue
+        if not isinstance(rec, dict):
+            yield row, None, "each line must be a JSON object"
+            continue
+        yield row, rec, None
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    Header row with TestCaseCreate field names; an optional "steps" column holds a JSON array.
+    Quoted fields may span lines, so lines are joined until the quotes balance.
+    """
+    header: Optional[List[str]] = None
+    row = 0
+    buf = ""
+    async for line in _iter_lines(chunks):
+        buf += line
+        if buf.count('"') % 2:
+            continue
+        record, buf = buf, ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells mean "not provided" so optional ids validate as None
+        rec = {k: v for k, v in zip(header, values) if v != ""}
+        if "steps" in rec:
+            try:
+                rec["steps"] = json.loads(rec["steps"])
+            except json.JSONDecodeError as e:
+                yield row, None, f"steps: invalid JSON: {e.msg}"
+                continue
+        yield row, rec, None
+    if buf.strip():
+        yield row + 1, None, "unterminated quoted field"
+
+
+class ImportTestCases:
+    """
+    Streams records into the project in batches. Each batch is validated, written with
+    set-based inserts and committed on its own, so memory and transaction size stay bounded
+    no matter how large the file is. A failed batch is rolled back and reported; earlier
+    batches stay committed. dry_run validates and checks name clashes without writing.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, records: AsyncIterator[Record], dry_run: bool = False,
+                       batch_size: int = 500) -> ImportReport:
+        report = ImportReport(dry_run=dry_run, rows=0, created=0, steps_created=0, failed=0, errors=[])
+        seen_names: set = set()
+        batch: List[Tuple[int, dict]] = []
+
+        async for row, rec, error in records:
+            report.rows += 1
+            if error:
+                self._fail(report, row, rec, [error])
+                continue
+            try:
+                item = TestCaseImportRow.model_validate(rec).model_dump()
+            except ValidationError as e:
+                self._fail(report, row, rec, [
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                ])
+                continue
+            if item["name"] in seen_names:
+                self._fail(report, row, item, ["duplicate name earlier in this import"])
+                continue
+            seen_names.add(item["name"])
+            batch.append((row, item))
+            if len(batch) >= batch_size:
+                await self._flush(project_id, batch, dry_run, report)
+                batch = []
+
+        await self._flush(project_id, batch, dry_run, report)
+        return report
+
+    async def _flush(self, project_id: int, batch: List[Tuple[int, dict]], dry_run: bool,
+                     report: ImportReport) -> None:
+        if not batch:
+            return
+        # A foreign or missing folder fails its own row here instead of the whole INSERT
+        folders = await self.repo.existing_folders(
+            project_id, [item["folderId"] for _, item in batch if item.get("folderId") is not None]
+        )
+        kept: List[Tuple[int, dict]] = []
+        for row, item in batch:
+            if item.get("folderId") is not None and item["folderId"] not in folders:
+                self._fail(report, row, item, [f"folder {item['folderId']} not found in this project"])
+            else:
+                kept.append((row, item))
+        batch = kept
+        if not batch:
+            return
+        if dry_run:
+            clashes = await self.repo.existing_names(project_id, [item["name"] for _, item in batch])
+            for row, item in batch:
+                if item["name"] in clashes:
+                    self._fail(report, row, item, ["a test case with this name already exists"])
+                else:
+                    report.created += 1
+                    report.steps_created += len(item["steps"])
+            return
+
+        try:
+            ids, steps = await self.repo.bulk_create(project_id, [item for _, item in batch])
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            for row, item in batch:
+                self._fail(report, row, item, [f"batch rejected: {e.__class__.__name__}: {e}"])
+            return
+
+        report.created += len(ids)
+        report.steps_created += steps
+        for row, item in batch:
+            if item["name"] not in ids:
+                self._fail(report, row, item, ["a test case with this name already exists"])
+
+    @staticmethod
+    def _fail(report: ImportReport, row: int, rec: Optional[dict], errors: List[str]) -> None:
+        report.failed += 1
+        if len(report.errors) >= MAX_REPORTED_ERRORS:
+            report.errors_truncated = True
+            return
+        name = rec.get("name") if isinstance(rec, dict) else None
+        report.errors.append(ImportRowError(row=row, name=name if isinstance(name, str) else None, errors=errors))
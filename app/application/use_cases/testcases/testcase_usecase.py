@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -31,6 +32,14 @@ class GetTestCaseById:
         return await self.repo.get_by_id(project_id, test_case_id)
 
 
+class GetTestCaseVersion:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, test_case_id: int, lock: bool = False) -> Optional[datetime]:
+        return await self.repo.version(project_id, test_case_id, lock=lock)
+
+
 class SoftDeleteTestCase:
     def __init__(self, session: AsyncSession):
         self.repo = TestCaseRepository(session)
@@ -39,6 +48,30 @@ class SoftDeleteTestCase:
         return await self.repo.soft_delete(project_id, test_case_id)
 
 
+class InsertTestStep:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, test_case_id: int, data: dict) -> Optional[dict]:
+        return await self.repo.insert_step(project_id, test_case_id, data)
+
+
+class MoveTestStep:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, test_case_id: int, step_id: int, data: dict) -> Optional[dict]:
+        return await self.repo.move_step(project_id, test_case_id, step_id, data)
+
+
+class DeleteTestStep:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, test_case_id: int, step_id: int) -> bool:
+        return await self.repo.delete_step(project_id, test_case_id, step_id)
+
+
 class MoveTestCase:
     def __init__(self, session: AsyncSession):
         self.repo = TestCaseRepository(session)
@@ -47,12 +80,58 @@ class MoveTestCase:
         return await self.repo.move(project_id, test_case_id, folder_id)
 
 
+class BulkMoveTestCases:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, folder_id: Optional[int], ids: Optional[List[int]] = None,
+                       filters: Optional[dict] = None, release_id: Optional[int] = None) -> List[int]:
+        return await self.repo.bulk_move(project_id, folder_id, ids, filters, release_id)
+
+
+class BulkUpdateTestCases:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, changes: dict, ids: Optional[List[int]] = None,
+                       filters: Optional[dict] = None, release_id: Optional[int] = None,
+                       dry_run: bool = False) -> Tuple[int, List[int]]:
+        return await self.repo.bulk_update(project_id, changes, ids, filters, release_id, dry_run)
+
+
+class BulkSoftDeleteTestCases:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, ids: Optional[List[int]] = None, filters: Optional[dict] = None,
+                       release_id: Optional[int] = None) -> List[int]:
+        return await self.repo.bulk_soft_delete(project_id, ids, filters, release_id)
+
+
+class BulkRestoreTestCases:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, ids: Optional[List[int]] = None, filters: Optional[dict] = None,
+                       release_id: Optional[int] = None) -> Tuple[List[int], List[int]]:
+        return await self.repo.bulk_restore(project_id, ids, filters, release_id)
+
+
 class CountTestCases:
     def __init__(self, session: AsyncSession):
         self.repo = TestCaseRepository(session)
 
-    async def __call__(self, project_id: int, release_id: Optional[int], filters: Optional[dict] = None) -> int:
-        return await self.repo.count(project_id, release_id, filters)
+    async def __call__(self, project_id: int, release_id: Optional[int], filters: Optional[dict] = None,
+                       mode: str = "live") -> int:
+        return await self.repo.count(project_id, release_id, filters, mode)
+
+
+class FacetTestCases:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, release_id: Optional[int], filters: Optional[dict] = None) -> dict:
+        return await self.repo.facets(project_id, release_id, filters)
 
 
 class SearchTestCases:
@@ -60,6 +139,17 @@ class SearchTestCases:
         self.repo = TestCaseRepository(session)
 
     async def __call__(self, project_id: int, starting_row: int, number_of_rows: int,
-                       sort_field: str, sort_direction: str, release_id: Optional[int], filters: dict):
+                       sort_field: str, sort_direction: str, release_id: Optional[int], filters: dict,
+                       total_mode: str = "exact"):
         return await self.repo.search(project_id, starting_row, number_of_rows, sort_field, sort_direction, release_id,
-                                      filters or {})
+                                      filters or {}, total_mode)
+
+
+class SearchTestCasesByCursor:
+    def __init__(self, session: AsyncSession):
+        self.repo = TestCaseRepository(session)
+
+    async def __call__(self, project_id: int, number_of_rows: int, sort_field: str, sort_direction: str,
+                       release_id: Optional[int], filters: dict, cursor: Optional[str]):
+        return await self.repo.search_keyset(project_id, number_of_rows, sort_field, sort_direction, release_id,
+                                             filters or {}, cursor)
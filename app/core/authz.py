@@ -0,0 +1,53 @@
+"""
+Project authorization state kept per worker. A user's memberships are loaded in one query
+the first time they are needed and then served from memory; changes are announced with
+NOTIFY on MEMBERSHIP_CHANNEL (payload: user id) and every worker drops that user's entry.
+The TTL only bounds staleness if a notification is ever missed.
+"""
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, Mapping, Optional
+
+from app.core.cache import LruTtlCache
+from app.core.settings import settings
+from app.infrastructure.models.project_member_model import PROJECT_ROLES
+
+MEMBERSHIP_CHANNEL = "project_members"
+
+_RANK = {role: n for n, role in enumerate(PROJECT_ROLES)}
+
+# user id -> read-only {project_id: role}
+membership_cache: LruTtlCache[Mapping[int, str]] = LruTtlCache(
+    "project_memberships", settings.membership_cache_size, settings.membership_cache_ttl_seconds
+)
+
+
+# Bumped on every invalidation; a load that raced with one is not cached
+_generation = 0
+
+
+async def roles_for(user_id: int, load: Callable[[int], Awaitable[Dict[int, str]]]) -> Mapping[int, str]:
+    """The user's {project_id: role}, from the cache or else from `load` (one query)."""
+    roles = membership_cache.get(user_id)
+    if roles is None:
+        seen = _generation
+        roles = MappingProxyType(dict(await load(user_id)))
+        if seen == _generation:
+            membership_cache.set(user_id, roles)
+    return roles
+
+
+def role_allows(role: Optional[str], required: str) -> bool:
+    return role is not None and _RANK[role] >= _RANK[required]
+
+
+def invalidate_memberships(user_id: Optional[int] = None) -> None:
+    global _generation
+    _generation += 1
+    if user_id is None:
+        membership_cache.clear()
+    else:
+        membership_cache.delete(user_id)
+
+
+def on_membership_notify(payload: str) -> None:
+    invalidate_memberships(int(payload) if payload.isdigit() else None)
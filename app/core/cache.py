@@ -0,0 +1,100 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+from app.core.metrics import registry
+
+V = TypeVar("V")
+
+_caches: Dict[str, "LruTtlCache"] = {}
+
+
+def request_key(route: str, params: Mapping[str, Any]) -> str:
+    """Stable key for a read: route name + its parameters, order-insensitive."""
+    # Parameters arrive already parsed by FastAPI, so "?limit=050" and "?limit=50" agree;
+    # unset (None) parameters are dropped so they match the defaulted spelling too
+    normalized = json.dumps({k: v for k, v in params.items() if v is not None}, sort_keys=True,
+                            separators=(",", ":"), default=str)
+    return f"{route}:{hashlib.sha1(normalized.encode()).hexdigest()}"
+
+
+class LruTtlCache(Generic[V]):
+    """
+    Bounded per-process cache: least recently used entries are evicted past maxsize and
+    entries older than ttl seconds are treated as misses. ttl <= 0 or maxsize <= 0 disables it.
+    Not thread-safe; meant for the event loop thread. Store immutable values only.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        _caches[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of the cached keys, expired ones included, least recently used first."""
+        return list(self._data)
+
+    def peek(self, key: Hashable) -> Optional[V]:
+        """Like get, but without touching recency, expiry or the stats."""
+        entry = self._data.get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: V) -> None:
+        if not self.enabled:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions, "expirations": self.expirations}
+
+
+@registry.collector
+def _cache_metrics() -> Iterable:
+    for field, kind, help in (
+        ("hits", "counter", "Cache lookups answered from the cache"),
+        ("misses", "counter", "Cache lookups that fell through (absent or expired)"),
+        ("evictions", "counter", "Entries dropped to stay within maxsize"),
+        ("expirations", "counter", "Entries dropped because their TTL passed"),
+        ("size", "gauge", "Entries currently cached"),
+    ):
+        name = f"cache_{field}" + ("_total" if kind == "counter" else "")
+        yield name, kind, help, [({"cache": c.name}, c.stats()[field]) for c in _caches.values()]
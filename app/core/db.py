@@ -1,11 +1,116 @@
+import time
+import uuid
+from typing import Iterable
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
+from app.core.metrics import registry
 from app.core.settings import settings
 
-engine = create_async_engine(settings.db_url, echo=False, pool_pre_ping=True, future=True)
+# Sub-millisecond when a connection is idle in the pool; seconds when the pool is exhausted
+_POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_pool_wait = registry.histogram("db_pool_wait_seconds",
+                                "Time to get a connection from the pool (includes opening a new one)",
+                                _POOL_WAIT_BUCKETS)
+_pool_timeouts = registry.counter("db_pool_timeouts_total", "Checkouts that gave up after db_pool_timeout_seconds")
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """The default async pool, timing every checkout into db_pool_wait_seconds."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            _pool_timeouts.inc()
+            raise
+        finally:
+            _pool_wait.observe(time.perf_counter() - start)
+
+
+def _engine_options() -> dict:
+    connect_args = {
+        # asyncpg's own statement cache, and SQLAlchemy's cache of asyncpg prepared statements
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+    if settings.db_pgbouncer:
+        # Transaction pooling hands each transaction a different server connection: nothing may
+        # be cached per connection, and prepared statement names must never collide
+        connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0,
+                            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__")
+    options = {"echo": False, "pool_pre_ping": settings.db_pool_pre_ping, "connect_args": connect_args}
+    if settings.db_pool_size <= 0:
+        # No app-side pool (e.g. PgBouncer already pools): a connection per checkout
+        options["poolclass"] = NullPool
+    else:
+        options.update(poolclass=InstrumentedPool, pool_size=settings.db_pool_size,
+                       max_overflow=settings.db_max_overflow, pool_timeout=settings.db_pool_timeout_seconds,
+                       pool_recycle=settings.db_pool_recycle_seconds, pool_use_lifo=settings.db_pool_use_lifo)
+    return options
+
+
+engine = create_async_engine(settings.db_url, **_engine_options())
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 
+@registry.collector
+def _pool_metrics() -> Iterable:
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return
+    yield "db_pool_size", "gauge", "Configured persistent connections (db_pool_size)", [({}, pool.size())]
+    yield "db_pool_checked_out", "gauge", "Connections currently checked out", [({}, pool.checkedout())]
+    yield "db_pool_checked_in", "gauge", "Idle connections held by the pool", [({}, pool.checkedin())]
+    # QueuePool counts overflow from -pool_size; only connections beyond pool_size are reported
+    yield "db_pool_overflow", "gauge", "Connections open beyond db_pool_size", [({}, max(0, pool.overflow()))]
+
+
+class LazySession:
+    """
+    Request-scoped stand-in for AsyncSession that builds the real one on first use. AsyncSession
+    already waits for the first statement before checking out a pooled connection; this also
+    skips the session when a request never gets that far (cache hit, 304, validation error,
+    403), and makes commit/rollback/close of an untouched session free.
+    """
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: async_sessionmaker) -> None:
+        self._factory = factory
+        self._session: AsyncSession | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def _get(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self._get(), name)
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
 async def get_session():
-    async with AsyncSessionLocal() as session:
+    session = LazySession(AsyncSessionLocal)
+    try:
         yield session
+    finally:
+        await session.close()
@@ -0,0 +1,81 @@
+"""
+Password hashing off the event loop. bcrypt costs a few hundred ms of CPU per call; run
+inline it stalls every other request on the worker. Calls go to a small process pool, and
+once max_pending calls are queued or running further ones fail fast with 503 instead of
+piling up behind them.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+from fastapi import HTTPException
+
+from app.core.settings import settings, get_password_hash, verify_password
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _pool(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None  # default thread pool
+        if self._executor is None:
+            # spawn: forking a process that holds an event loop and DB connections is not safe
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            raise HTTPException(status_code=503, detail="Password hashing is at capacity, retry shortly",
+                                headers={"Retry-After": "1"})
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            pool = self._pool()
+            try:
+                return await loop.run_in_executor(pool, fn, *args)
+            except BrokenProcessPool:
+                # A worker died (OOM kill...); replace the pool and retry once. Every call that
+                # was in flight sees the same failure: only the first replaces it, the rest
+                # retry on that replacement instead of each starting (and leaking) a new pool.
+                if self._executor is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                return await loop.run_in_executor(self._pool(), fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def hash_many(self, passwords: Sequence[str]) -> List[Union[str, BaseException]]:
+        """
+        Hashes in input order; a password that could not be hashed (pool at capacity, workers
+        dying) gets the exception in its place so the caller can fail just that row.
+        """
+        # One call in flight per worker: a bulk request keeps every core busy without taking
+        # the whole pending budget away from single requests
+        slots = asyncio.Semaphore(max(self.workers, 1))
+
+        async def one(password: str) -> str:
+            async with slots:
+                return await self.hash(password)
+
+        return list(await asyncio.gather(*(one(p) for p in passwords), return_exceptions=True))
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run(verify_password, plain, hashed)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_max_pending)
@@ -0,0 +1,115 @@
+"""
+Minimal in-process metrics registry rendered in the Prometheus text format at GET /metrics.
+Values are per worker process. Counters and histograms are updated inline; collectors are
+callbacks read at scrape time for values that already live elsewhere (cache stats, pool state).
+"""
+import bisect
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+# (metric name, type, help, [(labels, value)])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _key(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt(name: str, labels: Iterable[Tuple[str, str]], value: float) -> str:
+    pairs = ",".join(f'{k}="{v}"' for k, v in labels)
+    value = "+Inf" if value == math.inf else repr(float(value))
+    return f"{name}{{{pairs}}} {value}" if pairs else f"{name} {value}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name, self.help = name, help
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def lines(self) -> List[str]:
+        return [_fmt(self.name, k, v) for k, v in self.values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[_key(labels)] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name, self.help = name, help
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts incl. +Inf, sum)
+        self.values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        counts, total = self.values.setdefault(_key(labels), ([0] * (len(self.buckets) + 1), [0.0]))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def lines(self) -> List[str]:
+        out = []
+        for key, (counts, total) in self.values.items():
+            running = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                running += n
+                out.append(_fmt(f"{self.name}_bucket", key + (("le", "+Inf" if bound == math.inf else repr(bound)),),
+                                running))
+            out.append(_fmt(f"{self.name}_sum", key, total[0]))
+            out.append(_fmt(f"{self.name}_count", key, running))
+        return out
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def _get(self, cls, name: str, help: str, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help, **kwargs)
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str, buckets: Optional[Sequence[float]] = None) -> Histogram:
+        return self._get(Histogram, name, help, **({"buckets": buckets} if buckets else {}))
+
+    def collector(self, fn: Callable[[], Iterable[Sample]]) -> Callable[[], Iterable[Sample]]:
+        """Register a scrape-time callback; usable as a decorator."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for m in self._metrics.values():
+            families[m.name] = (m.kind, m.help, m.lines())
+        for fn in self._collectors:
+            for name, kind, help, samples in fn():
+                _, _, lines = families.setdefault(name, (kind, help, []))
+                lines.extend(_fmt(name, _key(labels), v) for labels, v in samples)
+        out = []
+        for name, (kind, help, lines) in sorted(families.items()):
+            out += [f"# HELP {name} {help}", f"# TYPE {name} {kind}", *lines]
+        return "\n".join(out) + "\n"
+
+
+registry = Registry()
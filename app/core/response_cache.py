@@ -0,0 +1,301 @@
+"""
+Cache for hot read responses, shared across workers when the backend is Redis (any server
+speaking the protocol; fakeredis works for tests) and per process with the memory backend.
+
+Entries are keyed by route name + normalized parameters and tagged with what they were built
+from ("portfolios", "portfolio:7:programs", "project:3"). Repository writes announce the tags
+they touch with NOTIFY on RESPONSE_CACHE_CHANNEL inside their transaction, so the message goes
+out on commit and every worker drops the matching entries (for Redis the deletes are
+idempotent). The TTL only bounds staleness if a notification is ever missed.
+
+With response_cache_stale_seconds > 0, an entry past its TTL is still served for that long
+while one background task refreshes it, and it is also served when the database cannot be
+reached, which rides out short outages and failovers.
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LruTtlCache, request_key
+from app.core.db import AsyncSessionLocal
+from app.core.metrics import registry
+from app.core.settings import settings
+from app.core.singleflight import singleflight
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_CHANNEL = "response_cache"
+# NOTIFY payload that drops everything
+ALL_TAGS = "*"
+
+Loader = Callable[[AsyncSession], Awaitable[Any]]
+
+# Failures that mean "the database is unreachable", as opposed to a bad query
+_OUTAGE_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, OSError, asyncio.TimeoutError)
+
+_lookups = registry.counter("response_cache_lookups_total",
+                            "Response cache lookups by route and outcome (hit, miss, stale, outage, error)")
+
+
+def portfolios_tag() -> str:
+    return "portfolios"
+
+
+def portfolio_tag(portfolio_id: int) -> str:
+    return f"portfolio:{portfolio_id}"
+
+
+def programs_tag(portfolio_id: int) -> str:
+    return f"portfolio:{portfolio_id}:programs"
+
+
+def program_tag(program_id: int) -> str:
+    return f"program:{program_id}"
+
+
+def project_tag(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    value: Any  # JSON-compatible
+    stored_at: float  # time.time()
+
+
+class MemoryBackend:
+    """Per-process store; each worker fills its own copy and NOTIFY keeps them all in step."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        # key -> (entry, tags)
+        self._cache: LruTtlCache = LruTtlCache("responses", maxsize, ttl)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        hit = self._cache.get(key)
+        return None if hit is None else hit[0]
+
+    async def set(self, key: str, entry: CachedResponse, tags: Iterable[str]) -> None:
+        self._cache.set(key, (entry, frozenset(tags)))
+
+    async def invalidate(self, tags: Set[str]) -> None:
+        # A few thousand entries at most; a scan is cheaper than keeping a tag index in step
+        for key in self._cache.keys():
+            hit = self._cache.peek(key)
+            if hit is not None and not hit[1].isdisjoint(tags):
+                self._cache.delete(key)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBackend:
+    """
+    Shared store on a redis.asyncio-compatible client. Each tag is a set of the keys built
+    from it, expiring along with them, so invalidating a tag is SMEMBERS + one DEL.
+    """
+
+    def __init__(self, client, ttl: float, prefix: str = "qms:rc:") -> None:
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float) -> "RedisBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("response_cache_backend=redis needs the redis package (pip install redis)")
+        return cls(redis.from_url(url), ttl)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedResponse(data["v"], data["t"])
+
+    async def set(self, key: str, entry: CachedResponse, tags: Iterable[str]) -> None:
+        full_key = self.prefix + key
+        ttl_ms = max(1, int(self.ttl * 1000))
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(full_key, json.dumps({"v": entry.value, "t": entry.stored_at}, separators=(",", ":")), px=ttl_ms)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), full_key)
+            pipe.pexpire(self._tag_key(tag), ttl_ms)
+        await pipe.execute()
+
+    async def invalidate(self, tags: Set[str]) -> None:
+        tag_keys = [self._tag_key(t) for t in tags]
+        pipe = self.client.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = set().union(*(await pipe.execute()))
+        await self.client.delete(*keys, *tag_keys)
+
+    async def clear(self) -> None:
+        batch = []
+        async for key in self.client.scan_iter(match=self.prefix + "*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                await self.client.delete(*batch)
+                batch = []
+        if batch:
+            await self.client.delete(*batch)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl: float, stale: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.stale = stale
+        # Bumped per tag on every invalidation; a load that raced with one is not stored
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get_or_load(self, route: str, params: Mapping[str, Any], tags: Iterable[str], load: Loader,
+                          coalesce: bool = False) -> Any:
+        """
+        The JSON-compatible response for (route, params), from the cache or from `load`, which
+        runs in a session of its own so a background refresh can outlive the request.
+        coalesce=True shares one in-flight load between identical misses (app.core.singleflight).
+        """
+        tags = frozenset(tags)
+        key = request_key(route, params)
+        if not self.enabled:
+            return await self._fill(route, key, tags, load, coalesce, store=False)
+        try:
+            entry = await self.backend.get(key)
+        except Exception:
+            # A cache outage degrades to no cache, never to an error
+            logger.exception("response cache read failed for %s", route)
+            _lookups.inc(route=route, result="error")
+            return await self._fill(route, key, tags, load, coalesce, store=False)
+
+        age = None if entry is None else time.time() - entry.stored_at
+        if age is not None and age < self.ttl:
+            _lookups.inc(route=route, result="hit")
+            return entry.value
+        if age is not None and age < self.ttl + self.stale:
+            _lookups.inc(route=route, result="stale")
+            self._refresh_later(route, key, tags, load, coalesce)
+            return entry.value
+
+        _lookups.inc(route=route, result="miss")
+        try:
+            return await self._fill(route, key, tags, load, coalesce)
+        except _OUTAGE_ERRORS:
+            # Past the stale window but still stored (the backend keeps entries ttl + stale)
+            if entry is None or self.stale <= 0:
+                raise
+            logger.warning("database unavailable; serving a stale %s response", route)
+            _lookups.inc(route=route, result="outage")
+            return entry.value
+
+    @staticmethod
+    async def _load(load: Loader) -> Any:
+        async with AsyncSessionLocal() as session:
+            return jsonable_encoder(await load(session))
+
+    async def _fill(self, route: str, key: str, tags: frozenset, load: Loader, coalesce: bool,
+                    store: bool = True) -> Any:
+        async def run() -> Any:
+            seen = self._snapshot(tags)
+            value = await self._load(load)
+            if store and seen == self._snapshot(tags):
+                try:
+                    await self.backend.set(key, CachedResponse(value, time.time()), tags)
+                except Exception:
+                    logger.exception("response cache write failed for %s", key)
+            return value
+
+        # Coalesced, the one executing load also does the one store
+        return await (singleflight.do(route, key, run) if coalesce else run())
+
+    def _snapshot(self, tags: frozenset) -> tuple:
+        return (self._epoch, *(self._generations.get(t, 0) for t in sorted(tags)))
+
+    def _refresh_later(self, route: str, key: str, tags: frozenset, load: Loader, coalesce: bool) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._fill(route, key, tags, load, coalesce))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda t: self._refresh_done(key, t))
+
+    def _refresh_done(self, key: str, task: asyncio.Task) -> None:
+        self._refreshing.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("background refresh of %s failed: %r", key, task.exception())
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry built from any of `tags`; synchronous for the NOTIFY callback."""
+        tags = set(tags)
+        if ALL_TAGS in tags:
+            self.clear()
+            return
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+        if self.enabled and tags:
+            self._spawn(self.backend.invalidate(tags))
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._generations.clear()
+        if self.enabled:
+            self._spawn(self.backend.clear())
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._backend_done)
+
+    def _backend_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("response cache invalidation failed: %r", task.exception())
+
+    async def close(self) -> None:
+        for task in [*self._refreshing.values(), *self._tasks]:
+            task.cancel()
+        await asyncio.gather(*self._refreshing.values(), *self._tasks, return_exceptions=True)
+        if self.enabled:
+            await self.backend.close()
+
+
+def on_response_cache_notify(payload: str) -> None:
+    response_cache.invalidate(t for t in payload.split(",") if t)
+
+
+def _backend():
+    # Entries are kept past the TTL for the stale window
+    keep = settings.response_cache_ttl_seconds + max(0.0, settings.response_cache_stale_seconds)
+    if settings.response_cache_backend == "redis":
+        return RedisBackend.from_url(settings.response_cache_url, keep)
+    if settings.response_cache_backend == "memory":
+        return MemoryBackend(settings.response_cache_size, keep)
+    return None
+
+
+response_cache = ResponseCache(_backend(), settings.response_cache_ttl_seconds,
+                               max(0.0, settings.response_cache_stale_seconds))
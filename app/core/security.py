@@ -0,0 +1,150 @@
+"""
+Stateless access tokens: compact JWS (HS256) built on the standard library. The token
+carries everything the API needs to authorize a request (user id, admin, approved, locked),
+so verifying it is a constant-time HMAC check against a prepared key and never a DB query.
+
+Locking, deactivating, demoting or deleting a user cannot reach into tokens already handed
+out, so those users land on the revocation list: tokens issued before the revocation are
+refused until they would have expired anyway.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from app.core.settings import settings
+
+_HEADER = {"alg": "HS256", "typ": "JWT"}
+# Clock skew tolerated between workers/hosts when checking exp / iat
+_LEEWAY_SECONDS = 30
+
+
+class InvalidToken(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class TokenClaims:
+    user_id: int
+    username: str
+    admin: bool
+    approved: bool
+    locked: bool
+    issued_at: int
+    expires_at: int
+    token_id: str
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+@lru_cache(maxsize=1)
+def _mac() -> "hmac.HMAC":
+    # Keyed once; each token signs a copy, skipping the per-call key setup
+    if not settings.secret_key:
+        raise RuntimeError("SECRET_KEY is not configured")
+    return hmac.new(settings.secret_key.encode(), digestmod=hashlib.sha256)
+
+
+def ensure_signing_key() -> None:
+    """Raise RuntimeError now if tokens can't be signed, instead of on the first login."""
+    _mac()
+
+
+def _sign(signing_input: bytes) -> bytes:
+    mac = _mac().copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
+_ENCODED_HEADER = _b64encode(json.dumps(_HEADER, separators=(",", ":")).encode())
+
+
+def create_access_token(user_id: int, username: str, admin: bool, approved: bool, locked: bool,
+                        ttl_seconds: Optional[int] = None) -> tuple[str, int]:
+    """Returns (token, lifetime in seconds)."""
+    ttl = settings.access_token_ttl_seconds if ttl_seconds is None else ttl_seconds
+    now = int(time.time())
+    payload = {
+        "iss": settings.jwt_issuer, "sub": str(user_id), "name": username,
+        "adm": admin, "apr": approved, "lck": locked,
+        "iat": now, "exp": now + ttl, "jti": secrets.token_urlsafe(12),
+    }
+    signing_input = f"{_ENCODED_HEADER}.{_b64encode(json.dumps(payload, separators=(',', ':')).encode())}"
+    return f"{signing_input}.{_b64encode(_sign(signing_input.encode()))}", ttl
+
+
+def decode_access_token(token: str) -> TokenClaims:
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        signature = _b64decode(signature_b64)
+    except ValueError:
+        raise InvalidToken("malformed token")
+    if not hmac.compare_digest(_sign(f"{header_b64}.{payload_b64}".encode()), signature):
+        raise InvalidToken("bad signature")
+    try:
+        header = json.loads(_b64decode(header_b64))
+        payload = json.loads(_b64decode(payload_b64))
+    except ValueError:
+        raise InvalidToken("malformed token")
+    # Only the one algorithm we issue; never trust the header to pick it
+    if header != _HEADER or payload.get("iss") != settings.jwt_issuer:
+        raise InvalidToken("unexpected token header or issuer")
+    now = time.time()
+    try:
+        claims = TokenClaims(
+            user_id=int(payload["sub"]), username=str(payload["name"]), admin=bool(payload["adm"]),
+            approved=bool(payload["apr"]), locked=bool(payload["lck"]), issued_at=int(payload["iat"]),
+            expires_at=int(payload["exp"]), token_id=str(payload["jti"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        raise InvalidToken("missing or invalid claims")
+    if claims.expires_at + _LEEWAY_SECONDS < now:
+        raise InvalidToken("token expired")
+    if claims.issued_at - _LEEWAY_SECONDS > now:
+        raise InvalidToken("token issued in the future")
+    if revocations.is_revoked(claims.user_id, claims.issued_at):
+        raise InvalidToken("token revoked")
+    return claims
+
+
+class RevocationList:
+    """
+    user id -> time of revocation, per process. An entry only has to outlive the tokens it
+    blocks, so it is dropped once access_token_ttl has passed. Fed locally by the writes that
+    revoke and from the token_revocations table for revocations made by other workers.
+    """
+
+    def __init__(self) -> None:
+        self._revoked: Dict[int, float] = {}
+
+    def revoke(self, user_ids: Iterable[int], at: Optional[float] = None) -> None:
+        at = time.time() if at is None else at
+        for user_id in user_ids:
+            self._revoked[user_id] = max(at, self._revoked.get(user_id, 0.0))
+        self.prune()
+
+    def is_revoked(self, user_id: int, issued_at: int) -> bool:
+        revoked_at = self._revoked.get(user_id)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def prune(self) -> None:
+        horizon = time.time() - settings.access_token_ttl_seconds - _LEEWAY_SECONDS
+        for user_id in [u for u, at in self._revoked.items() if at < horizon]:
+            del self._revoked[user_id]
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+revocations = RevocationList()
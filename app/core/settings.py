@@ -18,8 +18,65 @@ class Settings(BaseSettings):
     app_env: str = "development"
     # This will map from env var DB_URL automatically
     db_url: str = "postgresql+asyncpg://admin:admin123@db:5432/qms"
+    # Connection pool per worker process (app.core.db); db_pool_size 0 disables app-side pooling.
+    # Peak connections per worker = db_pool_size + db_max_overflow. Size from the db_pool_*
+    # metrics: sustained db_pool_wait_seconds or any db_pool_timeouts_total means too small.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    # Replace connections older than this (-1 never); keep it below any server/LB idle cutoff
+    db_pool_recycle_seconds: int = 1800
+    # SELECT 1 on every checkout; off saves a round trip where connections don't go stale
+    db_pool_pre_ping: bool = True
+    # Reuse the most recently returned connection, letting idle ones age out via recycle
+    db_pool_use_lifo: bool = False
+    # asyncpg prepared statement cache per connection; 0 disables it
+    db_statement_cache_size: int = 100
+    # Behind PgBouncer in transaction mode: no per-connection statement caches, unique statement
+    # names. LISTEN needs a session-level connection, so point db_direct_url at Postgres itself.
+    db_pgbouncer: bool = False
+    db_direct_url: str = ""
     api_prefix: str = "/api/v1"
     log_level: str = "INFO"
+    # Test case status ids that count as done for progress / percent complete (JSON list in env).
+    # Empty leaves percent_complete unset.
+    progress_done_status_ids: list[int] = []
+    # Background job queue (jobs table). job_workers is the in-process pool size started with
+    # the API; 0 leaves the queue to the standalone worker command.
+    job_workers: int = 2
+    job_poll_interval_seconds: float = 1.0
+    job_max_attempts: int = 5
+    job_retry_base_seconds: float = 5.0
+    job_retry_max_seconds: float = 600.0
+    job_timeout_seconds: float = 900.0
+    # Running jobs whose worker has not finished them after this long are requeued
+    job_stale_after_seconds: float = 1800.0
+    # bcrypt runs in a process pool (app.core.hashing); 0 uses a thread instead. Calls beyond
+    # max_pending (queued + running) are rejected with 503.
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 16
+    # Per-process user lookup cache (get_by_id/username/email); ttl 0 disables it
+    user_cache_size: int = 10000
+    user_cache_ttl_seconds: float = 30.0
+    # Access tokens (app.core.security). secret_key must be set per deployment and shared by
+    # every worker; rotating it invalidates all outstanding tokens.
+    secret_key: str = ""
+    jwt_issuer: str = "qms-backend"
+    access_token_ttl_seconds: int = 900
+    # How often each worker pulls revocations made by other workers
+    revocation_sync_seconds: float = 5.0
+    # Per-process project membership cache; NOTIFY keeps it fresh, the TTL is a backstop
+    membership_cache_size: int = 10000
+    membership_cache_ttl_seconds: float = 300.0
+    # Hot read responses (app.core.response_cache): "memory" (per process), "redis" (shared;
+    # response_cache_url, needs the redis package) or "off". Writes invalidate via NOTIFY; the
+    # TTL is a backstop. stale_seconds > 0 serves expired entries that long while refreshing
+    # them in the background, and while the database is unreachable.
+    response_cache_backend: str = Field("memory", pattern="^(memory|redis|off)$")
+    response_cache_url: str = "redis://localhost:6379/0"
+    response_cache_size: int = 2048
+    response_cache_ttl_seconds: float = 30.0
+    response_cache_stale_seconds: float = 0.0
 
 
 
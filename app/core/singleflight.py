@@ -0,0 +1,67 @@
+"""
+Per-worker request coalescing ("single flight"). An identical read arriving while one is
+already running waits for it and shares its result instead of checking out a connection and
+running the same query again, so a thundering herd costs the pool one query per distinct
+request. Opt-in: only reads routed through `coalesce` (or a response cache load with
+coalesce=True) take part. A joining request gets a result at most one query-duration old.
+
+Results are handed to every waiter, so loaders must return immutable or JSON-compatible
+values, never ORM objects bound to the session that produced them.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import request_key
+from app.core.db import AsyncSessionLocal
+from app.core.metrics import registry
+
+Loader = Callable[[AsyncSession], Awaitable[Any]]
+
+_calls = registry.counter("singleflight_calls_total",
+                          "Coalescable reads by route: executed (ran the query) or coalesced (shared one in flight)")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, route: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            _calls.inc(route=route, result="executed")
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            _calls.inc(route=route, result="coalesced")
+        # One caller going away (client disconnect) must not cancel the run the others wait on
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved even if every waiter has gone
+
+
+singleflight = SingleFlight()
+
+
+async def coalesce(route: str, params: Mapping[str, Any], load: Loader) -> Any:
+    """load(session) once per distinct in-flight (route, params), in a session of its own."""
+
+    async def run() -> Any:
+        async with AsyncSessionLocal() as session:
+            return await load(session)
+
+    return await singleflight.do(route, request_key(route, params), run)
+
+
+@registry.collector
+def _singleflight_metrics() -> Iterable:
+    yield "singleflight_inflight", "gauge", "Distinct coalescable reads currently running", [({}, len(singleflight))]
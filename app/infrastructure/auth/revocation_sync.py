@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.db import AsyncSessionLocal
+from app.core.security import revocations
+from app.core.settings import settings
+from app.infrastructure.repositories.token_revocation_repository_sqlalchemy import TokenRevocationRepository
+
+logger = logging.getLogger(__name__)
+
+# Re-read a little behind the last seen timestamp: a revocation committed late can carry
+# an earlier revoked_at than one already seen
+_OVERLAP = timedelta(seconds=5)
+
+
+class RevocationSync:
+    """
+    Copies revocations made by other workers into this process's list, one small query per
+    interval rather than one per request. The interval is how long a locked user's token can
+    still pass on a worker that did not perform the lock.
+    """
+
+    def __init__(self, interval: Optional[float] = None) -> None:
+        self.interval = settings.revocation_sync_seconds if interval is None else interval
+        self._seen: Optional[datetime] = None
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def sync(self) -> None:
+        async with AsyncSessionLocal() as session:
+            repo = TokenRevocationRepository(session)
+            rows = await repo.since(None if self._seen is None else self._seen - _OVERLAP)
+            if self._seen is None:
+                # First pass doubles as housekeeping for rows no token can outlive
+                await repo.prune(timedelta(seconds=settings.access_token_ttl_seconds * 2))
+                await session.commit()
+        for user_id, revoked_at in rows:
+            revocations.revoke([user_id], at=revoked_at.timestamp())
+            self._seen = revoked_at if self._seen is None else max(self._seen, revoked_at)
+        if self._seen is None and not rows:
+            self._seen = datetime.fromtimestamp(0).astimezone()
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("token revocation sync failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,33 @@
+"""
+Rebuild search_documents from the source tables (initial backfill or after bulk SQL changes).
+
+    python -m app.infrastructure.commands.rebuild_search_index [--type test_case ...]
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.db import AsyncSessionLocal
+from app.infrastructure.repositories.search_index_repository_sqlalchemy import SearchIndexRepository, ENTITY_TYPES
+
+
+async def rebuild(entity_types: list[str]) -> None:
+    # One transaction per entity type keeps each swap atomic without one huge transaction
+    for entity_type in entity_types:
+        async with AsyncSessionLocal() as session:
+            await SearchIndexRepository(session).refresh(entity_type)
+            await session.commit()
+        print(f"reindexed {entity_type}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the global search index")
+    parser.add_argument("--type", dest="types", action="append", choices=ENTITY_TYPES,
+                        help="Entity type to rebuild (repeatable); default: all")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.types or list(ENTITY_TYPES)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
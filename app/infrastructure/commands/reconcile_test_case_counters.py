@@ -0,0 +1,45 @@
+"""
+Rebuild test_case_counters from test_cases and report drift.
+
+    python -m app.infrastructure.commands.reconcile_test_case_counters [--project-id N] [--dry-run]
+
+Exit code is 1 when drift was found (useful for cron/alerting), 0 otherwise.
+"""
+import argparse
+import asyncio
+import sys
+from typing import Optional
+
+from app.core.db import AsyncSessionLocal
+from app.infrastructure.repositories.test_case_counter_repository_sqlalchemy import TestCaseCounterRepository
+
+
+async def reconcile(project_id: Optional[int] = None, dry_run: bool = False) -> list[dict]:
+    async with AsyncSessionLocal() as session:
+        drift = await TestCaseCounterRepository(session).rebuild(project_id=project_id, dry_run=dry_run)
+        if dry_run:
+            await session.rollback()
+        else:
+            await session.commit()
+        return drift
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild test case counters and report drift")
+    parser.add_argument("--project-id", type=int, default=None, help="Limit to one project")
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without rewriting counters")
+    args = parser.parse_args()
+
+    drift = asyncio.run(reconcile(args.project_id, args.dry_run))
+    for d in drift:
+        print(
+            f"project={d['project_id']} release={d['release_id']} status={d['status_id']} "
+            f"type={d['type_id']} stored={d['stored']} actual={d['actual']}"
+        )
+    action = "found" if args.dry_run else "fixed"
+    print(f"{len(drift)} drifted counter key(s) {action}")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+Rebuild project_progress rollups (initial backfill, or after bulk SQL changes with --force).
+
+    python -m app.infrastructure.commands.refresh_project_progress [--project 12] [--force]
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.db import AsyncSessionLocal
+from app.infrastructure.repositories.project_progress_repository_sqlalchemy import ProjectProgressRepository
+
+
+async def refresh(project_id: int | None, force: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        result = await ProjectProgressRepository(session).refresh(project_id=project_id, force=force)
+        await session.commit()
+    print(f"refreshed {len(result['projects'])} project(s), {result['releases']} release rollup(s)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh persisted project progress rollups")
+    parser.add_argument("--project", type=int, help="Only this project; default: all")
+    parser.add_argument("--force", action="store_true", help="Rebuild every rollup, not just the changed ones")
+    args = parser.parse_args()
+    asyncio.run(refresh(args.project, args.force))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Run a job worker pool outside the API process (e.g. with JOB_WORKERS=0 on the web containers).
+
+    python -m app.infrastructure.commands.run_job_worker [--concurrency 4]
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+
+from app.core.settings import settings
+from app.infrastructure.jobs.worker import JobWorkerPool
+
+
+async def run(concurrency: int) -> None:
+    pool = JobWorkerPool(concurrency)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await pool.start()
+    print(f"job worker {pool.name} running {concurrency} worker(s)")
+    await stop.wait()
+    await pool.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Drain the background job queue")
+    parser.add_argument("--concurrency", type=int, default=max(settings.job_workers, 1),
+                        help="Jobs run at once by this process")
+    args = parser.parse_args()
+    logging.basicConfig(level=settings.log_level)
+    asyncio.run(run(args.concurrency))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
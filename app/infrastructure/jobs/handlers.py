@@ -0,0 +1,30 @@
+"""
+Job kinds and their handlers. A handler gets the worker's session and the job payload,
+does its work in that session and returns a JSON-able result; the worker commits the work
+together with the job's success, so a crash in between never records a half-done job as done.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.repositories.project_progress_repository_sqlalchemy import ProjectProgressRepository
+
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+REFRESH_PROJECT_PROGRESS = "refresh_project_progress"
+
+
+def refresh_progress_key(project_id: int, release_id: Optional[int], force: bool) -> str:
+    return f"{REFRESH_PROJECT_PROGRESS}:{project_id}:{'*' if release_id is None else release_id}:{int(force)}"
+
+
+async def refresh_project_progress(session: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    result = await ProjectProgressRepository(session).refresh(
+        project_id=payload["project_id"], release_id=payload.get("release_id"), force=payload.get("force", False)
+    )
+    return {"rebuilt_projects": result["projects"], "rebuilt_releases": result["releases"]}
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    REFRESH_PROJECT_PROGRESS: refresh_project_progress,
+}
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from app.core.db import AsyncSessionLocal
+from app.core.settings import settings
+from app.infrastructure.jobs.handlers import JOB_HANDLERS, JobHandler
+from app.infrastructure.models.job_model import Job
+from app.infrastructure.repositories.job_repository_sqlalchemy import JobRepository
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempt: int) -> timedelta:
+    """Exponential backoff with jitter: base * 2^(attempt-1), capped, scaled by 0.5-1.0."""
+    delay = min(settings.job_retry_base_seconds * 2 ** (attempt - 1), settings.job_retry_max_seconds)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+class JobWorkerPool:
+    """
+    A fixed number of worker coroutines draining the jobs table. Each worker runs one job
+    at a time, so at most `concurrency` jobs run in this process however many are queued.
+    Workers poll every poll_interval and are woken early by wake() after a local enqueue.
+    """
+
+    def __init__(self, concurrency: int, handlers: Optional[Dict[str, JobHandler]] = None,
+                 poll_interval: Optional[float] = None) -> None:
+        self.concurrency = concurrency
+        self.handlers = JOB_HANDLERS if handlers is None else handlers
+        self.poll_interval = settings.job_poll_interval_seconds if poll_interval is None else poll_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks or self.concurrency <= 0:
+            return
+        self._tasks = [asyncio.create_task(self._work(f"{self.name}:{n}")) for n in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._reap()))
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Let running jobs finish (up to timeout), then cancel; cancelled jobs are picked up as stale."""
+        self._stopping.set()
+        self._wake.set()
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def _idle(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _work(self, worker: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                async with AsyncSessionLocal() as session:
+                    jobs = await JobRepository(session).claim(worker, list(self.handlers))
+                    await session.commit()
+            except Exception:
+                logger.exception("job claim failed")
+                await self._idle(self.poll_interval)
+                continue
+            if not jobs:
+                await self._idle(self.poll_interval)
+                continue
+            for job in jobs:
+                await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        async with AsyncSessionLocal() as session:
+            repo = JobRepository(session)
+            try:
+                result = await asyncio.wait_for(
+                    self.handlers[job.kind](session, job.payload), timeout=settings.job_timeout_seconds
+                )
+                await repo.succeed(job.id, result)
+                await session.commit()
+                return
+            except Exception as e:
+                await session.rollback()
+                error = f"{e.__class__.__name__}: {e}"
+                retry_in = retry_delay(job.attempts) if job.attempts < job.max_attempts else None
+                logger.warning("job %s (%s) attempt %s failed: %s", job.id, job.kind, job.attempts, error)
+            await repo.fail(job.id, error, retry_in)
+            await session.commit()
+
+    async def _reap(self) -> None:
+        older_than = timedelta(seconds=settings.job_stale_after_seconds)
+        while not self._stopping.is_set():
+            try:
+                async with AsyncSessionLocal() as session:
+                    if n := await JobRepository(session).requeue_stale(older_than):
+                        logger.warning("requeued %s stale job(s)", n)
+                    await session.commit()
+            except Exception:
+                logger.exception("stale job sweep failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=min(60.0, settings.job_stale_after_seconds))
+            except asyncio.TimeoutError:
+                pass
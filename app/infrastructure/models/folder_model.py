@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class Folder(Base):
+    """Test case folder tree (per project). parent_id is the adjacency link; queries use FolderClosure."""
+    __tablename__ = "test_case_folders"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.project_id", ondelete="CASCADE"), nullable=False)
+    parent_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("test_case_folders.id", ondelete="CASCADE"), nullable=True
+    )
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Sibling names are unique; top-level folders (parent NULL) count as siblings too
+        Index("uq_test_case_folders_sibling_name", "project_id", "parent_id", "name",
+              unique=True, postgresql_nulls_not_distinct=True),
+    )
+
+
+class FolderClosure(Base):
+    """
+    Every (ancestor, descendant) pair in the folder tree, including (f, f) at depth 0.
+    "Everything under X" is one indexed lookup on ancestor_id; moves rewrite the pairs set-based.
+    """
+    __tablename__ = "test_case_folder_closure"
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("test_case_folders.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("test_case_folders.id", ondelete="CASCADE"), primary_key=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        # ancestors-of lookups (moves, breadcrumbs); the PK already serves descendants-of
+        Index("ix_test_case_folder_closure_descendant", "descendant_id", "depth"),
+    )
@@ -60,6 +60,9 @@ class Portfolio(Base):
             postgresql_where=sa.text("is_default IS TRUE"),
             info={"alembic_autogenerate": False},
         ),
+        # Trigram index for ILIKE '%q%' / fuzzy name search; created by the pg_trgm migration
+        Index("ix_portfolios_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+              info={"alembic_autogenerate": False}),
     )
 
 
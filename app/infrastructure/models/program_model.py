@@ -63,6 +63,9 @@ class Program(Base):
               "portfolio_id", "name",
               unique=True,
               info={"alembic_autogenerate": False}),
+        # Trigram index for ILIKE '%q%' / fuzzy name search; created by the pg_trgm migration
+        Index("ix_programs_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+              info={"alembic_autogenerate": False}),
     )
 
 
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, date
 from typing import Optional
 
 import sqlalchemy as sa
-from sqlalchemy import String, Integer, Boolean, DateTime, Date, Text
+from sqlalchemy import String, Integer, Boolean, DateTime, Date, Text, Index
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -38,6 +40,16 @@ class Project(Base):
     end_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     percent_complete: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
+    # Rotated by every write; the version behind the project's ETag / If-Match
+    concurrency_guid: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), default=uuid.uuid4, nullable=False,
+                                                        server_default=sa.text("gen_random_uuid()"))
+
     # Soft delete fields
     is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=sa.sql.false())
     deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Trigram index for ILIKE '%q%' / fuzzy name search; created by the pg_trgm migration
+        Index("ix_projects_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+              info={"alembic_autogenerate": False}),
+    )
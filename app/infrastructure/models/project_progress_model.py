@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class ProjectProgress(Base):
+    """
+    Persisted test progress rollup: one row per project (release_id NULL = all releases)
+    and one per release that has test cases. Rebuilt incrementally by ProjectProgressRepository.refresh.
+    """
+    __tablename__ = "project_progress"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.project_id", ondelete="CASCADE"), nullable=False)
+    release_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    total_cases: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    done_cases: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    percent_complete: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # {"<id>": count}; priority uses "none" for cases without one
+    by_status: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+    by_type: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+    by_priority: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+
+    # High-water marks of the sources at computation time (test_cases.updated_at is naive UTC)
+    cases_watermark: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    counters_watermark: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(),
+                                                  nullable=False)
+
+    __table_args__ = (
+        Index("uq_project_progress_scope", "project_id", "release_id", unique=True,
+              postgresql_nulls_not_distinct=True),
+    )
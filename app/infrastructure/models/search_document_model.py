@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Computed, DateTime, Integer, String, Text, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+# Text search configuration used for both the stored vector and incoming queries
+SEARCH_CONFIG = "english"
+
+
+class SearchDocument(Base):
+    """
+    One searchable document per portfolio / program / project / test case.
+    Rows are (re)built by SearchIndexRepository from the owning repository's write path;
+    the tsvector is a stored generated column so it can never disagree with title/body.
+    """
+    __tablename__ = "search_documents"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity_type: Mapped[str] = mapped_column(String(32), nullable=False)  # portfolio | program | project | test_case
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Scope columns so results can be narrowed without joining back to the entity tables
+    project_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    portfolio_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    tsv: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(body, '')), 'B')",
+            persisted=True,
+        ),
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+        Index("ix_search_documents_tsv", "tsv", postgresql_using="gin"),
+        Index("ix_search_documents_project_type", "project_id", "entity_type"),
+    )
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class TestCaseCounter(Base):
+    """
+    Active (not deleted) test case counts per (project, release, status, type).
+    Maintained by TestCaseRepository write paths in the same transaction as the change;
+    rebuilt by the reconcile command (app.infrastructure.commands.reconcile_test_case_counters).
+    """
+    __tablename__ = "test_case_counters"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.project_id", ondelete="CASCADE"), nullable=False)
+    release_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    status_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    type_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # release_id is nullable: NULLS NOT DISTINCT (PG15+) keeps one row per key for ON CONFLICT
+        Index(
+            "uq_test_case_counters_key",
+            "project_id", "release_id", "status_id", "type_id",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
@@ -1,12 +1,15 @@
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import String, Integer, ForeignKey, Boolean, Text, Index
+from sqlalchemy import BigInteger, String, Integer, ForeignKey, Boolean, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.schema import UniqueConstraint
 
 from .base import Base  # your declarative Base
 
+# Spacing between consecutive step positions; inserts take the midpoint of their neighbours
+STEP_POSITION_GAP = 65536
+
 
 class TestCase(Base):
     __tablename__ = "test_cases"
@@ -22,7 +25,9 @@ class TestCase(Base):
     priority_id: Mapped[Optional[int]] = mapped_column(Integer)
     release_id: Mapped[Optional[int]] = mapped_column(Integer)  # FK to releases if modeled
 
-    folder_id: Mapped[Optional[int]] = mapped_column(Integer)  # FK to folders if modeled
+    folder_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("test_case_folders.id", ondelete="SET NULL"), nullable=True, index=True
+    )
 
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
@@ -33,7 +38,7 @@ class TestCase(Base):
         "TestStep",
         back_populates="test_case",
         cascade="all, delete-orphan",
-        order_by="TestStep.sequence",
+        order_by="TestStep.position",
         lazy="selectin",  # avoids MissingGreenlet
     )
 
@@ -46,6 +51,22 @@ class TestCase(Base):
             unique=True,
             postgresql_where=(~(is_deleted))  # is_deleted = false
         ),
+        # Keyset pagination: one index per sortable column, id as tie-breaker
+        Index("ix_test_cases_project_updated_at_id", "project_id", "updated_at", "id",
+              postgresql_where=(~(is_deleted))),
+        Index("ix_test_cases_project_created_at_id", "project_id", "created_at", "id",
+              postgresql_where=(~(is_deleted))),
+        Index("ix_test_cases_project_name_id", "project_id", "name", "id",
+              postgresql_where=(~(is_deleted))),
+        # Progress refresh finds recently touched cases (deleted ones included) by updated_at
+        Index("ix_test_cases_updated_at", "updated_at"),
+        # Covering index so facet/count queries can run as index-only scans
+        Index("ix_test_cases_project_release_facets", "project_id", "release_id",
+              postgresql_include=["test_case_status_id", "test_case_type_id", "priority_id", "folder_id"],
+              postgresql_where=(~(is_deleted))),
+        # Trigram index for ILIKE '%q%' / fuzzy name search; created by the pg_trgm migration
+        Index("ix_test_cases_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+              info={"alembic_autogenerate": False}),
     )
 
 
@@ -54,7 +75,8 @@ class TestStep(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     test_case_id: Mapped[int] = mapped_column(ForeignKey("test_cases.id", ondelete="CASCADE"), index=True)
-    sequence: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Sparse ordering key (not shown to clients); the dense 1..n sequence is derived on output
+    position: Mapped[int] = mapped_column(BigInteger, nullable=False)
     action: Mapped[str] = mapped_column(Text, nullable=False)
     expected_result: Mapped[Optional[str]] = mapped_column(Text)
 
@@ -64,5 +86,7 @@ class TestStep(Base):
     test_case: Mapped["TestCase"] = relationship("TestCase", back_populates="steps")
 
     __table_args__ = (
-        UniqueConstraint("test_case_id", "sequence", name="uq_test_step_sequence_per_case"),
+        # Deferrable so set-based step rewrites can renumber within one transaction
+        UniqueConstraint("test_case_id", "position", name="uq_test_step_position_per_case",
+                         deferrable=True, initially="IMMEDIATE"),
     )
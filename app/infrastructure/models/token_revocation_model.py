@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class TokenRevocation(Base):
+    """
+    Users whose access tokens issued before revoked_at must be refused (locked, deactivated,
+    privileges changed, deleted). Workers mirror it into app.core.security.revocations;
+    rows older than the access token lifetime are pruned.
+    """
+    __tablename__ = "token_revocations"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(),
+                                                 nullable=False, index=True)
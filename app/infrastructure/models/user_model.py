@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Optional
 
 import sqlalchemy as sa
-from sqlalchemy import String, Integer, Boolean, DateTime
+from sqlalchemy import String, Integer, Boolean, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -75,3 +76,38 @@ class User(Base):
         name="deleted_at",
         nullable=True,
     )
+
+    __table_args__ = (
+        # Trigram indexes for ILIKE '%q%' / fuzzy lookups; created by the pg_trgm migration
+        Index("ix_users_username_trgm", "Username", postgresql_using="gin",
+              postgresql_ops={"Username": "gin_trgm_ops"}, info={"alembic_autogenerate": False}),
+        Index("ix_users_email_trgm", "Email", postgresql_using="gin",
+              postgresql_ops={"Email": "gin_trgm_ops"}, info={"alembic_autogenerate": False}),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Detached, immutable copy of a users row; what the lookup cache hands out."""
+    id: int
+    username: str
+    email: str
+    hashed_password: str
+    admin: bool
+    active: bool
+    approved: bool
+    locked: bool
+    department: str
+    unit: str
+    first_name: str
+    middle_name: Optional[str]
+    last_name: str
+    rss_token: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    is_deleted: bool
+    deleted_at: Optional[datetime]
+
+    @classmethod
+    def of(cls, user: User) -> "UserSnapshot":
+        return cls(**{f.name: getattr(user, f.name) for f in fields(cls)})
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+import asyncpg
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[str], None]
+
+
+def _dsn() -> str:
+    # LISTEN holds session state, so it bypasses PgBouncer when a direct URL is configured;
+    # asyncpg takes a plain libpq URL, not the SQLAlchemy dialect form
+    url = settings.db_direct_url or settings.db_url
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+class PgListener:
+    """
+    One dedicated connection per worker LISTENing on the subscribed channels (outside the
+    SQLAlchemy pool, so it never holds a pooled connection). Notifications may be missed
+    while it is disconnected, so every (re)connect first calls each channel's on_reconnect,
+    which should drop whatever state the notifications keep fresh.
+    """
+
+    def __init__(self, reconnect_delay: float = 2.0, keepalive: float = 30.0) -> None:
+        self.reconnect_delay = reconnect_delay
+        self.keepalive = keepalive
+        self._callbacks: Dict[str, List[Callback]] = {}
+        self._on_reconnect: List[Callable[[], None]] = []
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, channel: str, callback: Callback, on_reconnect: Optional[Callable[[], None]] = None) -> None:
+        self._callbacks.setdefault(channel, []).append(callback)
+        if on_reconnect is not None:
+            self._on_reconnect.append(on_reconnect)
+
+    async def start(self) -> None:
+        if self._task is None and self._callbacks:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for callback in self._callbacks.get(channel, []):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("NOTIFY handler for %s failed", channel)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            conn = None
+            try:
+                conn = await asyncpg.connect(_dsn())
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _: lost.set())
+                for channel in self._callbacks:
+                    await conn.add_listener(channel, self._dispatch)
+                for reset in self._on_reconnect:
+                    reset()
+                while not self._stopping.is_set() and not lost.is_set():
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.keepalive)
+                    except asyncio.TimeoutError:
+                        # A silently dead socket only shows up when we use it
+                        await conn.fetchval("SELECT 1")
+            except Exception:
+                logger.exception("LISTEN connection failed; retrying in %ss", self.reconnect_delay)
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            if not self._stopping.is_set():
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.reconnect_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+
+pg_listener = PgListener()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import Select, literal, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+# total=... query option on paged endpoints
+TOTAL_MODES = ("exact", "estimate", "none")
+
+
+class InvalidCursor(ValueError):
+    """Malformed cursor, or one issued for a different ordering; routes answer 400."""
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Decoded keyset position: the (sort value, id) of the row the page starts after."""
+    sort_field: str
+    sort_direction: str
+    value: Any
+    id: int
+    backwards: bool = False
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def _dump_value(value: Any) -> list:
+    # Tag non-JSON types so they round-trip with the right bind type (asyncpg is strict)
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    return ["v", value]
+
+
+def _load_value(tagged: list) -> Any:
+    tag, raw = tagged
+    if tag == "dt":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    return raw
+
+
+def encode_cursor(sort_field: str, sort_direction: str, value: Any, id_: int, backwards: bool = False) -> str:
+    payload = {"f": sort_field, "d": sort_direction, "v": _dump_value(value), "i": id_, "b": backwards}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_field: str, sort_direction: str) -> Cursor:
+    """
+    Decode an opaque cursor and make sure it was issued for the same ordering.
+    A cursor from another sort would silently skip or repeat rows, so reject it.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor = Cursor(
+            sort_field=payload["f"],
+            sort_direction=payload["d"],
+            value=_load_value(payload["v"]),
+            id=int(payload["i"]),
+            backwards=bool(payload.get("b", False)),
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+    if cursor.sort_field != sort_field or cursor.sort_direction != sort_direction:
+        raise InvalidCursor("Cursor does not match sort_field/sort_direction")
+    return cursor
+
+
+def normalize_direction(sort_direction: Optional[str]) -> str:
+    return "asc" if (sort_direction or "").lower() == "asc" else "desc"
+
+
+def apply_keyset(stmt: Select, sort_col, id_col, sort_direction: str, cursor: Optional[Cursor], limit: int) -> Select:
+    """
+    Add the seek predicate, ORDER BY and LIMIT (+1 probe row) for a keyset page.
+    Walking backwards flips the scan; build_page restores the display order.
+    """
+    descending = sort_direction == "desc"
+    if cursor is not None and cursor.backwards:
+        descending = not descending
+
+    same_col = sort_col is id_col
+    if cursor is not None:
+        if same_col:
+            key, bound = id_col, literal(cursor.id)
+        else:
+            key = tuple_(sort_col, id_col)
+            bound = tuple_(literal(cursor.value), literal(cursor.id))
+        stmt = stmt.where(key < bound if descending else key > bound)
+
+    cols = [id_col] if same_col else [sort_col, id_col]
+    stmt = stmt.order_by(*[c.desc() if descending else c.asc() for c in cols])
+    return stmt.limit(limit + 1)
+
+
+def build_page(
+        rows: Sequence[T],
+        limit: int,
+        cursor: Optional[Cursor],
+        sort_field: str,
+        sort_direction: str,
+        key: Callable[[T], Tuple[Any, int]],
+) -> KeysetPage[T]:
+    items = list(rows)
+    has_more = len(items) > limit
+    items = items[:limit]
+    backwards = cursor is not None and cursor.backwards
+    if backwards:
+        items.reverse()
+
+    if not items:
+        return KeysetPage(items=[], next_cursor=None, prev_cursor=None)
+
+    # Forward: more rows ahead => next page; any cursor => we came from somewhere => prev page.
+    # Backward: mirror image.
+    has_next = (not backwards and has_more) or backwards
+    has_prev = (backwards and has_more) or (not backwards and cursor is not None)
+
+    first_value, first_id = key(items[0])
+    last_value, last_id = key(items[-1])
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(sort_field, sort_direction, last_value, last_id) if has_next else None,
+        prev_cursor=encode_cursor(sort_field, sort_direction, first_value, first_id, backwards=True)
+        if has_prev else None,
+    )
+
+
+async def estimate_rows(session: AsyncSession, stmt: Select) -> int:
+    """
+    Planner row estimate for a filtered query (EXPLAIN, nothing is executed).
+    Good enough for "about N results"; use an exact count when it matters.
+    """
+    sql = str(stmt.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}))
+    # text() treats ":name" as a bind parameter; literals may legitimately contain colons
+    res = await session.execute(text("EXPLAIN (FORMAT JSON) " + sql.replace(":", "\\:")))
+    plan = res.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
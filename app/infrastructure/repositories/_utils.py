@@ -2,6 +2,14 @@
 from __future__ import annotations
 from uuid import uuid4
 
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.response_cache import ALL_TAGS, RESPONSE_CACHE_CHANNEL
+
+# NOTIFY payloads must stay under 8000 bytes; past this, drop everything instead
+_MAX_NOTIFY_PAYLOAD = 7000
+
 def _token(n: int = 8) -> str:
     return str(uuid4()).replace("-", "")[:n]
 
@@ -33,3 +41,25 @@ def make_deleted_email(original: str, max_len: int) -> str:
     else:
         new_local = local[:keep]
     return f"{new_local}{suffix}@{domain}"
+
+
+def name_match(col, q: str, fuzzy: bool = False):
+    """
+    Name filter for list endpoints. Substring (ILIKE '%q%') by default; fuzzy uses the
+    pg_trgm similarity operator so typos still match. Both are served by a gin_trgm_ops index.
+    """
+    if fuzzy:
+        return col.op("%")(q)
+    return col.ilike(f"%{q}%")
+
+
+def similarity_rank(col, q: str):
+    return func.similarity(col, q).desc()
+
+
+async def notify_response_cache(session: AsyncSession, *tags: str) -> None:
+    """Invalidate cached responses built from `tags`. Delivered on commit, never ahead of the change."""
+    payload = ",".join(sorted(set(tags)))
+    if len(payload) > _MAX_NOTIFY_PAYLOAD:
+        payload = ALL_TAGS
+    await session.execute(select(func.pg_notify(RESPONSE_CACHE_CHANNEL, payload)))
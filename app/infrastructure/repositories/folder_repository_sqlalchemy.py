@@ -0,0 +1,155 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.infrastructure.models.folder_model import Folder, FolderClosure
+from app.infrastructure.models.testcase_model import TestCase
+
+# pg_advisory_xact_lock namespace for folder tree changes (second key is the project id)
+_TREE_LOCK = 7301
+
+
+class FolderRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _lock_tree(self, project_id: int) -> None:
+        # Tree reshapes are serialised per project so two moves cannot build a cycle together
+        await self.session.execute(select(func.pg_advisory_xact_lock(_TREE_LOCK, project_id)))
+
+    async def get(self, project_id: int, folder_id: int) -> Optional[Folder]:
+        res = await self.session.execute(
+            select(Folder).where(Folder.project_id == project_id, Folder.id == folder_id)
+        )
+        return res.scalar_one_or_none()
+
+    async def list(self, project_id: int, root_id: Optional[int] = None) -> List[dict]:
+        """
+        Flat folder list with depth, parents before children. With root_id, only that subtree
+        (depth relative to the root).
+        """
+        c = FolderClosure
+        if root_id is None:
+            # depth = number of proper ancestors
+            depth = (
+                select(func.count()).where(c.descendant_id == Folder.id, c.depth > 0).scalar_subquery()
+            )
+            stmt = select(Folder, depth.label("depth")).where(Folder.project_id == project_id)
+        else:
+            stmt = (
+                select(Folder, c.depth.label("depth"))
+                .join(c, c.descendant_id == Folder.id)
+                .where(Folder.project_id == project_id, c.ancestor_id == root_id)
+            )
+        res = await self.session.execute(stmt.order_by("depth", Folder.name, Folder.id))
+        return [
+            {"id": f.id, "project_id": f.project_id, "parent_id": f.parent_id, "name": f.name, "depth": d,
+             "created_at": f.created_at, "updated_at": f.updated_at}
+            for f, d in res.all()
+        ]
+
+    async def create(self, project_id: int, name: str, parent_id: Optional[int] = None) -> Optional[Folder]:
+        """Returns None when parent_id is not a folder of this project."""
+        await self._lock_tree(project_id)
+        if parent_id is not None and not await self.get(project_id, parent_id):
+            return None
+        obj = Folder(project_id=project_id, parent_id=parent_id, name=name)
+        self.session.add(obj)
+        await self.session.flush()
+
+        # Self pair plus one pair per ancestor of the parent
+        rows = select(literal(obj.id), literal(obj.id), literal(0))
+        if parent_id is not None:
+            rows = rows.union_all(
+                select(FolderClosure.ancestor_id, literal(obj.id), FolderClosure.depth + 1)
+                .where(FolderClosure.descendant_id == parent_id)
+            )
+        await self.session.execute(
+            insert(FolderClosure).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+        )
+        await self.session.refresh(obj)
+        return obj
+
+    async def rename(self, project_id: int, folder_id: int, name: str) -> Optional[Folder]:
+        obj = await self.get(project_id, folder_id)
+        if not obj:
+            return None
+        obj.name = name
+        await self.session.flush()
+        await self.session.refresh(obj)
+        return obj
+
+    async def move(self, project_id: int, folder_id: int, new_parent_id: Optional[int]) -> Optional[Folder]:
+        """
+        Re-parent a folder with its whole subtree in three set-based statements:
+        drop the pairs linking the subtree to its old ancestors, cross-join the new parent's
+        ancestors with the subtree, and update the adjacency link.
+        """
+        await self._lock_tree(project_id)
+        obj = await self.get(project_id, folder_id)
+        if not obj:
+            return None
+        if new_parent_id is not None:
+            if not await self.get(project_id, new_parent_id):
+                raise HTTPException(status_code=404, detail="Target parent folder not found")
+            inside = await self.session.execute(
+                select(FolderClosure.depth).where(FolderClosure.ancestor_id == folder_id,
+                                                  FolderClosure.descendant_id == new_parent_id)
+            )
+            if inside.scalar_one_or_none() is not None:
+                raise HTTPException(status_code=400, detail="Cannot move a folder into itself or its subtree")
+        if obj.parent_id == new_parent_id:
+            return obj
+
+        subtree = select(FolderClosure.descendant_id).where(FolderClosure.ancestor_id == folder_id)
+        old_ancestors = select(FolderClosure.ancestor_id).where(
+            FolderClosure.descendant_id == folder_id, FolderClosure.ancestor_id != folder_id
+        )
+        await self.session.execute(
+            delete(FolderClosure).where(
+                FolderClosure.descendant_id.in_(subtree), FolderClosure.ancestor_id.in_(old_ancestors)
+            )
+        )
+
+        if new_parent_id is not None:
+            sup = aliased(FolderClosure, name="sup")
+            sub = aliased(FolderClosure, name="sub")
+            await self.session.execute(
+                insert(FolderClosure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(sup.ancestor_id, sub.descendant_id, sup.depth + sub.depth + 1)
+                    .where(sup.descendant_id == new_parent_id, sub.ancestor_id == folder_id),
+                )
+            )
+
+        obj.parent_id = new_parent_id
+        await self.session.flush()
+        await self.session.refresh(obj)
+        return obj
+
+    async def delete(self, project_id: int, folder_id: int) -> bool:
+        """
+        Delete a folder and its subtree. Test cases inside are re-homed to the deleted folder's
+        parent (top level when it had none) in one UPDATE rather than left pointing nowhere.
+        """
+        await self._lock_tree(project_id)
+        obj = await self.get(project_id, folder_id)
+        if not obj:
+            return False
+        subtree = select(FolderClosure.descendant_id).where(FolderClosure.ancestor_id == folder_id)
+        await self.session.execute(
+            update(TestCase)
+            .where(TestCase.folder_id.in_(subtree))
+            .values(folder_id=obj.parent_id, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        # Closure rows and child folders go with the FK cascades
+        await self.session.execute(
+            delete(Folder).where(Folder.id.in_(subtree)).execution_options(synchronize_session=False)
+        )
+        self.session.expunge(obj)
+        return True
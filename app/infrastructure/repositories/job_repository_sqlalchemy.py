@@ -0,0 +1,100 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import case, func, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.models.job_model import Job, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED
+
+_QUEUED_DEDUPE = text("status = 'queued' AND dedupe_key IS NOT NULL")
+
+
+class JobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, job_id: int) -> Optional[Job]:
+        res = await self.session.execute(select(Job).where(Job.id == job_id))
+        return res.scalar_one_or_none()
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None,
+                      max_attempts: int = 5) -> tuple[int, bool]:
+        """
+        Returns (job id, created). With a dedupe_key, a job with the same key that is still
+        queued absorbs the request instead (created False) - one statement, no race window.
+        """
+        stmt = pg_insert(Job).values(kind=kind, payload=payload, dedupe_key=dedupe_key, max_attempts=max_attempts)
+        if dedupe_key is not None:
+            # A no-op update so RETURNING yields the existing row; xmax = 0 only on a fresh insert
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.dedupe_key], index_where=_QUEUED_DEDUPE,
+                set_={"updated_at": func.now()},
+            )
+        res = await self.session.execute(stmt.returning(Job.id, literal_column("xmax = 0")))
+        job_id, created = res.one()
+        return job_id, created
+
+    async def claim(self, worker: str, kinds: Sequence[str], limit: int = 1) -> List[Job]:
+        """
+        Move up to `limit` due jobs to running for this worker. SKIP LOCKED lets concurrent
+        workers pass over rows another worker is claiming instead of queueing behind it.
+        Commit right after so the claim is visible and the row locks are released.
+        """
+        due = (
+            select(Job.id)
+            .where(Job.status == JOB_QUEUED, Job.run_after <= func.now(), Job.kind.in_(list(kinds)))
+            .order_by(Job.run_after, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        res = await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(due))
+            .values(status=JOB_RUNNING, locked_by=worker, locked_at=func.now(), attempts=Job.attempts + 1)
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        return list(res.scalars())
+
+    async def succeed(self, job_id: int, result: Optional[Dict[str, Any]]) -> None:
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status=JOB_SUCCEEDED, result=result, last_error=None, locked_by=None, finished_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def fail(self, job_id: int, error: str, retry_in: Optional[timedelta]) -> None:
+        """Back to the queue after retry_in, or failed for good when retry_in is None."""
+        values: Dict[str, Any] = {"last_error": error, "locked_by": None}
+        if retry_in is None:
+            values.update(status=JOB_FAILED, finished_at=func.now())
+        else:
+            # A retry drops its dedupe key: a newer request may already be queued under it
+            values.update(status=JOB_QUEUED, run_after=func.now() + retry_in, dedupe_key=None)
+        await self.session.execute(
+            update(Job).where(Job.id == job_id).values(**values).execution_options(synchronize_session=False)
+        )
+
+    async def requeue_stale(self, older_than: timedelta) -> int:
+        """
+        Jobs left running by a worker that died (restart, OOM) go back to the queue, or fail
+        when they have used up their attempts.
+        """
+        exhausted = Job.attempts >= Job.max_attempts
+        res = await self.session.execute(
+            update(Job)
+            .where(Job.status == JOB_RUNNING, Job.locked_at < func.now() - older_than)
+            .values(
+                status=case((exhausted, JOB_FAILED), else_=JOB_QUEUED),
+                finished_at=case((exhausted, func.now()), else_=None),
+                last_error="worker lost while running the job",
+                locked_by=None,
+                dedupe_key=None,
+            )
+            .returning(Job.id)
+            .execution_options(synchronize_session=False)
+        )
+        return len(res.all())
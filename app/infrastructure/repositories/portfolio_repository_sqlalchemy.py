@@ -1,3 +1,4 @@
+import uuid
 from typing import Tuple, List, Optional
 
 from fastapi import HTTPException
@@ -6,6 +7,12 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.models.portfolio_model import Portfolio
+from app.infrastructure.repositories.search_index_repository_sqlalchemy import SearchIndexRepository
+from app.core.response_cache import portfolio_tag, portfolios_tag
+from app.infrastructure.repositories._utils import name_match, notify_response_cache, similarity_rank
+from app.infrastructure.repositories._pagination import (
+    KeysetPage, apply_keyset, build_page, decode_cursor, estimate_rows
+)
 
 MAX_LIMIT = 200
 
@@ -13,6 +20,7 @@ MAX_LIMIT = 200
 class PortfolioRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.search_index = SearchIndexRepository(session)
 
     async def create(self, data: dict) -> Portfolio:
         obj = Portfolio(**data)
@@ -21,13 +29,23 @@ class PortfolioRepository:
             await self.session.flush()  # get PK
         except IntegrityError as e:
             raise HTTPException(status_code=409, detail="Portfolio constraint violation") from e
+        await self.search_index.refresh("portfolio", [obj.id])
+        await notify_response_cache(self.session, portfolio_tag(obj.id), portfolios_tag())
         return obj
 
     async def get(self, portfolio_id: int) -> Optional[Portfolio]:
         res = await self.session.execute(select(Portfolio).where(Portfolio.id == portfolio_id))
         return res.scalar_one_or_none()
 
-    async def list(self, skip: int = 0, limit: int = 50, q: Optional[str] = None) -> Tuple[int, List[Portfolio]]:
+    async def version(self, portfolio_id: int, lock: bool = False) -> Optional[uuid.UUID]:
+        """concurrency_guid only; lock=True holds the row until commit so a checked version can't move."""
+        stmt = select(Portfolio.concurrency_guid).where(Portfolio.id == portfolio_id)
+        if lock:
+            stmt = stmt.with_for_update()
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def list(self, skip: int = 0, limit: int = 50, q: Optional[str] = None,
+                   total_mode: str = "exact", fuzzy: bool = False) -> Tuple[Optional[int], List[Portfolio], bool]:
         # Guardrails
         if limit <= 0:
             limit = 50
@@ -36,30 +54,53 @@ class PortfolioRepository:
         if skip < 0:
             skip = 0
 
-        base = (
-            select(Portfolio)
-            .where(Portfolio.is_deleted.is_(False)).limit(limit).offset(skip)
-        )
+        conds = [Portfolio.is_deleted.is_(False)]
         if q:
-            base = base.where(Portfolio.name.ilike(f"%{q}%"))
+            conds.append(name_match(Portfolio.name, q, fuzzy))
+        base = select(Portfolio).where(*conds)
+        if q and fuzzy:
+            # closest names first
+            base = base.order_by(similarity_rank(Portfolio.name, q))
+        base = base.order_by(Portfolio.id.desc())
+
+        if total_mode == "exact":
+            # Total over the filtered set (window runs before OFFSET/LIMIT) in the same round trip
+            stmt = base.add_columns(func.count().over().label("total_count")).offset(skip).limit(limit)
+            rows = (await self.session.execute(stmt)).all()
+            items = [r[0] for r in rows]
+            if rows:
+                total = int(rows[0].total_count)
+            elif skip > 0:
+                total_res = await self.session.execute(select(func.count()).select_from(Portfolio).where(*conds))
+                total = int(total_res.scalar() or 0)
+            else:
+                total = 0
+            return total, items, skip + len(items) < total
+
+        total = None
+        if total_mode == "estimate":
+            total = await estimate_rows(self.session, select(Portfolio.id).where(*conds))
+        res = await self.session.execute(base.offset(skip).limit(limit + 1))
+        items = list(res.scalars().all())
+        return total, items[:limit], len(items) > limit
 
-        count_stmt = select(func.count()).select_from(base.subquery())
-        total_res = await self.session.execute(count_stmt)
-        total = int(total_res.scalar() or 0)
+    async def list_keyset(self, limit: int = 50, q: Optional[str] = None,
+                          cursor: Optional[str] = None, fuzzy: bool = False) -> KeysetPage[Portfolio]:
+        # Same ordering as the OFFSET listing (id desc), but seeks instead of skipping rows
+        if limit <= 0:
+            limit = 50
+        if limit > MAX_LIMIT:
+            limit = MAX_LIMIT
+        decoded = decode_cursor(cursor, "id", "desc") if cursor else None
 
-        # Page window: ORDER → OFFSET → LIMIT
-        stmt = (
-            base
-            .order_by(Portfolio.id.desc())
-            .offset(skip)
-            .limit(limit)
-        )
+        stmt = select(Portfolio).where(Portfolio.is_deleted.is_(False))
+        if q:
+            # fuzzy only filters here: keyset pages stay in id order
+            stmt = stmt.where(name_match(Portfolio.name, q, fuzzy))
+        stmt = apply_keyset(stmt, Portfolio.id, Portfolio.id, "desc", decoded, limit)
 
         res = await self.session.execute(stmt)
-        items = list(res.scalars().all())
-
-        # Return both total and items (better for clients)
-        return total, items
+        return build_page(res.scalars().all(), limit, decoded, "id", "desc", key=lambda p: (p.id, p.id))
 
     async def update(self, portfolio_id: int, data: dict, concurrency_guid: str) -> Portfolio:
         # optimistic concurrency
@@ -68,13 +109,15 @@ class PortfolioRepository:
             .where(Portfolio.id == portfolio_id)
             .where(Portfolio.concurrency_guid == concurrency_guid)
             .where(Portfolio.is_deleted.is_(False))
-            .values(**data)
+            .values(**data, concurrency_guid=uuid.uuid4())
             .returning(Portfolio)
         )
         res = await self.session.execute(stmt)
         obj = res.scalar_one_or_none()
         if not obj:
             raise HTTPException(status_code=409, detail="Concurrency conflict or portfolio not found")
+        await self.search_index.refresh("portfolio", [obj.id])
+        await notify_response_cache(self.session, portfolios_tag())
         return obj
 
     async def soft_delete(self, portfolio_id: int, concurrency_guid: str) -> Portfolio:
@@ -83,8 +126,7 @@ class PortfolioRepository:
             .where(Portfolio.id == portfolio_id)
             .where(Portfolio.concurrency_guid == concurrency_guid)
             .where(Portfolio.is_deleted.is_(False))
-            .values(is_deleted=True)
-            .values(is_active=False)
+            .values(is_deleted=True, is_active=False, concurrency_guid=uuid.uuid4())
             .returning(Portfolio)
         )
         res = await self.session.execute(stmt)
@@ -92,4 +134,6 @@ class PortfolioRepository:
         if not obj:
             raise HTTPException(status_code=409, detail="Concurrency conflict or portfolio not found")
 
+        await self.search_index.remove("portfolio", [obj.id])
+        await notify_response_cache(self.session, portfolio_tag(obj.id), portfolios_tag())
         return obj
@@ -1,3 +1,4 @@
+import uuid
 from typing import Sequence, Optional
 
 from fastapi import HTTPException
@@ -7,11 +8,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.models.portfolio_model import Portfolio
 from app.infrastructure.models.program_model import Program
+from app.infrastructure.repositories.search_index_repository_sqlalchemy import SearchIndexRepository
+from app.core.response_cache import program_tag, programs_tag
+from app.infrastructure.repositories._utils import name_match, notify_response_cache, similarity_rank
+from app.infrastructure.repositories._pagination import KeysetPage, apply_keyset, build_page, decode_cursor
 
 
 class ProgramRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.search_index = SearchIndexRepository(session)
 
     async def create(self, data: dict) -> Program:
         # ensure portfolio exists
@@ -26,38 +32,74 @@ class ProgramRepository:
             await self.session.flush()
         except IntegrityError as e:
             raise HTTPException(status_code=409, detail="Program constraint violation") from e
+        await self.search_index.refresh("program", [obj.id])
+        await notify_response_cache(self.session, programs_tag(obj.portfolio_id))
         return obj
 
     async def get(self, program_id: int) -> Optional[Program]:
-        res = await self.session.execute(select(Program).where(Program.id == program_id))
+        res = await self.session.execute(
+            select(Program).where(Program.id == program_id, Program.is_deleted.is_(False))
+        )
         return res.scalar_one_or_none()
 
-    async def list_by_portfolio(self, portfolio_id: int, skip: int = 0, limit: int = 50, q: str | None = None) -> \
-            Sequence[Program]:
-        stmt = select(Program).where(Program.portfolio_id == portfolio_id).offset(skip).limit(limit)
+    async def version(self, program_id: int, lock: bool = False) -> Optional[uuid.UUID]:
+        """concurrency_guid only; lock=True holds the row until commit so a checked version can't move."""
+        stmt = select(Program.concurrency_guid).where(Program.id == program_id, Program.is_deleted.is_(False))
+        if lock:
+            stmt = stmt.with_for_update()
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def list_by_portfolio(self, portfolio_id: int, skip: int = 0, limit: int = 50, q: str | None = None,
+                                fuzzy: bool = False) -> Sequence[Program]:
+        stmt = (
+            select(Program)
+            .where(Program.portfolio_id == portfolio_id, Program.is_deleted.is_(False))
+            .offset(skip)
+            .limit(limit)
+        )
         if q:
-            stmt = stmt.where(Program.name.ilike(f"%{q}%"))
+            stmt = stmt.where(name_match(Program.name, q, fuzzy))
+            if fuzzy:
+                stmt = stmt.order_by(similarity_rank(Program.name, q))
         res = await self.session.execute(stmt.order_by(Program.id.desc()))
         return res.scalars().all()
 
+    async def list_by_portfolio_keyset(self, portfolio_id: int, limit: int = 50, q: str | None = None,
+                                       cursor: str | None = None, fuzzy: bool = False) -> KeysetPage[Program]:
+        decoded = decode_cursor(cursor, "id", "desc") if cursor else None
+        stmt = select(Program).where(Program.portfolio_id == portfolio_id, Program.is_deleted.is_(False))
+        if q:
+            stmt = stmt.where(name_match(Program.name, q, fuzzy))
+        stmt = apply_keyset(stmt, Program.id, Program.id, "desc", decoded, limit)
+        res = await self.session.execute(stmt)
+        return build_page(res.scalars().all(), limit, decoded, "id", "desc", key=lambda p: (p.id, p.id))
+
     async def update(self, program_id: int, data: dict, concurrency_guid: str) -> Program:
+        # Listings cached under the program's portfolio before and after the update
+        tags = set()
         # If portfolio_id is changing, validate it exists
         if "portfolio_id" in data and data["portfolio_id"] is not None:
             p = await self.session.get(Portfolio, data["portfolio_id"])
             if not p:
                 raise HTTPException(status_code=400, detail="New portfolio does not exist")
+            previous = await self.session.scalar(select(Program.portfolio_id).where(Program.id == program_id))
+            if previous is not None:
+                tags.add(programs_tag(previous))
 
         stmt = (
             update(Program)
             .where(Program.id == program_id)
             .where(Program.concurrency_guid == concurrency_guid)
-            .values(**data)
+            .where(Program.is_deleted.is_(False))
+            .values(**data, concurrency_guid=uuid.uuid4())
             .returning(Program)
         )
         res = await self.session.execute(stmt)
         obj = res.scalar_one_or_none()
         if not obj:
             raise HTTPException(status_code=409, detail="Concurrency conflict or program not found")
+        await self.search_index.refresh("program", [obj.id])
+        await notify_response_cache(self.session, program_tag(obj.id), programs_tag(obj.portfolio_id), *tags)
         return obj
 
     async def soft_delete(self, program_id: int, concurrency_guid: str) -> Program:
@@ -66,12 +108,13 @@ class ProgramRepository:
             .where(Program.id == program_id)
             .where(Program.concurrency_guid == concurrency_guid)
             .where(Program.is_deleted == False)
-            .returning(Program)
-            .values(is_active=False)
+            .values(is_deleted=True, is_active=False, concurrency_guid=uuid.uuid4())
             .returning(Program)
         )
         res = await self.session.execute(stmt)
         obj = res.scalar_one_or_none()
         if not obj:
             raise HTTPException(status_code=409, detail="Concurrency conflict or program not found")
+        await self.search_index.remove("program", [obj.id])
+        await notify_response_cache(self.session, program_tag(obj.id), programs_tag(obj.portfolio_id))
         return obj
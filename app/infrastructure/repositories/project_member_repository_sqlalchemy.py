@@ -0,0 +1,63 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.authz import MEMBERSHIP_CHANNEL
+from app.infrastructure.models.project_member_model import ProjectMember
+from app.infrastructure.models.user_model import User
+
+
+class ProjectMemberRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _notify(self, user_id: int) -> None:
+        # Delivered on commit, so workers never drop their cache ahead of the change
+        await self.session.execute(select(func.pg_notify(MEMBERSHIP_CHANNEL, str(user_id))))
+
+    async def roles_for_user(self, user_id: int) -> Dict[int, str]:
+        res = await self.session.execute(
+            select(ProjectMember.project_id, ProjectMember.role).where(ProjectMember.user_id == user_id)
+        )
+        return {r.project_id: r.role for r in res.all()}
+
+    async def list(self, project_id: int) -> List[dict]:
+        res = await self.session.execute(
+            select(ProjectMember.user_id, User.username, ProjectMember.role,
+                   ProjectMember.created_at, ProjectMember.updated_at)
+            .join(User, User.id == ProjectMember.user_id)
+            .where(ProjectMember.project_id == project_id, User.is_deleted.is_(False))
+            .order_by(User.username)
+        )
+        return [dict(r._mapping) for r in res.all()]
+
+    async def upsert(self, project_id: int, user_id: int, role: str) -> Optional[dict]:
+        """Add or change a membership; None when the user does not exist."""
+        exists = await self.session.execute(
+            select(User.username).where(User.id == user_id, User.is_deleted.is_(False))
+        )
+        username = exists.scalar_one_or_none()
+        if username is None:
+            return None
+        stmt = pg_insert(ProjectMember).values(project_id=project_id, user_id=user_id, role=role)
+        res = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ProjectMember.project_id, ProjectMember.user_id],
+                set_={"role": stmt.excluded.role, "updated_at": func.now()},
+            ).returning(ProjectMember.user_id, ProjectMember.role, ProjectMember.created_at, ProjectMember.updated_at)
+        )
+        await self._notify(user_id)
+        return {"username": username, **res.one()._mapping}
+
+    async def remove(self, project_id: int, user_id: int) -> bool:
+        res = await self.session.execute(
+            delete(ProjectMember)
+            .where(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id)
+            .returning(ProjectMember.user_id)
+        )
+        if res.scalar_one_or_none() is None:
+            return False
+        await self._notify(user_id)
+        return True
@@ -0,0 +1,189 @@
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Integer, and_, column, delete, func, insert, null, or_, select, tuple_, union, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.response_cache import project_tag
+from app.core.settings import settings
+from app.infrastructure.models.project_model import Project
+from app.infrastructure.models.project_progress_model import ProjectProgress
+from app.infrastructure.models.test_case_counter_model import TestCaseCounter
+from app.infrastructure.models.testcase_model import TestCase
+from app.infrastructure.repositories._utils import notify_response_cache
+
+# Writers stamp updated_at before they commit, so a change can land slightly behind the last
+# watermark; re-checking this window each run keeps those from being missed.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+# pg_advisory_xact_lock key: one refresh at a time
+_REFRESH_LOCK = 7302
+
+Scope = Tuple[int, Optional[int]]  # (project_id, release_id); release None = project-wide row
+
+
+def _percent(done: int, total: int) -> Optional[int]:
+    if not settings.progress_done_status_ids or not total:
+        return None
+    return round(done * 100 / total)
+
+
+class ProjectProgressRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+
+    async def for_project(self, project_id: int) -> List[ProjectProgress]:
+        """Project-wide row first, then one row per release."""
+        res = await self.session.execute(
+            select(ProjectProgress)
+            .where(ProjectProgress.project_id == project_id)
+            .order_by(ProjectProgress.release_id.asc().nulls_first())
+        )
+        return list(res.scalars())
+
+    async def rollups(self, project_ids: Sequence[int]) -> Dict[int, ProjectProgress]:
+        """Project-wide rows for a page of projects, keyed by project id."""
+        if not project_ids:
+            return {}
+        res = await self.session.execute(
+            select(ProjectProgress).where(
+                ProjectProgress.project_id.in_(project_ids), ProjectProgress.release_id.is_(None)
+            )
+        )
+        return {p.project_id: p for p in res.scalars()}
+
+    # ── refresh ───────────────────────────────────────────────────────────────
+
+    async def _dirty_scopes(self, project_id: Optional[int], release_id: Optional[int]) -> Set[Scope]:
+        """
+        (project, release) pairs whose cases or counters changed since the stored watermarks,
+        plus every scope of a project that has no rollup row yet.
+        """
+        marks = select(func.max(ProjectProgress.cases_watermark), func.max(ProjectProgress.counters_watermark))
+        if project_id is not None:
+            marks = marks.where(ProjectProgress.project_id == project_id)
+        cases_mark, counters_mark = (await self.session.execute(marks)).one()
+
+        cases = select(TestCase.project_id, TestCase.release_id)
+        counters = select(TestCaseCounter.project_id, TestCaseCounter.release_id)
+        # No watermark yet (first run for this scope): everything is dirty
+        if cases_mark is not None:
+            cases = cases.where(TestCase.updated_at > cases_mark - WATERMARK_OVERLAP)
+        if counters_mark is not None:
+            counters = counters.where(TestCaseCounter.updated_at > counters_mark - WATERMARK_OVERLAP)
+        if project_id is not None:
+            cases = cases.where(TestCase.project_id == project_id)
+            counters = counters.where(TestCaseCounter.project_id == project_id)
+        if release_id is not None:
+            cases = cases.where(TestCase.release_id == release_id)
+            counters = counters.where(TestCaseCounter.release_id == release_id)
+
+        # The watermarks are a max over every row, so a project never rolled up (created, or
+        # given old cases, after another project's run) would otherwise stay missing
+        def unrolled(project_col):
+            return ~select(ProjectProgress.id).where(
+                ProjectProgress.project_id == project_col, ProjectProgress.release_id.is_(None)
+            ).exists()
+
+        new_projects = select(Project.project_id, null()).where(Project.is_deleted.is_(False),
+                                                                unrolled(Project.project_id))
+        new_cases = select(TestCase.project_id, TestCase.release_id).where(unrolled(TestCase.project_id))
+        if project_id is not None:
+            new_projects = new_projects.where(Project.project_id == project_id)
+            new_cases = new_cases.where(TestCase.project_id == project_id)
+        if release_id is not None:
+            new_cases = new_cases.where(TestCase.release_id == release_id)
+
+        rows = (await self.session.execute(union(cases, counters, new_projects, new_cases))).all()
+        return {(r[0], r[1]) for r in rows}
+
+    async def _all_scopes(self, project_id: Optional[int], release_id: Optional[int]) -> Set[Scope]:
+        stmt = select(TestCase.project_id, TestCase.release_id).distinct()
+        if project_id is not None:
+            stmt = stmt.where(TestCase.project_id == project_id)
+        if release_id is not None:
+            stmt = stmt.where(TestCase.release_id == release_id)
+        scopes = {(r[0], r[1]) for r in (await self.session.execute(stmt)).all()}
+        if project_id is not None:
+            # A project with no cases (yet / any more) still gets its zero row
+            scopes.add((project_id, release_id))
+        return scopes
+
+    async def refresh(self, project_id: Optional[int] = None, release_id: Optional[int] = None,
+                      force: bool = False) -> dict:
+        """
+        Rebuild the rollups that changed since the last run (all of them in scope with force=True).
+        A touched release also rebuilds its project-wide row. Percent complete is copied onto
+        Project.percent_complete. Runs inside the caller's transaction.
+        """
+        await self.session.execute(select(func.pg_advisory_xact_lock(_REFRESH_LOCK)))
+
+        # Take the new watermarks before reading the data so nothing slips between the two
+        cases_wm = (await self.session.execute(select(func.max(TestCase.updated_at)))).scalar()
+        counters_wm = (await self.session.execute(select(func.max(TestCaseCounter.updated_at)))).scalar()
+
+        scopes = await (self._all_scopes if force else self._dirty_scopes)(project_id, release_id)
+        projects = sorted({p for p, _ in scopes})
+        releases = {(p, r) for p, r in scopes if r is not None}
+        if not projects:
+            return {"projects": [], "releases": 0}
+
+        rows = await self._aggregate(projects)
+        project_rows = {p: self._empty(p, None) for p in projects}
+        release_rows: Dict[Scope, dict] = {}
+        for p, r, status_id, type_id, priority_id, n in rows:
+            targets = [project_rows[p]]
+            if (p, r) in releases:
+                targets.append(release_rows.setdefault((p, r), self._empty(p, r)))
+            for t in targets:
+                t["total_cases"] += n
+                t["by_status"][str(status_id)] += n
+                t["by_type"][str(type_id)] += n
+                t["by_priority"]["none" if priority_id is None else str(priority_id)] += n
+                if status_id in settings.progress_done_status_ids:
+                    t["done_cases"] += n
+
+        new_rows = list(project_rows.values()) + list(release_rows.values())
+        for row in new_rows:
+            row["percent_complete"] = _percent(row["done_cases"], row["total_cases"])
+            for k in ("by_status", "by_type", "by_priority"):
+                row[k] = dict(row[k])
+            row["cases_watermark"] = cases_wm
+            row["counters_watermark"] = counters_wm
+
+        # Replace exactly the rebuilt scopes; releases that lost all cases simply drop out
+        replaced = [and_(ProjectProgress.project_id.in_(projects), ProjectProgress.release_id.is_(None))]
+        if releases:
+            replaced.append(tuple_(ProjectProgress.project_id, ProjectProgress.release_id).in_(sorted(releases)))
+        await self.session.execute(delete(ProjectProgress).where(or_(*replaced)))
+        await self.session.execute(insert(ProjectProgress).values(new_rows))
+
+        if settings.progress_done_status_ids:
+            pct = values(column("project_id", Integer), column("pct", Integer), name="pct").data(
+                [(p, project_rows[p]["percent_complete"]) for p in projects]
+            )
+            await self.session.execute(
+                update(Project).where(Project.project_id == pct.c.project_id).values(percent_complete=pct.c.pct)
+                .execution_options(synchronize_session=False)
+            )
+        await notify_response_cache(self.session, *(project_tag(p) for p in projects))
+        return {"projects": projects, "releases": len(release_rows)}
+
+    async def _aggregate(self, project_ids: Iterable[int]) -> list:
+        stmt = (
+            select(TestCase.project_id, TestCase.release_id, TestCase.test_case_status_id,
+                   TestCase.test_case_type_id, TestCase.priority_id, func.count())
+            .where(TestCase.project_id.in_(list(project_ids)), TestCase.is_deleted == False)
+            .group_by(TestCase.project_id, TestCase.release_id, TestCase.test_case_status_id,
+                      TestCase.test_case_type_id, TestCase.priority_id)
+        )
+        return [tuple(r) for r in (await self.session.execute(stmt)).all()]
+
+    @staticmethod
+    def _empty(project_id: int, release_id: Optional[int]) -> dict:
+        return {
+            "project_id": project_id, "release_id": release_id, "total_cases": 0, "done_cases": 0,
+            "by_status": Counter(), "by_type": Counter(), "by_priority": Counter(),
+        }
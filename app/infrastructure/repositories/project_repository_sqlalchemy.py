@@ -1,26 +1,75 @@
-from typing import Optional, Sequence, Mapping, Any
+import uuid
+from datetime import datetime, timezone
+from typing import Collection, Optional, Sequence, Mapping, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, func
 from sqlalchemy.exc import IntegrityError
 from app.infrastructure.models.project_model import Project
+from app.infrastructure.models.project_progress_model import ProjectProgress
 from app.application.interfaces.project_repository import IProjectRepository
+from app.infrastructure.repositories._pagination import KeysetPage, apply_keyset, build_page, decode_cursor
+from app.infrastructure.repositories.project_member_repository_sqlalchemy import ProjectMemberRepository
+from app.infrastructure.repositories.search_index_repository_sqlalchemy import SearchIndexRepository
+from app.infrastructure.repositories._utils import notify_response_cache
+from app.core.response_cache import project_tag
 
 class SQLAlchemyProjectRepository(IProjectRepository):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.search_index = SearchIndexRepository(session)
 
-    async def list(self, limit: int = 50, offset: int = 0) -> Sequence[Project]:
-        stmt = select(Project).offset(offset).limit(limit)
+    @staticmethod
+    def _visible(project_ids: Optional[Collection[int]]):
+        # project_ids=None: no restriction (admins)
+        stmt = select(Project)
+        if project_ids is not None:
+            stmt = stmt.where(Project.project_id.in_(list(project_ids)))
+        return stmt
+
+    async def list(self, limit: int = 50, offset: int = 0,
+                   project_ids: Optional[Collection[int]] = None) -> Sequence[Project]:
+        stmt = self._visible(project_ids).offset(offset).limit(limit)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def list_keyset(self, limit: int = 50, cursor: Optional[str] = None,
+                          project_ids: Optional[Collection[int]] = None) -> KeysetPage[Project]:
+        decoded = decode_cursor(cursor, "project_id", "asc") if cursor else None
+        stmt = apply_keyset(self._visible(project_ids), Project.project_id, Project.project_id, "asc",
+                            decoded, limit)
+        result = await self.session.execute(stmt)
+        return build_page(result.scalars().all(), limit, decoded, "project_id", "asc",
+                          key=lambda p: (p.project_id, p.project_id))
+
     async def get_by_id(self, project_id: int) -> Optional[Project]:
         return await self.session.get(Project, project_id)
 
-    async def create(self, data: Mapping[str, Any]) -> Project:
+    async def version(self, project_id: int,
+                      lock: bool = False) -> Optional[Tuple[uuid.UUID, Optional[datetime], int]]:
+        """
+        (concurrency_guid, newest rollup computed_at, rollup count): everything GET /projects/{id}
+        renders changes at least one of these. lock=True holds the project row until commit.
+        """
+        rollups = select(ProjectProgress).where(ProjectProgress.project_id == Project.project_id)
+        stmt = select(
+            Project.concurrency_guid,
+            rollups.with_only_columns(func.max(ProjectProgress.computed_at)).scalar_subquery(),
+            rollups.with_only_columns(func.count()).scalar_subquery(),
+        ).where(Project.project_id == project_id)
+        if lock:
+            stmt = stmt.with_for_update(of=Project)
+        row = (await self.session.execute(stmt)).one_or_none()
+        return None if row is None else tuple(row)
+
+    async def create(self, data: Mapping[str, Any], manager_id: Optional[int] = None) -> Project:
+        """manager_id becomes the project's first manager in the same transaction."""
         obj = Project(**data)
         self.session.add(obj)
         try:
+            await self.session.flush()
+            if manager_id is not None:
+                await ProjectMemberRepository(self.session).upsert(obj.project_id, manager_id, "manager")
+            await self.search_index.refresh("project", [obj.project_id])
             await self.session.commit()
         except IntegrityError:
             await self.session.rollback()
@@ -33,25 +82,29 @@ class SQLAlchemyProjectRepository(IProjectRepository):
             return await self.get_by_id(project_id)
         stmt = (
             update(Project)
-            .where(Project.ProjectId == project_id)
-            .values(**fields)
-            .returning(Project.ProjectId)
+            .where(Project.project_id == project_id)
+            .values(**fields, concurrency_guid=uuid.uuid4())
+            .returning(Project.project_id)
         )
         res = await self.session.execute(stmt)
         returned_id = res.scalar_one_or_none()
         if not returned_id:
             await self.session.rollback()
             return None
+        await self.search_index.refresh("project", [project_id])
+        await notify_response_cache(self.session, project_tag(project_id))
         await self.session.commit()
         return await self.get_by_id(project_id)
 
     async def delete(self, project_id: int) -> bool:
-        stmt = delete(Project).where(Project.ProjectId == project_id).returning(Project.ProjectId)
+        stmt = delete(Project).where(Project.project_id == project_id).returning(Project.project_id)
         res = await self.session.execute(stmt)
         returned_id = res.scalar_one_or_none()
         if not returned_id:
             await self.session.rollback()
             return False
+        await self.search_index.remove("project", [project_id])
+        await notify_response_cache(self.session, project_tag(project_id))
         await self.session.commit()
         return True
 
@@ -61,6 +114,9 @@ class SQLAlchemyProjectRepository(IProjectRepository):
         if not obj:
             return None
         obj.is_deleted = True
-        obj.deleted_at = os.datetime.now(timezone.utc)
+        obj.deleted_at = datetime.now(timezone.utc)
+        obj.concurrency_guid = uuid.uuid4()
+        await self.search_index.remove("project", [project_id])
+        await notify_response_cache(self.session, project_tag(project_id))
         await self.session.commit()
         return obj
@@ -0,0 +1,155 @@
+from typing import Collection, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Integer, select, delete, func, literal, literal_column, insert, null, or_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.models.portfolio_model import Portfolio
+from app.infrastructure.models.program_model import Program
+from app.infrastructure.models.project_model import Project
+from app.infrastructure.models.search_document_model import SearchDocument, SEARCH_CONFIG
+from app.infrastructure.models.testcase_model import TestCase, TestStep
+
+ENTITY_TYPES = ("portfolio", "program", "project", "test_case")
+
+_DOC_COLUMNS = ["entity_type", "entity_id", "project_id", "portfolio_id", "title", "body"]
+_NO_ID = null().cast(Integer)
+
+
+# ── document sources ────────────────────────────────────────────────────────────
+# Each returns a SELECT producing _DOC_COLUMNS for the live (not deleted) rows.
+
+def _portfolio_docs():
+    return select(
+        literal("portfolio"), Portfolio.id, _NO_ID, Portfolio.id,
+        Portfolio.name, func.concat_ws(" ", Portfolio.description, Portfolio.website),
+    ).where(Portfolio.is_deleted.is_(False)), Portfolio.id
+
+
+def _program_docs():
+    return select(
+        literal("program"), Program.id, _NO_ID, Program.portfolio_id,
+        Program.name, func.concat_ws(" ", Program.description, Program.website),
+    ).where(Program.is_deleted.is_(False)), Program.id
+
+
+def _project_docs():
+    return select(
+        literal("project"), Project.project_id, Project.project_id, _NO_ID,
+        Project.name, func.concat_ws(" ", Project.description, Project.Environment, Project.status),
+    ).where(Project.is_deleted.is_(False)), Project.project_id
+
+
+def _test_case_docs():
+    # Description plus every step's action/expected result, in step order
+    steps_text = func.string_agg(
+        func.concat_ws(" ", TestStep.action, TestStep.expected_result),
+        aggregate_order_by(literal_column("' '"), TestStep.position),
+    )
+    return (
+        select(
+            literal("test_case"), TestCase.id, TestCase.project_id, _NO_ID,
+            TestCase.name, func.concat_ws(" ", TestCase.description, steps_text),
+        )
+        .select_from(TestCase)
+        .outerjoin(TestStep, TestStep.test_case_id == TestCase.id)
+        .where(TestCase.is_deleted == False)
+        .group_by(TestCase.id)
+    ), TestCase.id
+
+
+_SOURCES = {
+    "portfolio": _portfolio_docs,
+    "program": _program_docs,
+    "project": _project_docs,
+    "test_case": _test_case_docs,
+}
+
+
+class SearchIndexRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    # ── maintenance ───────────────────────────────────────────────────────────
+
+    async def refresh(self, entity_type: str, ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Rebuild the documents for the given entity ids (all of that type when ids is None)
+        in two set-based statements. Deleted/missing entities simply drop out of the index.
+        Call inside the writer's transaction so the index commits with the change.
+        """
+        ids = None if ids is None else sorted(set(ids))
+        if ids is not None and not ids:
+            return
+
+        purge = delete(SearchDocument).where(SearchDocument.entity_type == entity_type)
+        if ids is not None:
+            purge = purge.where(SearchDocument.entity_id.in_(ids))
+        await self.session.execute(purge)
+
+        source, id_col = _SOURCES[entity_type]()
+        if ids is not None:
+            source = source.where(id_col.in_(ids))
+        await self.session.execute(insert(SearchDocument).from_select(_DOC_COLUMNS, source))
+
+    async def remove(self, entity_type: str, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        if not ids:
+            return
+        await self.session.execute(
+            delete(SearchDocument).where(SearchDocument.entity_type == entity_type, SearchDocument.entity_id.in_(ids))
+        )
+
+    # ── querying ──────────────────────────────────────────────────────────────
+
+    async def search(
+            self,
+            q: str,
+            entity_types: Optional[Sequence[str]] = None,
+            project_id: Optional[int] = None,
+            portfolio_id: Optional[int] = None,
+            project_ids: Optional[Collection[int]] = None,
+            limit: int = 20,
+            offset: int = 0,
+    ) -> List[dict]:
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank_cd(SearchDocument.tsv, query)
+
+        # Rank + page first on the GIN-backed match, then highlight only the rows returned
+        ranked = (
+            select(SearchDocument.id, rank.label("rank"))
+            .where(SearchDocument.tsv.op("@@")(query))
+            .order_by(rank.desc(), SearchDocument.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        if entity_types:
+            ranked = ranked.where(SearchDocument.entity_type.in_(entity_types))
+        if project_id is not None:
+            ranked = ranked.where(SearchDocument.project_id == project_id)
+        if portfolio_id is not None:
+            ranked = ranked.where(SearchDocument.portfolio_id == portfolio_id)
+        if project_ids is not None:
+            # Project-scoped documents only from the caller's projects; portfolios and programs carry none
+            ranked = ranked.where(or_(SearchDocument.project_id.is_(None),
+                                      SearchDocument.project_id.in_(list(project_ids))))
+        ranked = ranked.subquery("ranked")
+
+        headline_opts = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+        stmt = (
+            select(
+                SearchDocument.entity_type,
+                SearchDocument.entity_id,
+                SearchDocument.project_id,
+                SearchDocument.portfolio_id,
+                SearchDocument.title,
+                ranked.c.rank,
+                func.ts_headline(SEARCH_CONFIG, SearchDocument.title, query, headline_opts).label("title_highlight"),
+                func.ts_headline(SEARCH_CONFIG, func.coalesce(SearchDocument.body, ""), query, headline_opts)
+                .label("body_highlight"),
+            )
+            .join(ranked, ranked.c.id == SearchDocument.id)
+            .order_by(ranked.c.rank.desc(), SearchDocument.id)
+        )
+        res = await self.session.execute(stmt)
+        return [dict(r._mapping) for r in res.all()]
@@ -0,0 +1,130 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, func, delete, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.models.test_case_counter_model import TestCaseCounter
+from app.infrastructure.models.testcase_model import TestCase
+
+# (project_id, release_id, status_id, type_id)
+CounterKey = Tuple[int, Optional[int], int, int]
+
+
+def counter_key(tc: TestCase) -> CounterKey:
+    return tc.project_id, tc.release_id, tc.test_case_status_id, tc.test_case_type_id
+
+
+class TestCaseCounterRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply(self, deltas: Dict[CounterKey, int]) -> None:
+        """Add signed deltas in one upsert; runs inside the caller's transaction."""
+        rows = [
+            {"project_id": k[0], "release_id": k[1], "status_id": k[2], "type_id": k[3], "count": d}
+            for k, d in sorted(deltas.items(), key=lambda kv: tuple(-1 if v is None else v for v in kv[0]))
+            if d
+        ]
+        # Sorted keys => concurrent writers lock counter rows in the same order (no deadlocks)
+        if not rows:
+            return
+        stmt = insert(TestCaseCounter).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["project_id", "release_id", "status_id", "type_id"],
+            set_={"count": TestCaseCounter.count + stmt.excluded.count, "updated_at": func.now()},
+        )
+        await self.session.execute(stmt)
+
+    async def increment(self, keys: Iterable[CounterKey]) -> None:
+        await self.apply(Counter(keys))
+
+    async def decrement(self, keys: Iterable[CounterKey]) -> None:
+        await self.apply({k: -n for k, n in Counter(keys).items()})
+
+    async def move(self, old: CounterKey, new: CounterKey) -> None:
+        if old != new:
+            await self.apply({old: -1, new: 1})
+
+    async def count(self, project_id: int, release_id: Optional[int] = None,
+                    status_ids: Optional[List[int]] = None, type_ids: Optional[List[int]] = None) -> int:
+        stmt = select(func.coalesce(func.sum(TestCaseCounter.count), 0)).where(
+            TestCaseCounter.project_id == project_id
+        )
+        if release_id is not None:
+            stmt = stmt.where(TestCaseCounter.release_id == release_id)
+        if status_ids:
+            stmt = stmt.where(TestCaseCounter.status_id.in_(status_ids))
+        if type_ids:
+            stmt = stmt.where(TestCaseCounter.type_id.in_(type_ids))
+        res = await self.session.execute(stmt)
+        return int(res.scalar() or 0)
+
+    def _actual_counts(self, project_id: Optional[int]):
+        stmt = (
+            select(
+                TestCase.project_id,
+                TestCase.release_id,
+                TestCase.test_case_status_id.label("status_id"),
+                TestCase.test_case_type_id.label("type_id"),
+                func.count().label("count"),
+            )
+            .where(TestCase.is_deleted == False)
+            .group_by(TestCase.project_id, TestCase.release_id, TestCase.test_case_status_id,
+                      TestCase.test_case_type_id)
+        )
+        if project_id is not None:
+            stmt = stmt.where(TestCase.project_id == project_id)
+        return stmt
+
+    async def rebuild(self, project_id: Optional[int] = None, dry_run: bool = False) -> List[dict]:
+        """
+        Recompute counters from test_cases and report drift as
+        [{"project_id", "release_id", "status_id", "type_id", "stored", "actual"}].
+        Blocks concurrent counter writes for the duration so the swap is exact.
+        """
+        await self.session.execute(text("LOCK TABLE test_case_counters IN SHARE ROW EXCLUSIVE MODE"))
+
+        actual = self._actual_counts(project_id).subquery("actual")
+        stored = select(TestCaseCounter).where(TestCaseCounter.count != 0)
+        if project_id is not None:
+            stored = stored.where(TestCaseCounter.project_id == project_id)
+        stored = stored.subquery("stored")
+
+        join_on = (
+            (actual.c.project_id == stored.c.project_id)
+            & actual.c.release_id.is_not_distinct_from(stored.c.release_id)
+            & (actual.c.status_id == stored.c.status_id)
+            & (actual.c.type_id == stored.c.type_id)
+        )
+        stored_count = func.coalesce(stored.c.count, 0)
+        actual_count = func.coalesce(actual.c.count, 0)
+        drift_stmt = (
+            select(
+                func.coalesce(actual.c.project_id, stored.c.project_id).label("project_id"),
+                func.coalesce(actual.c.release_id, stored.c.release_id).label("release_id"),
+                func.coalesce(actual.c.status_id, stored.c.status_id).label("status_id"),
+                func.coalesce(actual.c.type_id, stored.c.type_id).label("type_id"),
+                stored_count.label("stored"),
+                actual_count.label("actual"),
+            )
+            .select_from(actual.join(stored, join_on, full=True))
+            .where(stored_count != actual_count)
+        )
+        drift = [dict(r._mapping) for r in (await self.session.execute(drift_stmt)).all()]
+        if dry_run or not drift:
+            return drift
+
+        purge = delete(TestCaseCounter)
+        if project_id is not None:
+            purge = purge.where(TestCaseCounter.project_id == project_id)
+        await self.session.execute(purge)
+
+        src = self._actual_counts(project_id)
+        await self.session.execute(
+            insert(TestCaseCounter).from_select(
+                ["project_id", "release_id", "status_id", "type_id", "count"], src
+            )
+        )
+        return drift
@@ -1,16 +1,90 @@
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import AsyncIterator, Dict, Iterable, Optional, List, Tuple
 
-from sqlalchemy import select, func, desc
+from fastapi import HTTPException
+from sqlalchemy import (
+    BigInteger, Integer, Text, any_, bindparam, column, delete, desc, func, or_, select, text, tuple_, update, values
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, joinedload, noload, selectinload
 
-from app.infrastructure.models.testcase_model import TestCase, TestStep
+from app.infrastructure.models.folder_model import Folder, FolderClosure
+from app.infrastructure.models.testcase_model import STEP_POSITION_GAP, TestCase, TestStep
+from app.infrastructure.repositories._pagination import (
+    KeysetPage, apply_keyset, build_page, decode_cursor, estimate_rows, normalize_direction
+)
+from app.infrastructure.repositories.search_index_repository_sqlalchemy import SearchIndexRepository
+from app.infrastructure.repositories._utils import name_match, similarity_rank
+from app.infrastructure.repositories.test_case_counter_repository_sqlalchemy import (
+    CounterKey, TestCaseCounterRepository, counter_key
+)
 
 
 class TestCaseRepository:
+    # Sorting options exposed through sort_field
+    SORT_COLUMNS = {
+        "updated_at": TestCase.updated_at,
+        "created_at": TestCase.created_at,
+        "name": TestCase.name,
+    }
+    # Columns the facets endpoint groups by
+    FACET_COLUMNS = {
+        "test_case_status_id": TestCase.test_case_status_id,
+        "test_case_type_id": TestCase.test_case_type_id,
+        "priority_id": TestCase.priority_id,
+        "folder_id": TestCase.folder_id,
+        "release_id": TestCase.release_id,
+    }
+
+    # Filters the counter table can answer; anything else needs a live count
+    COUNTER_FILTERS = {"statusIds", "typeIds"}
+    # Columns written by the export, in output order
+    EXPORT_COLUMNS = [
+        TestCase.id, TestCase.project_id, TestCase.name, TestCase.description, TestCase.test_case_status_id,
+        TestCase.test_case_type_id, TestCase.priority_id, TestCase.release_id, TestCase.folder_id,
+        TestCase.is_deleted, TestCase.created_at, TestCase.updated_at,
+    ]
+    # Rows per multi-row INSERT for steps (keeps bind parameters well under the 32767 limit)
+    STEP_INSERT_CHUNK = 2000
+
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.counters = TestCaseCounterRepository(session)
+        self.search_index = SearchIndexRepository(session)
+
+    @staticmethod
+    def _filter_conditions(filters: Optional[dict]) -> List:
+        """Translate the search filter grammar into WHERE conditions on TestCase."""
+        filters = filters or {}
+        conds = []
+        name_contains = filters.get("nameContains")
+        if name_contains:
+            # nameMatch="fuzzy" switches to trigram similarity (typo tolerant)
+            conds.append(name_match(TestCase.name, name_contains, filters.get("nameMatch") == "fuzzy"))
+
+        status_ids = filters.get("statusIds")
+        if status_ids:
+            conds.append(TestCase.test_case_status_id.in_(status_ids))
+
+        type_ids = filters.get("typeIds")
+        if type_ids:
+            conds.append(TestCase.test_case_type_id.in_(type_ids))
+
+        priority_ids = filters.get("priorityIds")
+        if priority_ids:
+            conds.append(TestCase.priority_id.in_(priority_ids))
+
+        folder_ids = filters.get("folderIds")
+        if folder_ids:
+            if filters.get("includeDescendants"):
+                # Semi-join on the closure PK (ancestor_id, descendant_id): whole subtrees, one lookup
+                conds.append(TestCase.folder_id.in_(
+                    select(FolderClosure.descendant_id).where(FolderClosure.ancestor_id.in_(folder_ids))
+                ))
+            else:
+                conds.append(TestCase.folder_id.in_(folder_ids))
+        return conds
 
     def _base_query(self):
         return (
@@ -19,7 +93,25 @@ class TestCaseRepository:
             .options(selectinload(TestCase.steps))
         )
 
+    async def existing_folders(self, project_id: int, folder_ids: Iterable[int]) -> set:
+        """The subset of folder_ids that are folders of this project."""
+        folder_ids = sorted(set(folder_ids))
+        if not folder_ids:
+            return set()
+        res = await self.session.execute(
+            select(Folder.id).where(Folder.project_id == project_id, Folder.id.in_(folder_ids))
+        )
+        return set(res.scalars())
+
+    async def _check_folder(self, project_id: int, folder_id: Optional[int]) -> None:
+        # folder_id's FK alone would accept another project's folder
+        if folder_id is None:
+            return
+        if not await self.existing_folders(project_id, [folder_id]):
+            raise HTTPException(status_code=404, detail=f"Folder {folder_id} not found in this project")
+
     async def create(self, project_id: int, data: dict) -> TestCase:
+        await self._check_folder(project_id, data.get("folderId"))
         obj = TestCase(
             project_id=project_id,
             name=data["name"],
@@ -33,8 +125,65 @@ class TestCaseRepository:
         self.session.add(obj)
         await self.session.flush()
         await self.session.refresh(obj)
+        await self.counters.increment([counter_key(obj)])
+        await self.search_index.refresh("test_case", [obj.id])
         return obj
 
+    async def existing_names(self, project_id: int, names: List[str]) -> set:
+        if not names:
+            return set()
+        res = await self.session.execute(
+            select(TestCase.name).where(
+                TestCase.project_id == project_id, TestCase.is_deleted == False, TestCase.name.in_(names)
+            )
+        )
+        return set(res.scalars())
+
+    async def bulk_create(self, project_id: int, rows: List[dict]) -> Tuple[Dict[str, int], int]:
+        """
+        Insert import rows (name-unique within the batch) with one multi-row INSERT ... RETURNING,
+        then their steps in chunked multi-row INSERTs. Core statements only, so nothing is added
+        to the identity map. Names that already exist are skipped by the partial unique index.
+        Folder ids are not checked here: the caller drops rows failing existing_folders() first.
+        Returns ({name: new id}, steps inserted).
+        """
+        if not rows:
+            return {}, 0
+        stmt = pg_insert(TestCase).values([
+            {
+                "project_id": project_id,
+                "name": r["name"],
+                "description": r.get("description"),
+                "test_case_status_id": r["testCaseStatusId"],
+                "test_case_type_id": r["testCaseTypeId"],
+                "priority_id": r.get("priorityId"),
+                "release_id": r.get("releaseId"),
+                "folder_id": r.get("folderId"),
+            }
+            for r in rows
+        ])
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[TestCase.project_id, TestCase.name], index_where=~TestCase.is_deleted
+        ).returning(TestCase.id, TestCase.name, TestCase.release_id, TestCase.test_case_status_id,
+                    TestCase.test_case_type_id)
+        inserted = (await self.session.execute(stmt)).all()
+        ids = {r.name: r.id for r in inserted}
+
+        step_rows = [
+            {"test_case_id": ids[r["name"]], "position": st["sequence"] * STEP_POSITION_GAP,
+             "action": st["action"], "expected_result": st.get("expected_result")}
+            for r in rows if r["name"] in ids
+            for st in r.get("steps") or []
+        ]
+        for i in range(0, len(step_rows), self.STEP_INSERT_CHUNK):
+            await self.session.execute(pg_insert(TestStep).values(step_rows[i:i + self.STEP_INSERT_CHUNK]))
+
+        await self.counters.increment(
+            (project_id, r.release_id, r.test_case_status_id, r.test_case_type_id) for r in inserted
+        )
+        await self.search_index.refresh("test_case", ids.values())
+        return ids, len(step_rows)
+
     async def get_by_id(self, project_id: int, test_case_id: int) -> Optional[TestCase]:
         res = await self.session.execute(
             self._base_query().where(
@@ -44,47 +193,88 @@ class TestCaseRepository:
         )
         return res.scalar_one_or_none()
 
+    async def version(self, project_id: int, test_case_id: int, lock: bool = False) -> Optional[datetime]:
+        """updated_at only (every write to a case or its steps bumps it); lock=True holds the row until commit."""
+        stmt = select(TestCase.updated_at).where(
+            TestCase.project_id == project_id, TestCase.id == test_case_id, TestCase.is_deleted == False
+        )
+        if lock:
+            stmt = stmt.with_for_update()
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
     async def soft_delete(self, project_id: int, test_case_id: int) -> bool:
-        obj = await self.get_by_id(project_id, test_case_id)
-        if not obj:
-            return False
-        obj.is_deleted = True
-        obj.deleted_at = datetime.utcnow()
-        await self.session.flush()
-        return True
+        return bool(await self.bulk_soft_delete(project_id, ids=[test_case_id]))
 
-    async def upsert_steps(self, test_case: TestCase, steps_payload: List[dict]) -> None:
-        # Map existing by id for quick access
-        existing = {s.id: s for s in (test_case.steps or [])}
-        for s in steps_payload:
-            if s.get("deleted"):
-                sid = s.get("id")
-                if sid and sid in existing:
-                    await self.session.delete(existing[sid])
-                continue
+    async def upsert_steps(self, test_case_id: int, steps_payload: List[dict]) -> None:
+        """
+        Apply a steps payload in at most four statements: DELETE the flagged ids, UPDATE the
+        rest FROM VALUES, INSERT whatever did not match an existing step, then respace the case.
+        Payload sequences are dense (1..n) and are stored as evenly spaced positions. The position
+        constraint is deferred meanwhile so steps can swap/renumber freely, then checked before
+        returning.
+        """
+        delete_ids = sorted({s["id"] for s in steps_payload if s.get("deleted") and s.get("id")})
+        keep = [s for s in steps_payload if not s.get("deleted")]
+        update_rows = [s for s in keep if s.get("id")]
 
-            if s.get("id") and s["id"] in existing:
-                step = existing[s["id"]]
-                step.sequence = s["sequence"]
-                step.action = s["action"]
-                step.expected_result = s.get("expected_result")
-            else:
-                self.session.add(TestStep(
-                    test_case_id=test_case.id,
-                    sequence=s["sequence"],
-                    action=s["action"],
-                    expected_result=s.get("expected_result")
-                ))
+        if delete_ids:
+            await self.session.execute(
+                delete(TestStep)
+                .where(TestStep.test_case_id == test_case_id,
+                       TestStep.id == any_(bindparam("delete_ids", delete_ids, type_=ARRAY(Integer))))
+                .execution_options(synchronize_session=False)
+            )
 
-        # Ensure uniqueness of sequence inside the same test_case is enforced by DB constraint.
-        await self.session.flush()
-        # Reload with sorted steps
-        await self.session.refresh(test_case)
+        await self.session.execute(text("SET CONSTRAINTS uq_test_step_position_per_case DEFERRED"))
+
+        updated_ids = set()
+        if update_rows:
+            v = values(
+                column("id", Integer), column("position", BigInteger), column("action", Text),
+                column("expected_result", Text),
+                name="v",
+            ).data([(s["id"], s["sequence"] * STEP_POSITION_GAP, s["action"], s.get("expected_result"))
+                    for s in update_rows])
+            res = await self.session.execute(
+                update(TestStep)
+                .where(TestStep.id == v.c.id, TestStep.test_case_id == test_case_id)
+                .values(position=v.c.position, action=v.c.action, expected_result=v.c.expected_result)
+                .returning(TestStep.id)
+                .execution_options(synchronize_session=False)
+            )
+            updated_ids = set(res.scalars())
+
+        # New steps, plus ids that did not belong to this case (same as before: treated as new)
+        new_rows = [
+            {"test_case_id": test_case_id, "position": s["sequence"] * STEP_POSITION_GAP,
+             "action": s["action"], "expected_result": s.get("expected_result")}
+            for s in keep if s.get("id") not in updated_ids
+        ]
+        if new_rows:
+            await self.session.execute(pg_insert(TestStep).values(new_rows))
+
+        # Steps the payload left out keep the sparse positions moves gave them, which
+        # sequence * GAP can land on; respacing in (position, id) order settles any tie
+        await self.rebalance_steps(test_case_id)
+
+        # Surface a duplicate position here rather than at COMMIT
+        await self.session.execute(text("SET CONSTRAINTS uq_test_step_position_per_case IMMEDIATE"))
 
     async def update_with_steps(self, project_id: int, payload: dict) -> Optional[TestCase]:
-        obj = await self.get_by_id(project_id, payload["id"])
+        # Steps are not loaded here: they are rewritten set-based and come back with the reload.
+        # Row-locked so a concurrent PUT can't compute its counter delta from the same old key.
+        res = await self.session.execute(
+            select(TestCase)
+            .where(TestCase.project_id == project_id, TestCase.id == payload["id"], TestCase.is_deleted == False)
+            .options(noload(TestCase.steps))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        obj = res.scalar_one_or_none()
         if not obj:
             return None
+        old_key = counter_key(obj)
+        await self._check_folder(project_id, payload.get("folderId"))
 
         # Update fields if provided
         for in_key, model_key in [
@@ -100,30 +290,367 @@ class TestCaseRepository:
                 setattr(obj, model_key, payload[in_key])
 
         if payload.get("steps") is not None:
-            await self.upsert_steps(obj, payload["steps"])
+            obj.updated_at = datetime.utcnow()  # step edits count as a change to the case
+            await self.session.flush()
+            await self.upsert_steps(obj.id, payload["steps"])
 
-        await self.session.flush()
-        await self.session.refresh(obj)
+        # Single reload: case + ordered steps in one joined query, overwriting stale state
+        res = await self.session.execute(
+            select(TestCase)
+            .where(TestCase.id == obj.id)
+            .options(joinedload(TestCase.steps))
+            .execution_options(populate_existing=True)
+        )
+        obj = res.unique().scalar_one()
+        await self.counters.move(old_key, counter_key(obj))
+        await self.search_index.refresh("test_case", [obj.id])
         return obj
 
-    async def move(self, project_id: int, test_case_id: int, new_folder_id: int) -> bool:
-        obj = await self.get_by_id(project_id, test_case_id)
-        if not obj:
+    # ── single-step operations ────────────────────────────────────────────────
+    # Steps are ordered by a sparse position. Insert/move write only the affected row at the
+    # midpoint of its new neighbours; the case is renumbered only when that gap is used up.
+
+    async def _lock_case(self, project_id: int, test_case_id: int) -> bool:
+        # Serialises step edits per case so two writers cannot pick the same midpoint
+        res = await self.session.execute(
+            select(TestCase.id)
+            .where(TestCase.project_id == project_id, TestCase.id == test_case_id, TestCase.is_deleted == False)
+            .with_for_update()
+        )
+        return res.scalar_one_or_none() is not None
+
+    async def _step_position(self, test_case_id: int, step_id: int) -> int:
+        res = await self.session.execute(
+            select(TestStep.position).where(TestStep.test_case_id == test_case_id, TestStep.id == step_id)
+        )
+        position = res.scalar_one_or_none()
+        if position is None:
+            raise HTTPException(status_code=404, detail=f"Step {step_id} not found in this test case")
+        return position
+
+    async def _new_position(self, test_case_id: int, before_step_id: Optional[int], after_step_id: Optional[int],
+                            exclude_step_id: Optional[int] = None) -> Optional[int]:
+        """Position between the requested neighbours (append when no anchor); None if no gap is left."""
+        others = [TestStep.test_case_id == test_case_id]
+        if exclude_step_id is not None:
+            others.append(TestStep.id != exclude_step_id)
+
+        if after_step_id is not None:
+            lo = await self._step_position(test_case_id, after_step_id)
+            hi = (await self.session.execute(
+                select(func.min(TestStep.position)).where(*others, TestStep.position > lo)
+            )).scalar()
+        elif before_step_id is not None:
+            hi = await self._step_position(test_case_id, before_step_id)
+            lo = (await self.session.execute(
+                select(func.max(TestStep.position)).where(*others, TestStep.position < hi)
+            )).scalar()
+        else:
+            lo = (await self.session.execute(select(func.max(TestStep.position)).where(*others))).scalar()
+            hi = None
+
+        if lo is None and hi is None:
+            return STEP_POSITION_GAP
+        if hi is None:
+            return lo + STEP_POSITION_GAP
+        if lo is None:
+            return hi - STEP_POSITION_GAP
+        return (lo + hi) // 2 if hi - lo > 1 else None
+
+    async def rebalance_steps(self, test_case_id: int) -> None:
+        """Respace a case's steps evenly (one UPDATE; the deferrable constraint is checked per statement)."""
+        ranked = (
+            select(TestStep.id, func.row_number().over(order_by=(TestStep.position, TestStep.id)).label("rn"))
+            .where(TestStep.test_case_id == test_case_id)
+            .subquery("ranked")
+        )
+        await self.session.execute(
+            update(TestStep)
+            .where(TestStep.id == ranked.c.id)
+            .values(position=ranked.c.rn * STEP_POSITION_GAP)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _placed_position(self, test_case_id: int, before_step_id: Optional[int],
+                               after_step_id: Optional[int], exclude_step_id: Optional[int] = None) -> int:
+        position = await self._new_position(test_case_id, before_step_id, after_step_id, exclude_step_id)
+        if position is None:
+            await self.rebalance_steps(test_case_id)
+            position = await self._new_position(test_case_id, before_step_id, after_step_id, exclude_step_id)
+        return position
+
+    async def _step_out(self, step_id: int) -> dict:
+        # Dense sequence = number of steps up to and including this one
+        mine = select(TestStep).where(TestStep.id == step_id).subquery("mine")
+        preceding = (
+            select(func.count())
+            .where(TestStep.test_case_id == mine.c.test_case_id, TestStep.position <= mine.c.position)
+            .scalar_subquery()
+        )
+        row = (await self.session.execute(select(mine, preceding.label("sequence")))).one()
+        return {"id": row.id, "sequence": row.sequence, "position": row.position, "action": row.action,
+                "expected_result": row.expected_result}
+
+    async def _touch(self, test_case_id: int) -> None:
+        await self.session.execute(
+            update(TestCase).where(TestCase.id == test_case_id).values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await self.search_index.refresh("test_case", [test_case_id])
+
+    async def insert_step(self, project_id: int, test_case_id: int, data: dict) -> Optional[dict]:
+        if not await self._lock_case(project_id, test_case_id):
+            return None
+        position = await self._placed_position(test_case_id, data.get("before_step_id"), data.get("after_step_id"))
+        res = await self.session.execute(
+            pg_insert(TestStep).values(
+                test_case_id=test_case_id, position=position, action=data["action"],
+                expected_result=data.get("expected_result"),
+            ).returning(TestStep.id)
+        )
+        step_id = res.scalar_one()
+        await self._touch(test_case_id)
+        return await self._step_out(step_id)
+
+    async def move_step(self, project_id: int, test_case_id: int, step_id: int, data: dict) -> Optional[dict]:
+        if not await self._lock_case(project_id, test_case_id):
+            return None
+        await self._step_position(test_case_id, step_id)  # 404 if it is not this case's step
+        if step_id in (data.get("before_step_id"), data.get("after_step_id")):
+            raise HTTPException(status_code=400, detail="A step cannot be moved relative to itself")
+        position = await self._placed_position(test_case_id, data.get("before_step_id"), data.get("after_step_id"),
+                                               exclude_step_id=step_id)
+        await self.session.execute(
+            update(TestStep).where(TestStep.id == step_id).values(position=position)
+            .execution_options(synchronize_session=False)
+        )
+        await self._touch(test_case_id)
+        return await self._step_out(step_id)
+
+    async def delete_step(self, project_id: int, test_case_id: int, step_id: int) -> bool:
+        if not await self._lock_case(project_id, test_case_id):
             return False
-        obj.folder_id = new_folder_id
-        await self.session.flush()
+        res = await self.session.execute(
+            delete(TestStep).where(TestStep.test_case_id == test_case_id, TestStep.id == step_id)
+            .returning(TestStep.id)
+            .execution_options(synchronize_session=False)
+        )
+        if res.scalar_one_or_none() is None:
+            return False
+        # Later steps keep their positions; their dense sequence simply shifts on read
+        await self._touch(test_case_id)
         return True
 
-    async def count(self, project_id: int, release_id: Optional[int] = None, filters: Optional[dict] = None) -> int:
+    async def move(self, project_id: int, test_case_id: int, new_folder_id: int) -> bool:
+        if await self.bulk_move(project_id, new_folder_id, ids=[test_case_id]):
+            return True
+        # Already in that folder is still a successful move
+        return await self.get_by_id(project_id, test_case_id) is not None
+
+    # ── bulk operations ───────────────────────────────────────────────────────
+    # Each selects by explicit ids or by the search filter grammar and runs as one UPDATE ... RETURNING.
+
+    def _selection(self, project_id: int, ids: Optional[List[int]], filters: Optional[dict],
+                   release_id: Optional[int], deleted: bool) -> List:
+        conds = [TestCase.project_id == project_id, TestCase.is_deleted == deleted]
+        if ids is not None:
+            conds.append(TestCase.id == any_(bindparam("ids", sorted(set(ids)), type_=ARRAY(Integer))))
+        else:
+            conds.extend(self._filter_conditions(filters))
+        if release_id is not None:
+            conds.append(TestCase.release_id == release_id)
+        return conds
+
+    async def bulk_move(self, project_id: int, folder_id: Optional[int], ids: Optional[List[int]] = None,
+                        filters: Optional[dict] = None, release_id: Optional[int] = None) -> List[int]:
+        await self._check_folder(project_id, folder_id)
+        res = await self.session.execute(
+            update(TestCase)
+            .where(*self._selection(project_id, ids, filters, release_id, deleted=False),
+                   TestCase.folder_id.is_distinct_from(folder_id))
+            .values(folder_id=folder_id, updated_at=datetime.utcnow())
+            .returning(TestCase.id)
+            .execution_options(synchronize_session=False)
+        )
+        # folder is not part of the counter key or the search document: nothing else to adjust
+        return sorted(res.scalars())
+
+    # API field -> column for mass edits
+    BULK_UPDATE_FIELDS = {
+        "testCaseStatusId": TestCase.test_case_status_id,
+        "testCaseTypeId": TestCase.test_case_type_id,
+        "priorityId": TestCase.priority_id,
+        "releaseId": TestCase.release_id,
+        "folderId": TestCase.folder_id,
+    }
+
+    async def bulk_update(self, project_id: int, fields: dict, ids: Optional[List[int]] = None,
+                          filters: Optional[dict] = None, release_id: Optional[int] = None,
+                          dry_run: bool = False) -> Tuple[int, List[int]]:
+        """
+        Set the given attributes (BULK_UPDATE_FIELDS keys) on every selected case in one statement.
+        Only cases where some value actually changes are written, and they all get the same
+        updated_at. Counter deltas come from the pre-update values read in the same statement.
+        Returns (matched, ids); dry_run only counts.
+        """
+        changes = {self.BULK_UPDATE_FIELDS[k].key: v for k, v in fields.items()}
+        await self._check_folder(project_id, changes.get("folder_id"))
+        conds = self._selection(project_id, ids, filters, release_id, deleted=False)
+        conds.append(or_(*[getattr(TestCase, col).is_distinct_from(v) for col, v in changes.items()]))
+
+        if dry_run:
+            res = await self.session.execute(select(func.count()).select_from(TestCase).where(*conds))
+            return int(res.scalar() or 0), []
+
+        # Lock and capture the old counter keys; UPDATE ... FROM exposes them to RETURNING
+        old = (
+            select(TestCase.id, TestCase.release_id, TestCase.test_case_status_id, TestCase.test_case_type_id)
+            .where(*conds)
+            .with_for_update()
+            .cte("old")
+        )
+        res = await self.session.execute(
+            update(TestCase)
+            .where(TestCase.id == old.c.id)
+            .values(**changes, updated_at=datetime.utcnow())
+            .returning(TestCase.id, TestCase.project_id, TestCase.release_id, TestCase.test_case_status_id,
+                       TestCase.test_case_type_id, old.c.release_id.label("old_release_id"),
+                       old.c.test_case_status_id.label("old_status_id"),
+                       old.c.test_case_type_id.label("old_type_id"))
+            .execution_options(synchronize_session=False)
+        )
+        rows = res.all()
+
+        deltas: Dict[CounterKey, int] = {}
+        for r in rows:
+            before = (r.project_id, r.old_release_id, r.old_status_id, r.old_type_id)
+            after = counter_key(r)
+            if before != after:
+                deltas[before] = deltas.get(before, 0) - 1
+                deltas[after] = deltas.get(after, 0) + 1
+        await self.counters.apply(deltas)
+        # Search documents only hold name/description/steps: nothing to refresh
+        return len(rows), sorted(r.id for r in rows)
+
+    async def bulk_soft_delete(self, project_id: int, ids: Optional[List[int]] = None,
+                               filters: Optional[dict] = None, release_id: Optional[int] = None) -> List[int]:
+        now = datetime.utcnow()
+        res = await self.session.execute(
+            update(TestCase)
+            .where(*self._selection(project_id, ids, filters, release_id, deleted=False))
+            .values(is_deleted=True, deleted_at=now, updated_at=now)
+            .returning(TestCase.id, TestCase.project_id, TestCase.release_id, TestCase.test_case_status_id,
+                       TestCase.test_case_type_id)
+            .execution_options(synchronize_session=False)
+        )
+        rows = res.all()
+        await self.counters.decrement(counter_key(r) for r in rows)
+        await self.search_index.remove("test_case", [r.id for r in rows])
+        return sorted(r.id for r in rows)
+
+    async def bulk_restore(self, project_id: int, ids: Optional[List[int]] = None, filters: Optional[dict] = None,
+                           release_id: Optional[int] = None) -> Tuple[List[int], List[int]]:
+        """
+        Undelete the selected soft-deleted cases. A case is skipped (reported as a conflict) when an
+        active case already has its name, or when an earlier-deleted duplicate loses to the most
+        recently deleted one, so uq_test_case_name_per_project_active always holds.
+        Returns (restored ids, conflicting ids).
+        """
+        candidates = (
+            select(TestCase.id, TestCase.name, TestCase.deleted_at)
+            .where(*self._selection(project_id, ids, filters, release_id, deleted=True))
+            .cte("candidates")
+        )
+        # One winner per name: the most recently deleted
+        winners = (
+            select(candidates.c.id)
+            .distinct(candidates.c.name)
+            .order_by(candidates.c.name, candidates.c.deleted_at.desc().nulls_last(), candidates.c.id.desc())
+            .subquery("winners")
+        )
+        active = aliased(TestCase, name="active")
+        name_taken = (
+            select(active.id)
+            .where(active.project_id == TestCase.project_id, active.name == TestCase.name, active.is_deleted == False)
+            .exists()
+        )
+        restored = (
+            update(TestCase)
+            .where(TestCase.id == winners.c.id, ~name_taken)
+            .values(is_deleted=False, deleted_at=None, updated_at=datetime.utcnow())
+            .returning(TestCase.id, TestCase.project_id, TestCase.release_id, TestCase.test_case_status_id,
+                       TestCase.test_case_type_id)
+            .cte("restored")
+        )
+        stmt = (
+            select(candidates.c.id, restored.c.project_id, restored.c.release_id, restored.c.test_case_status_id,
+                   restored.c.test_case_type_id, restored.c.id.is_not(None).label("ok"))
+            .select_from(candidates.outerjoin(restored, restored.c.id == candidates.c.id))
+        )
+        rows = (await self.session.execute(stmt)).all()
+        done = [r for r in rows if r.ok]
+        await self.counters.increment(
+            (r.project_id, r.release_id, r.test_case_status_id, r.test_case_type_id) for r in done
+        )
+        await self.search_index.refresh("test_case", [r.id for r in done])
+        return sorted(r.id for r in done), sorted(r.id for r in rows if not r.ok)
+
+    async def count(self, project_id: int, release_id: Optional[int] = None, filters: Optional[dict] = None,
+                    mode: str = "live") -> int:
+        """mode="counter" reads the maintained counter table when the filters allow it, else counts live."""
+        active = {k for k, v in (filters or {}).items() if v}
+        if mode == "counter" and active <= self.COUNTER_FILTERS:
+            return await self.counters.count(project_id, release_id,
+                                             status_ids=(filters or {}).get("statusIds"),
+                                             type_ids=(filters or {}).get("typeIds"))
+
         stmt = select(func.count()).select_from(TestCase).where(
             TestCase.project_id == project_id, TestCase.is_deleted == False
         )
         if release_id is not None:
             stmt = stmt.where(TestCase.release_id == release_id)
-        # Optional: apply filters here
+        for cond in self._filter_conditions(filters):
+            stmt = stmt.where(cond)
         res = await self.session.execute(stmt)
         return int(res.scalar() or 0)
 
+    async def facets(self, project_id: int, release_id: Optional[int] = None,
+                     filters: Optional[dict] = None) -> dict:
+        """
+        Grouped counts for every facet column in one GROUPING SETS scan.
+        Returns {"total": n, "facets": {column: [{"value": v, "count": c}, ...]}}.
+        """
+        cols = list(self.FACET_COLUMNS.values())
+        stmt = (
+            select(
+                *cols,
+                *[func.grouping(c).label(f"g_{name}") for name, c in self.FACET_COLUMNS.items()],
+                func.count().label("cnt"),
+            )
+            .where(TestCase.project_id == project_id, TestCase.is_deleted == False)
+            # one set per facet plus () for the grand total
+            .group_by(func.grouping_sets(*[tuple_(c) for c in cols], tuple_()))
+        )
+        if release_id is not None:
+            stmt = stmt.where(TestCase.release_id == release_id)
+        for cond in self._filter_conditions(filters):
+            stmt = stmt.where(cond)
+
+        res = await self.session.execute(stmt)
+        facets = {name: [] for name in self.FACET_COLUMNS}
+        total = 0
+        for row in res.all():
+            m = row._mapping
+            grouped = [name for name in self.FACET_COLUMNS if m[f"g_{name}"] == 0]
+            if not grouped:
+                total = int(m["cnt"])
+                continue
+            name = grouped[0]
+            facets[name].append({"value": m[self.FACET_COLUMNS[name]], "count": int(m["cnt"])})
+        for buckets in facets.values():
+            buckets.sort(key=lambda b: -b["count"])
+        return {"total": total, "facets": facets}
+
     async def search(
             self,
             project_id: int,
@@ -132,57 +659,117 @@ class TestCaseRepository:
             sort_field: str,
             sort_direction: str,
             release_id: Optional[int],
-            filters: dict
-    ) -> Tuple[int, List[TestCase]]:
-        base = self._base_query().where(TestCase.project_id == project_id)
+            filters: dict,
+            total_mode: str = "exact",
+    ) -> Tuple[Optional[int], List[TestCase], bool]:
+        """
+        Returns (total, items, has_more).
+        total_mode: "exact" counts with a window over the filtered rows (same statement as the page),
+        "estimate" asks the planner, "none" skips counting and only probes for one more row.
+        """
+        conds = [TestCase.project_id == project_id, *self._filter_conditions(filters)]
         if release_id is not None:
-            base = base.where(TestCase.release_id == release_id)
-
-        # Example filters
-        name_contains = filters.get("nameContains")
-        if name_contains:
-            base = base.where(TestCase.name.ilike(f"%{name_contains}%"))
-
-        status_ids = filters.get("statusIds")
-        if status_ids:
-            base = base.where(TestCase.test_case_status_id.in_(status_ids))
+            conds.append(TestCase.release_id == release_id)
+        base = self._base_query().where(*conds)
 
-        type_ids = filters.get("typeIds")
-        if type_ids:
-            base = base.where(TestCase.test_case_type_id.in_(type_ids))
+        estimated = None
+        if total_mode == "estimate":
+            estimated = await estimate_rows(
+                self.session, select(TestCase.id).where(TestCase.is_deleted == False, *conds)
+            )
 
-        priority_ids = filters.get("priorityIds")
-        if priority_ids:
-            base = base.where(TestCase.priority_id.in_(priority_ids))
+        # Fuzzy name search ranks by similarity first; the requested sort breaks ties
+        if filters.get("nameContains") and filters.get("nameMatch") == "fuzzy":
+            base = base.order_by(similarity_rank(TestCase.name, filters["nameContains"]))
 
-        folder_ids = filters.get("folderIds")
-        if folder_ids:
-            base = base.where(TestCase.folder_id.in_(folder_ids))
-
-        # Sorting
-        col_map = {
-            "updated_at": TestCase.updated_at,
-            "created_at": TestCase.created_at,
-            "name": TestCase.name,
-        }
-        order_col = col_map.get(sort_field, TestCase.updated_at)
+        # Sorting (id keeps OFFSET pages stable when the sort column has ties)
+        order_col = self.SORT_COLUMNS.get(sort_field, TestCase.updated_at)
         if sort_direction.lower() == "desc":
-            base = base.order_by(desc(order_col))
+            base = base.order_by(desc(order_col), desc(TestCase.id))
         else:
-            base = base.order_by(order_col)
+            base = base.order_by(order_col, TestCase.id)
 
-        # Total
-        total_stmt = select(func.count()).select_from(
-            select(TestCase.id).where(
-                TestCase.project_id == project_id,
-                TestCase.is_deleted == False
-            ).subquery()
-        )
-        res_total = await self.session.execute(total_stmt)
-        total = int(res_total.scalar() or 0)
+        if total_mode == "exact":
+            # count(*) OVER () is evaluated before LIMIT/OFFSET, so it sees every filtered row
+            stmt = base.add_columns(func.count().over().label("total_count"))
+            res = await self.session.execute(stmt.offset(starting_row).limit(number_of_rows))
+            rows = res.all()
+            items = [r[0] for r in rows]
+            if rows:
+                total = int(rows[0].total_count)
+            elif starting_row > 0:
+                # Page past the end: no row to carry the window value
+                total = await self.count(project_id, release_id, filters)
+            else:
+                total = 0
+            return total, items, starting_row + len(items) < total
 
-        # Page window
-        base = base.offset(starting_row).limit(number_of_rows)
-        res = await self.session.execute(base)
+        # Probe one extra row so callers still learn whether another page exists
+        res = await self.session.execute(base.offset(starting_row).limit(number_of_rows + 1))
         items = list(res.scalars().unique())
-        return total, items
+        has_more = len(items) > number_of_rows
+        return estimated, items[:number_of_rows], has_more
+
+    async def search_keyset(
+            self,
+            project_id: int,
+            number_of_rows: int,
+            sort_field: str,
+            sort_direction: str,
+            release_id: Optional[int],
+            filters: dict,
+            cursor: Optional[str] = None,
+    ) -> KeysetPage[TestCase]:
+        if sort_field not in self.SORT_COLUMNS:
+            sort_field = "updated_at"
+        sort_direction = normalize_direction(sort_direction)
+        decoded = decode_cursor(cursor, sort_field, sort_direction) if cursor else None
+
+        base = self._base_query().where(TestCase.project_id == project_id)
+        if release_id is not None:
+            base = base.where(TestCase.release_id == release_id)
+        for cond in self._filter_conditions(filters):
+            base = base.where(cond)
+
+        stmt = apply_keyset(base, self.SORT_COLUMNS[sort_field], TestCase.id, sort_direction, decoded,
+                            number_of_rows)
+        res = await self.session.execute(stmt)
+        return build_page(list(res.scalars().unique()), number_of_rows, decoded, sort_field, sort_direction,
+                          key=lambda tc: (getattr(tc, sort_field), tc.id))
+
+    async def stream_for_export(self, project_id: int, release_id: Optional[int], filters: Optional[dict],
+                                batch_size: int = 1000) -> AsyncIterator[List[dict]]:
+        """
+        Yield batches of plain dicts (EXPORT_COLUMNS + "steps") read through a server-side cursor,
+        in id order. Steps are loaded per batch with one keyed query. No ORM instances are built,
+        so memory stays at one batch regardless of project size.
+        """
+        stmt = (
+            select(*self.EXPORT_COLUMNS)
+            .where(TestCase.project_id == project_id, TestCase.is_deleted == False,
+                   *self._filter_conditions(filters))
+            .order_by(TestCase.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if release_id is not None:
+            stmt = stmt.where(TestCase.release_id == release_id)
+
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            cases = [dict(r._mapping) for r in partition]
+            steps_by_case: Dict[int, List[dict]] = {c["id"]: [] for c in cases}
+            steps = await self.session.execute(
+                select(TestStep.test_case_id, TestStep.id, TestStep.position, TestStep.action,
+                       TestStep.expected_result)
+                .where(TestStep.test_case_id.in_(list(steps_by_case)))
+                .order_by(TestStep.test_case_id, TestStep.position)
+            )
+            for st in steps.all():
+                case_steps = steps_by_case[st.test_case_id]
+                case_steps.append(
+                    {"id": st.id, "sequence": len(case_steps) + 1, "position": st.position, "action": st.action,
+                     "expected_result": st.expected_result}
+                )
+            for c in cases:
+                c["steps"] = steps_by_case[c["id"]]
+            yield cases
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.models.token_revocation_model import TokenRevocation
+
+
+class TokenRevocationRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def revoke(self, user_ids: Iterable[int]) -> None:
+        """Record in the caller's transaction; mirror into the local list once it commits."""
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return
+        # clock_timestamp(), not now(): a long transaction would otherwise record its start time,
+        # which can sit further behind its commit than RevocationSync's overlap window
+        stmt = pg_insert(TokenRevocation).values(
+            [{"user_id": u, "revoked_at": func.clock_timestamp()} for u in user_ids]
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(index_elements=[TokenRevocation.user_id],
+                                       set_={"revoked_at": func.clock_timestamp()})
+        )
+
+    async def since(self, after: Optional[datetime]) -> List[Tuple[int, datetime]]:
+        stmt = select(TokenRevocation.user_id, TokenRevocation.revoked_at)
+        if after is not None:
+            stmt = stmt.where(TokenRevocation.revoked_at > after)
+        return [(r.user_id, r.revoked_at) for r in (await self.session.execute(stmt)).all()]
+
+    async def prune(self, older_than: timedelta) -> None:
+        await self.session.execute(
+            delete(TokenRevocation).where(TokenRevocation.revoked_at < func.now() - older_than)
+        )
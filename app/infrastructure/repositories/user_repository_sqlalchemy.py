@@ -1,38 +1,73 @@
-from typing import Optional, Sequence
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy import select, update
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql.functions import func
 
 from app.application.interfaces.user_repository import IUserRepository
+from app.core.cache import LruTtlCache
 from app.core.db import get_session
-from app.infrastructure.models.user_model import User as UserModel
+from app.core.security import revocations
+from app.core.settings import settings
+from app.infrastructure.models.user_model import User as UserModel, UserSnapshot
+from app.infrastructure.repositories._pagination import KeysetPage, apply_keyset, build_page, decode_cursor
 from app.infrastructure.repositories._utils import make_deleted_username, make_deleted_email
+from app.infrastructure.repositories.token_revocation_repository_sqlalchemy import TokenRevocationRepository
+
+# Fields carried in access tokens (or gating them); changing one revokes the user's tokens
+TOKEN_FIELDS = {"admin", "active", "approved", "locked"}
+
+
+# Per-process lookup cache keyed ("id", 1) / ("username", "x") / ("email", "x@y"); all three
+# keys of a user hold the same snapshot. Writes here invalidate it; other workers converge
+# within the TTL.
+user_cache: LruTtlCache[UserSnapshot] = LruTtlCache(
+    "users", settings.user_cache_size, settings.user_cache_ttl_seconds
+)
+
+# Bumped on every invalidation; a lookup that raced with one is not cached
+_generation = 0
+
+
+def invalidate_user(id_: int, username: Optional[str] = None, email: Optional[str] = None) -> None:
+    global _generation
+    _generation += 1
+    cached = user_cache.peek(("id", id_))
+    keys = [("id", id_), ("username", username), ("email", email)]
+    if cached is not None:
+        keys += [("username", cached.username), ("email", cached.email)]
+    user_cache.delete(*keys)
 
 
 class SQLAlchemyUserRepository(IUserRepository):
     def __init__(self, session: get_session()) -> None:
         self.session = session
 
-    async def get_by_id(self, id_: int) -> Optional[UserModel]:
-        stmt = (
-            select(UserModel)
-            .where(
-                UserModel.id == id_,
-                UserModel.is_deleted.is_(False)  # 👈 enforce not deleted
-            )
-            .limit(1)
-        )
-        res = await self.session.execute(stmt)
-        return res.scalar_one_or_none()
+    async def _lookup(self, key: str, value, where) -> Optional[UserSnapshot]:
+        cached = user_cache.get((key, value))
+        if cached is not None:
+            return cached
+        seen = _generation
+        stmt = select(UserModel).where(where, UserModel.is_deleted.is_(False)).limit(1)
+        row = (await self.session.execute(stmt)).scalar_one_or_none()
+        if row is None:
+            return None
+        snap = UserSnapshot.of(row)
+        if seen != _generation:
+            return snap
+        for k in (("id", snap.id), ("username", snap.username), ("email", snap.email)):
+            user_cache.set(k, snap)
+        return snap
 
-    async def get_by_username(self, username: str) -> Optional[UserModel]:
-        stmt = select(UserModel).where(UserModel.username == username, UserModel.is_deleted.is_(False))
-        return (await self.session.execute(stmt)).scalar_one_or_none()
+    async def get_by_id(self, id_: int) -> Optional[UserSnapshot]:
+        return await self._lookup("id", id_, UserModel.id == id_)
 
-    async def get_by_email(self, email: str) -> Optional[UserModel]:
-        stmt = select(UserModel).where(UserModel.email == email, UserModel.is_deleted.is_(False))
-        return (await self.session.execute(stmt)).scalar_one_or_none()
+    async def get_by_username(self, username: str) -> Optional[UserSnapshot]:
+        return await self._lookup("username", username, UserModel.username == username)
+
+    async def get_by_email(self, email: str) -> Optional[UserSnapshot]:
+        return await self._lookup("email", email, UserModel.email == email)
 
     async def create(self, user: UserModel) -> UserModel:
         self.session.add(user)
@@ -45,16 +80,71 @@ class SQLAlchemyUserRepository(IUserRepository):
         await self.session.refresh(user)
         return user
 
+    async def existing_identities(self, usernames: Iterable[str], emails: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Usernames and emails already taken (deleted users included: the unique keys cover them), one query."""
+        usernames, emails = list(usernames), list(emails)
+        if not usernames and not emails:
+            return set(), set()
+        res = await self.session.execute(
+            select(UserModel.username, UserModel.email)
+            .where(or_(UserModel.username.in_(usernames), UserModel.email.in_(emails)))
+        )
+        rows = res.all()
+        return {r.username for r in rows} & set(usernames), {r.email for r in rows} & set(emails)
+
+    async def bulk_create(self, rows: List[dict]) -> List[UserModel]:
+        """
+        One multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING. Rows that lost a race on
+        username/email are simply absent from the result; the caller reports them.
+        """
+        if not rows:
+            return []
+        res = await self.session.execute(
+            pg_insert(UserModel).values(rows).on_conflict_do_nothing().returning(UserModel)
+        )
+        created = list(res.scalars())
+        await self.session.commit()
+        return created
+
+    async def bulk_set_flags(self, ids: Iterable[int], **flags: bool) -> List[int]:
+        """Set approved/locked/... on many users in one UPDATE; returns the ids that matched."""
+        ids = sorted(set(ids))
+        if not ids:
+            return []
+        res = await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id.in_(ids), UserModel.is_deleted.is_(False))
+            .values(**flags, updated_at=func.now())
+            .returning(UserModel.id, UserModel.username, UserModel.email)
+            .execution_options(synchronize_session=False)
+        )
+        rows = res.all()
+        revoke = [r.id for r in rows] if TOKEN_FIELDS & flags.keys() else []
+        await TokenRevocationRepository(self.session).revoke(revoke)
+        await self.session.commit()
+        for r in rows:
+            invalidate_user(r.id, r.username, r.email)
+        revocations.revoke(revoke)
+        return sorted(r.id for r in rows)
+
     async def list(self, limit: int = 50, offset: int = 0) -> Sequence[UserModel]:
         stmt = select(UserModel).where(UserModel.is_deleted.is_(False)).offset(offset).limit(limit)
         return (await self.session.execute(stmt)).scalars().all()
 
+    async def list_keyset(self, limit: int = 50, cursor: Optional[str] = None) -> KeysetPage[UserModel]:
+        decoded = decode_cursor(cursor, "id", "asc") if cursor else None
+        stmt = select(UserModel).where(UserModel.is_deleted.is_(False))
+        stmt = apply_keyset(stmt, UserModel.id, UserModel.id, "asc", decoded, limit)
+        rows = (await self.session.execute(stmt)).scalars().all()
+        return build_page(rows, limit, decoded, "id", "asc", key=lambda u: (u.id, u.id))
+
     async def update_fields(self, id_: int, fields: dict) -> Optional[UserModel]:
         res = await self.session.execute(
             select(UserModel.email, UserModel.username)
             .where(UserModel.id == id_, UserModel.is_deleted.is_(False))
         )
-        if not res.scalar_one_or_none():
+        curr = res.first()
+        if not curr:
             return None
         if not fields:
             return await self.get_by_id(id_)
@@ -69,7 +159,13 @@ class SQLAlchemyUserRepository(IUserRepository):
         if not row:
             await self.session.rollback()
             return None
+        revoke = TOKEN_FIELDS & fields.keys()
+        if revoke:
+            await TokenRevocationRepository(self.session).revoke([id_])
         await self.session.commit()
+        invalidate_user(id_, curr.username, curr.email)
+        if revoke:
+            revocations.revoke([id_])
         # reload
         return await self.get_by_id(id_)
 
@@ -110,7 +206,10 @@ class SQLAlchemyUserRepository(IUserRepository):
             return None
 
         # 3) Commit (so changes persist)
+        await TokenRevocationRepository(self.session).revoke([id])
         await self.session.commit()
+        invalidate_user(id, curr.username, curr.email)
+        revocations.revoke([id])
 
         # 4) Reload & return the fully populated entity
         return row
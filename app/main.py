@@ -1,21 +1,67 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 
+from app.core.authz import MEMBERSHIP_CHANNEL, invalidate_memberships, on_membership_notify
+from app.core.hashing import password_hasher
+from app.core.metrics import registry
+from app.core.response_cache import RESPONSE_CACHE_CHANNEL, on_response_cache_notify, response_cache
+from app.core.security import ensure_signing_key
 from app.core.settings import settings
+from app.infrastructure.auth.revocation_sync import RevocationSync
+from app.infrastructure.jobs.worker import JobWorkerPool
+from app.infrastructure.notify.pg_listener import pg_listener
+from app.presentation.controllers.auth_routes import auth_router
+from app.presentation.controllers.folder_routes import folder_router
+from app.presentation.controllers.job_routes import job_router
+from app.presentation.controllers.member_routes import member_router
 from app.presentation.controllers.portfolio_routes import portfolio_router
 from app.presentation.controllers.program_routes import program_router
 from app.presentation.controllers.project_routes import projects_router
+from app.presentation.controllers.search_routes import search_router
 from app.presentation.controllers.testcase_routes import test_router
 from app.presentation.controllers.user_routes import user_router
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ensure_signing_key()
+    # Bounded pool draining the jobs table; job_workers=0 leaves it to the standalone worker
+    app.state.job_pool = JobWorkerPool(settings.job_workers)
+    await app.state.job_pool.start()
+    app.state.revocation_sync = RevocationSync()
+    await app.state.revocation_sync.start()
+    pg_listener.subscribe(MEMBERSHIP_CHANNEL, on_membership_notify, on_reconnect=invalidate_memberships)
+    pg_listener.subscribe(RESPONSE_CACHE_CHANNEL, on_response_cache_notify, on_reconnect=response_cache.clear)
+    await pg_listener.start()
+    yield
+    await pg_listener.stop()
+    await response_cache.close()
+    await app.state.revocation_sync.stop()
+    await app.state.job_pool.stop()
+    password_hasher.shutdown()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app.include_router(auth_router, prefix=settings.api_prefix)
 app.include_router(user_router, prefix=settings.api_prefix)
 app.include_router(portfolio_router, prefix=settings.api_prefix)
 app.include_router(program_router, prefix=settings.api_prefix)
 app.include_router(projects_router, prefix=settings.api_prefix)
 app.include_router(test_router, prefix=settings.api_prefix)
+app.include_router(folder_router, prefix=settings.api_prefix)
+app.include_router(member_router, prefix=settings.api_prefix)
+app.include_router(search_router, prefix=settings.api_prefix)
+app.include_router(job_router, prefix=settings.api_prefix)
 
 
 @app.get("/", include_in_schema=False)
 def root():
     return RedirectResponse(url="/docs")
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    # Per worker process; scrape every worker (or aggregate) for the full picture
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
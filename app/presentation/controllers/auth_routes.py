@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.use_cases.issue_token_usecase import IssueTokenUseCase
+from app.core.db import get_session
+from app.infrastructure.repositories.user_repository_sqlalchemy import SQLAlchemyUserRepository
+from app.presentation.schemas.auth_schema import TokenRequest, TokenResponse
+
+auth_router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+def get_user_repo(session: AsyncSession = Depends(get_session)):
+    return SQLAlchemyUserRepository(session)
+
+
+@auth_router.post("/token", response_model=TokenResponse)
+async def issue_token(payload: TokenRequest, repo=Depends(get_user_repo)):
+    return await IssueTokenUseCase(repo).execute(payload)
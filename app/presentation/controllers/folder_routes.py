@@ -0,0 +1,129 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.use_cases.folders.folder_usecase import (
+    CreateFolder, ListFolders, GetFolder, RenameFolder, MoveFolder, DeleteFolder
+)
+from app.core.db import get_session
+from app.presentation.dependencies.project_access import require_viewer, require_tester
+from app.presentation.schemas.folder_schema import FolderCreate, FolderRename, FolderMove, FolderOut
+
+folder_router = APIRouter(prefix="/projects/{project_id}/folders", tags=["Folders"])
+
+
+# The repository flushes, so the sibling-name index can fire inside the use case as well as at commit
+async def _conflict(session: AsyncSession) -> HTTPException:
+    await session.rollback()
+    return HTTPException(status_code=409, detail="A sibling folder with this name already exists")
+
+
+async def _commit_or_409(session: AsyncSession) -> None:
+    try:
+        await session.commit()
+    except IntegrityError:
+        raise await _conflict(session)
+
+
+@folder_router.post("", response_model=FolderOut, status_code=201)
+async def create_folder(
+        project_id: int,
+        payload: FolderCreate,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    usecase = CreateFolder(session)
+    try:
+        obj = await usecase(project_id, payload.name, payload.parentId)
+    except IntegrityError:
+        raise await _conflict(session)
+    if not obj:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Parent folder not found")
+    await _commit_or_409(session)
+    return obj
+
+
+@folder_router.get("", response_model=List[FolderOut])
+async def list_folders(
+        project_id: int,
+        root_id: Optional[int] = None,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_viewer),
+):
+    # Flat list, parents first; build the tree from parent_id client-side
+    usecase = ListFolders(session)
+    return await usecase(project_id, root_id)
+
+
+@folder_router.get("/{folder_id}", response_model=FolderOut)
+async def get_folder(
+        project_id: int,
+        folder_id: int,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_viewer),
+):
+    usecase = GetFolder(session)
+    obj = await usecase(project_id, folder_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Not found")
+    return obj
+
+
+@folder_router.put("/{folder_id}", response_model=FolderOut)
+async def rename_folder(
+        project_id: int,
+        folder_id: int,
+        payload: FolderRename,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    usecase = RenameFolder(session)
+    try:
+        obj = await usecase(project_id, folder_id, payload.name)
+    except IntegrityError:
+        raise await _conflict(session)
+    if not obj:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Not found")
+    await _commit_or_409(session)
+    return obj
+
+
+@folder_router.post("/{folder_id}/move", response_model=FolderOut)
+async def move_folder(
+        project_id: int,
+        folder_id: int,
+        payload: FolderMove,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    # Moves the whole subtree; closure rows are rewritten set-based
+    usecase = MoveFolder(session)
+    try:
+        obj = await usecase(project_id, folder_id, payload.parentId)
+    except IntegrityError:
+        raise await _conflict(session)
+    if not obj:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Not found")
+    await _commit_or_409(session)
+    return obj
+
+
+@folder_router.delete("/{folder_id}", status_code=200)
+async def delete_folder(
+        project_id: int,
+        folder_id: int,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    usecase = DeleteFolder(session)
+    ok = await usecase(project_id, folder_id)
+    if not ok:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Not found")
+    await session.commit()
+    return {"message": "Folder deleted successfully"}
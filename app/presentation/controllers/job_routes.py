@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_session
+from app.infrastructure.repositories.job_repository_sqlalchemy import JobRepository
+from app.presentation.dependencies.current_user import CurrentUser, get_current_user
+from app.presentation.dependencies.project_access import check_project_role
+from app.presentation.schemas.job_schema import JobOut
+
+job_router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def get_job_repo(session: AsyncSession = Depends(get_session)):
+    return JobRepository(session)
+
+
+@job_router.get("/{job_id}", response_model=JobOut)
+async def get_job(job_id: int, repo: JobRepository = Depends(get_job_repo),
+                  user: CurrentUser = Depends(get_current_user)):
+    job = await repo.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Readable by the project's viewers; jobs with no project are admin-only
+    await check_project_role(user, job.payload.get("project_id"), "viewer")
+    return job
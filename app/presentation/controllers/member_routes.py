@@ -0,0 +1,52 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.authz import invalidate_memberships
+from app.core.db import get_session
+from app.infrastructure.repositories.project_member_repository_sqlalchemy import ProjectMemberRepository
+from app.presentation.dependencies.project_access import require_manager, require_viewer
+from app.presentation.schemas.member_schema import MemberOut, MemberSet
+
+member_router = APIRouter(prefix="/projects/{project_id}/members", tags=["Project Members"])
+
+
+@member_router.get("", response_model=List[MemberOut])
+async def list_members(
+        project_id: int,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_viewer),
+):
+    return await ProjectMemberRepository(session).list(project_id)
+
+
+@member_router.put("/{user_id}", response_model=MemberOut)
+async def set_member(
+        project_id: int,
+        user_id: int,
+        payload: MemberSet,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_manager),
+):
+    member = await ProjectMemberRepository(session).upsert(project_id, user_id, payload.role)
+    if not member:
+        raise HTTPException(status_code=404, detail="User not found")
+    await session.commit()
+    # Other workers hear it through NOTIFY; don't wait for our own echo
+    invalidate_memberships(user_id)
+    return member
+
+
+@member_router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_member(
+        project_id: int,
+        user_id: int,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_manager),
+):
+    if not await ProjectMemberRepository(session).remove(project_id, user_id):
+        raise HTTPException(status_code=404, detail="Membership not found")
+    await session.commit()
+    invalidate_memberships(user_id)
+    return None
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, Query, status
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.use_cases.portfolio.create_portfolio import CreatePortfolioUseCase
@@ -7,57 +10,123 @@ from app.application.use_cases.portfolio.get_portfolio import GetPortfolioUseCas
 from app.application.use_cases.portfolio.list_portfolios import ListPortfoliosUseCase
 from app.application.use_cases.portfolio.update_portfolio import UpdatePortfolioUseCase
 from app.core.db import get_session
+from app.core.response_cache import portfolio_tag, portfolios_tag, response_cache
+from app.infrastructure.repositories._pagination import InvalidCursor
 from app.infrastructure.repositories.portfolio_repository_sqlalchemy import PortfolioRepository
+from app.presentation.dependencies.conditional import (
+    check_if_match, has_if_match, make_etag, not_modified, precondition_required, set_etag
+)
 from app.presentation.schemas.portfolio_schema import PortfolioCreate, PortfolioUpdate, PortfolioOut, \
-    PortfolioDeleteResponse, PortfolioPagedResult
+    PortfolioDeleteResponse, PortfolioPagedResult, PortfolioCursorPage
 
 portfolio_router = APIRouter(prefix="/portfolios", tags=["Portfolios"])
 
 
-def get_usecases(session: AsyncSession = Depends(get_session)):
-    repo = PortfolioRepository(session)
-    return (
-        CreatePortfolioUseCase(repo),
-        ListPortfoliosUseCase(repo),
-        GetPortfolioUseCase(repo),
-        UpdatePortfolioUseCase(repo),
-        DeletePortfolioUseCase(repo),
-        session,
-    )
+# Built per route on demand; FastAPI shares one repository (and one lazy session) per request
+def get_repo(session: AsyncSession = Depends(get_session)) -> PortfolioRepository:
+    return PortfolioRepository(session)
+
+
+def get_create_uc(repo: PortfolioRepository = Depends(get_repo)) -> CreatePortfolioUseCase:
+    return CreatePortfolioUseCase(repo)
+
+
+def get_get_uc(repo: PortfolioRepository = Depends(get_repo)) -> GetPortfolioUseCase:
+    return GetPortfolioUseCase(repo)
+
+
+def get_update_uc(repo: PortfolioRepository = Depends(get_repo)) -> UpdatePortfolioUseCase:
+    return UpdatePortfolioUseCase(repo)
+
+
+def get_delete_uc(repo: PortfolioRepository = Depends(get_repo)) -> DeletePortfolioUseCase:
+    return DeletePortfolioUseCase(repo)
+
+
+async def _if_match_version(request: Request, get_uc: GetPortfolioUseCase, portfolio_id: int) -> Optional[UUID]:
+    # Locks the row until commit, so the version checked here is the one the UPDATE sees
+    if not has_if_match(request):
+        return None
+    current = await get_uc.version(portfolio_id, lock=True)
+    if current is None:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    check_if_match(request, make_etag(current))
+    return current
 
 
 @portfolio_router.post("", response_model=PortfolioOut, status_code=status.HTTP_201_CREATED)
-async def create_portfolio(payload: PortfolioCreate, deps=Depends(get_usecases)):
-    create_uc, *_, session = deps
+async def create_portfolio(payload: PortfolioCreate, create_uc: CreatePortfolioUseCase = Depends(get_create_uc),
+                           session: AsyncSession = Depends(get_session)):
     result = await create_uc.execute(payload)
     await session.commit()
     return result
 
 
-@portfolio_router.get("", response_model=PortfolioPagedResult)
+@portfolio_router.get("", response_model=PortfolioPagedResult | PortfolioCursorPage)
 async def list_portfolios(skip: int = 0, limit: int = Query(50, le=200), q: str | None = None,
-                          deps=Depends(get_usecases)):
-    _, list_uc, *_ = deps
-    return await list_uc.execute(skip=skip, limit=limit, q=q)
+                          cursor: str | None = None,
+                          paging: str = Query("offset", pattern="^(offset|cursor)$"),
+                          total: str = Query("exact", pattern="^(exact|estimate|none)$"),
+                          fuzzy: bool = Query(False, description="Typo-tolerant, similarity-ranked name match")):
+    # OFFSET paging is kept for older clients; passing a cursor implies keyset paging
+    keyset = bool(cursor or paging == "cursor")
+    params = {"keyset": keyset, "limit": limit, "q": q, "fuzzy": fuzzy}
+    params.update({"cursor": cursor} if keyset else {"skip": skip, "total": total})
+
+    async def load(session: AsyncSession):
+        list_uc = ListPortfoliosUseCase(PortfolioRepository(session))
+        if keyset:
+            return PortfolioCursorPage.model_validate(
+                await list_uc.execute_keyset(limit=limit, q=q, cursor=cursor, fuzzy=fuzzy))
+        return PortfolioPagedResult.model_validate(
+            await list_uc.execute(skip=skip, limit=limit, q=q, total_mode=total, fuzzy=fuzzy))
+
+    # Dashboards fetch this in bursts: identical misses share one query
+    try:
+        return await response_cache.get_or_load("portfolios.list", params, [portfolios_tag()], load, coalesce=True)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @portfolio_router.get("/{portfolio_id}", response_model=PortfolioOut)
-async def get_portfolio(portfolio_id: int, deps=Depends(get_usecases)):
-    *_, get_uc, _, _, _ = deps
-    return await get_uc.execute(portfolio_id)
+async def get_portfolio(portfolio_id: int, request: Request, response: Response):
+    async def load(session: AsyncSession):
+        # Raises 404, so a missing portfolio is never cached
+        result = await GetPortfolioUseCase(PortfolioRepository(session)).execute(portfolio_id)
+        return {"etag": make_etag(result.concurrency_guid), "body": result}
+
+    # The ETag is cached with the body: a warm hit or 304 never reaches the pool
+    cached = await response_cache.get_or_load("portfolios.get", {"portfolio_id": portfolio_id},
+                                              [portfolio_tag(portfolio_id)], load)
+    hit = not_modified(request, cached["etag"])
+    if hit is not None:
+        return hit
+    set_etag(response, cached["etag"])
+    return cached["body"]
 
 
 @portfolio_router.patch("/{portfolio_id}", response_model=PortfolioOut)
-async def update_portfolio(portfolio_id: int, payload: PortfolioUpdate, deps=Depends(get_usecases)):
-    *_, update_uc, _, session = deps
-    result = await update_uc.execute(portfolio_id, payload)
+async def update_portfolio(portfolio_id: int, payload: PortfolioUpdate, request: Request, response: Response,
+                           get_uc: GetPortfolioUseCase = Depends(get_get_uc),
+                           update_uc: UpdatePortfolioUseCase = Depends(get_update_uc),
+                           session: AsyncSession = Depends(get_session)):
+    current = await _if_match_version(request, get_uc, portfolio_id)
+    if current is None and payload.concurrency_guid is None:
+        raise precondition_required()
+    result = await update_uc.execute(portfolio_id, payload, concurrency_guid=current)
     await session.commit()
+    set_etag(response, make_etag(result.concurrency_guid))
     return result
 
 
 @portfolio_router.delete("/{portfolio_id}", response_model=PortfolioDeleteResponse)
-async def delete_portfolio(portfolio_id: int, concurrency_guid: str, deps=Depends(get_usecases)):
-    *_, delete_uc, session = deps
-    result = await delete_uc.execute(portfolio_id, concurrency_guid)
+async def delete_portfolio(portfolio_id: int, request: Request, concurrency_guid: str | None = None,
+                           get_uc: GetPortfolioUseCase = Depends(get_get_uc),
+                           delete_uc: DeletePortfolioUseCase = Depends(get_delete_uc),
+                           session: AsyncSession = Depends(get_session)):
+    current = await _if_match_version(request, get_uc, portfolio_id)
+    if current is None and concurrency_guid is None:
+        raise precondition_required()
+    result = await delete_uc.execute(portfolio_id, current or concurrency_guid)
     await session.commit()
     return result
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, Query, status
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.presentation.schemas.program_schema import ProgramCreate, ProgramUpdate, ProgramOut
+from app.presentation.schemas.program_schema import ProgramCreate, ProgramUpdate, ProgramOut, ProgramCursorPage
 from app.core.db import get_session
+from app.core.response_cache import program_tag, programs_tag, response_cache
+from app.infrastructure.repositories._pagination import InvalidCursor
 from app.infrastructure.repositories.program_repository_sqlalchemy import ProgramRepository
+from app.presentation.dependencies.conditional import (
+    check_if_match, has_if_match, make_etag, not_modified, precondition_required, set_etag
+)
 from app.application.services.program_rules import ProgramRulesService
 from app.application.use_cases.program.create_program import CreateProgramUseCase
 from app.application.use_cases.program.list_programs_by_portfolio import ListProgramsByPortfolioUseCase
@@ -12,47 +20,102 @@ from app.application.use_cases.program.delete_program import DeleteProgramUseCas
 
 program_router = APIRouter(tags=["Programs"])
 
-def get_usecases(session: AsyncSession = Depends(get_session)):
-    repo = ProgramRepository(session)
-    rules = ProgramRulesService(session)
-    return (
-        CreateProgramUseCase(repo, rules),
-        ListProgramsByPortfolioUseCase(repo),
-        GetProgramUseCase(repo),
-        UpdateProgramUseCase(repo, rules),
-        DeleteProgramUseCase(repo),
-        session,
-    )
+# Built per route on demand; FastAPI shares one repository (and one lazy session) per request
+def get_repo(session: AsyncSession = Depends(get_session)) -> ProgramRepository:
+    return ProgramRepository(session)
+
+def get_rules(session: AsyncSession = Depends(get_session)) -> ProgramRulesService:
+    return ProgramRulesService(session)
+
+def get_create_uc(repo: ProgramRepository = Depends(get_repo),
+                  rules: ProgramRulesService = Depends(get_rules)) -> CreateProgramUseCase:
+    return CreateProgramUseCase(repo, rules)
+
+def get_get_uc(repo: ProgramRepository = Depends(get_repo)) -> GetProgramUseCase:
+    return GetProgramUseCase(repo)
+
+def get_update_uc(repo: ProgramRepository = Depends(get_repo),
+                  rules: ProgramRulesService = Depends(get_rules)) -> UpdateProgramUseCase:
+    return UpdateProgramUseCase(repo, rules)
+
+def get_delete_uc(repo: ProgramRepository = Depends(get_repo)) -> DeleteProgramUseCase:
+    return DeleteProgramUseCase(repo)
+
+async def _if_match_version(request: Request, get_uc: GetProgramUseCase, program_id: int) -> Optional[UUID]:
+    # Locks the row until commit, so the version checked here is the one the UPDATE sees
+    if not has_if_match(request):
+        return None
+    current = await get_uc.version(program_id, lock=True)
+    if current is None:
+        raise HTTPException(status_code=404, detail="Program not found")
+    check_if_match(request, make_etag(current))
+    return current
 
 @program_router.post("/portfolios/{portfolio_id}/programs", response_model=ProgramOut, status_code=status.HTTP_201_CREATED)
-async def create_program_for_portfolio(portfolio_id: int, payload: ProgramCreate, deps = Depends(get_usecases)):
-    create_uc, *_ , session = deps
+async def create_program_for_portfolio(portfolio_id: int, payload: ProgramCreate,
+                                       create_uc: CreateProgramUseCase = Depends(get_create_uc),
+                                       session: AsyncSession = Depends(get_session)):
     data = payload.model_dump(exclude_unset=True)
     data["portfolio_id"] = portfolio_id  # enforce from path
     result = await create_uc.execute(ProgramCreate(**data))
     await session.commit()
     return result
 
-@program_router.get("/portfolios/{portfolio_id}/programs", response_model=list[ProgramOut])
-async def list_programs(portfolio_id: int, skip: int = 0, limit: int = Query(50, le=200), q: str | None = None, deps = Depends(get_usecases)):
-    _, list_uc, *_ = deps
-    return await list_uc.execute(portfolio_id, skip=skip, limit=limit, q=q)
+@program_router.get("/portfolios/{portfolio_id}/programs", response_model=list[ProgramOut] | ProgramCursorPage)
+async def list_programs(portfolio_id: int, skip: int = 0, limit: int = Query(50, le=200), q: str | None = None,
+                        cursor: str | None = None, paging: str = Query("offset", pattern="^(offset|cursor)$"),
+                        fuzzy: bool = Query(False, description="Typo-tolerant, similarity-ranked name match")):
+    keyset = bool(cursor or paging == "cursor")
+    params = {"portfolio_id": portfolio_id, "keyset": keyset, "limit": limit, "q": q, "fuzzy": fuzzy}
+    params.update({"cursor": cursor} if keyset else {"skip": skip})
+
+    async def load(session: AsyncSession):
+        list_uc = ListProgramsByPortfolioUseCase(ProgramRepository(session))
+        if keyset:
+            return await list_uc.execute_keyset(portfolio_id, limit=limit, q=q, cursor=cursor, fuzzy=fuzzy)
+        return await list_uc.execute(portfolio_id, skip=skip, limit=limit, q=q, fuzzy=fuzzy)
+
+    try:
+        return await response_cache.get_or_load("programs.list", params, [programs_tag(portfolio_id)], load)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @program_router.get("/programs/{program_id}", response_model=ProgramOut)
-async def get_program(program_id: int, deps = Depends(get_usecases)):
-    *_ , get_uc, _, _, _ = deps
-    return await get_uc.execute(program_id)
+async def get_program(program_id: int, request: Request, response: Response):
+    async def load(session: AsyncSession):
+        # Raises 404, so a missing program is never cached
+        result = await GetProgramUseCase(ProgramRepository(session)).execute(program_id)
+        return {"etag": make_etag(result.concurrency_guid), "body": result}
+
+    cached = await response_cache.get_or_load("programs.get", {"program_id": program_id},
+                                              [program_tag(program_id)], load)
+    hit = not_modified(request, cached["etag"])
+    if hit is not None:
+        return hit
+    set_etag(response, cached["etag"])
+    return cached["body"]
 
 @program_router.patch("/programs/{program_id}", response_model=ProgramOut)
-async def update_program(program_id: int, payload: ProgramUpdate, deps = Depends(get_usecases)):
-    *_ , update_uc, _, session = deps
-    result = await update_uc.execute(program_id, payload)
+async def update_program(program_id: int, payload: ProgramUpdate, request: Request, response: Response,
+                         get_uc: GetProgramUseCase = Depends(get_get_uc),
+                         update_uc: UpdateProgramUseCase = Depends(get_update_uc),
+                         session: AsyncSession = Depends(get_session)):
+    current = await _if_match_version(request, get_uc, program_id)
+    if current is None and payload.concurrency_guid is None:
+        raise precondition_required()
+    result = await update_uc.execute(program_id, payload, concurrency_guid=current)
     await session.commit()
+    set_etag(response, make_etag(result.concurrency_guid))
     return result
 
 @program_router.delete("/programs/{program_id}", response_model=ProgramOut)
-async def delete_program(program_id: int, concurrency_guid: str, deps = Depends(get_usecases)):
-    *_, delete_uc, session = deps
-    result = await delete_uc.execute(program_id, concurrency_guid)
+async def delete_program(program_id: int, request: Request, concurrency_guid: str | None = None,
+                         get_uc: GetProgramUseCase = Depends(get_get_uc),
+                         delete_uc: DeleteProgramUseCase = Depends(get_delete_uc),
+                         session: AsyncSession = Depends(get_session)):
+    current = await _if_match_version(request, get_uc, program_id)
+    if current is None and concurrency_guid is None:
+        raise precondition_required()
+    result = await delete_uc.execute(program_id, current or concurrency_guid)
     await session.commit()
     return result
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-import asyncio
 from app.core.db import get_session
+from app.core.response_cache import project_tag, response_cache
+from app.core.settings import settings
+from app.infrastructure.jobs.handlers import REFRESH_PROJECT_PROGRESS, refresh_progress_key
+from app.infrastructure.repositories._pagination import InvalidCursor
+from app.infrastructure.repositories.job_repository_sqlalchemy import JobRepository
 from app.infrastructure.repositories.project_repository_sqlalchemy import SQLAlchemyProjectRepository
-from app.presentation.schemas.project_schema import (ProjectCreate, ProjectUpdate, ProjectOut, ProjectSummary)
+from app.infrastructure.repositories.project_progress_repository_sqlalchemy import ProjectProgressRepository
+from app.presentation.schemas.project_schema import (ProjectCreate, ProjectUpdate, ProjectOut, ProjectSummary,
+                                                     ProjectCursorPage)
+from app.presentation.schemas.job_schema import JobAccepted
+from app.presentation.dependencies.conditional import check_if_match, has_if_match, make_etag, not_modified, set_etag
+from app.presentation.dependencies.current_user import CurrentUser, get_current_user
+from app.presentation.dependencies.project_access import (check_project_role, require_manager, require_viewer,
+                                                           visible_project_ids)
 from app.application.use_cases.projects.create_project import CreateProjectUseCase
 from app.application.use_cases.projects.update_project import UpdateProjectUseCase
 from app.application.use_cases.projects.delete_project import DeleteProjectUseCase
@@ -16,25 +27,87 @@ projects_router = APIRouter(prefix="/projects", tags=["projects"])
 def get_project_repo(session: AsyncSession = Depends(get_session)):
     return SQLAlchemyProjectRepository(session)
 
-@projects_router.get("", response_model=list[ProjectSummary])
+def get_progress_repo(session: AsyncSession = Depends(get_session)):
+    return ProjectProgressRepository(session)
+
+async def _enqueue_refresh(request: Request, session: AsyncSession, project_id: int,
+                           release_id: int | None, force: bool) -> JobAccepted:
+    # Repeated requests for the same scope coalesce into the job still waiting to run
+    job_id, created = await JobRepository(session).enqueue(
+        REFRESH_PROJECT_PROGRESS,
+        {"project_id": project_id, "release_id": release_id, "force": force},
+        dedupe_key=refresh_progress_key(project_id, release_id, force),
+        max_attempts=settings.job_max_attempts,
+    )
+    await session.commit()
+    pool = getattr(request.app.state, "job_pool", None)
+    if pool is not None:
+        pool.wake()
+    return JobAccepted(job_id=job_id, status="queued", created=created)
+
+async def _refresh_now(response: Response, session: AsyncSession, project_id: int,
+                       release_id: int | None, force: bool) -> dict:
+    out = await RefreshProjectCachesUseCase(ProjectProgressRepository(session)).execute(
+        project_id, release_id, force=force
+    )
+    await session.commit()
+    # Finished inline: 200, not the 202 of a queued refresh
+    response.status_code = status.HTTP_200_OK
+    return out
+
+async def _check_if_match(request: Request, repo, project_id: int) -> None:
+    # Optional for projects; the locked row can't change between this check and the write
+    if not has_if_match(request):
+        return
+    current = await GetProjectUseCase(repo).version(project_id, lock=True)
+    if current is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    check_if_match(request, make_etag(*current))
+
+@projects_router.get("", response_model=list[ProjectSummary] | ProjectCursorPage)
 async def list_projects(
         limit: int = Query(50, ge=1, le=200),
         offset: int = Query(0, ge=0),
-        repo = Depends(get_project_repo)
+        cursor: str | None = None,
+        paging: str = Query("offset", pattern="^(offset|cursor)$"),
+        repo = Depends(get_project_repo),
+        progress = Depends(get_progress_repo),
+        user: CurrentUser = Depends(get_current_user),
 ):
-    uc = ListProjectsUseCase(repo)
-    return await uc.execute(limit=limit, offset=offset)
+    uc = ListProjectsUseCase(repo, progress)
+    # Only projects the caller has a role on; admins see all
+    project_ids = await visible_project_ids(user)
+    if cursor or paging == "cursor":
+        try:
+            return await uc.execute_keyset(limit=limit, cursor=cursor, project_ids=project_ids)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await uc.execute(limit=limit, offset=offset, project_ids=project_ids)
 
 @projects_router.get("/{project_id}", response_model=ProjectOut)
-async def get_project(project_id: int, repo = Depends(get_project_repo)):
-    uc = GetProjectUseCase(repo)
-    out = await uc.execute_full(project_id)
-    if not out:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return out
+async def get_project(project_id: int, request: Request, response: Response, user=Depends(require_viewer)):
+    async def load(session: AsyncSession):
+        uc = GetProjectUseCase(SQLAlchemyProjectRepository(session), ProjectProgressRepository(session))
+        current = await uc.version(project_id)
+        out = await uc.execute_full(project_id) if current else None
+        if not out:
+            # Raised, so a missing project is never cached
+            raise HTTPException(status_code=404, detail="Project not found")
+        return {"etag": make_etag(*current), "body": out}
+
+    # The ETag is cached with the body, so a warm 304 needs no database round trip at all
+    cached = await response_cache.get_or_load("projects.get", {"project_id": project_id},
+                                              [project_tag(project_id)], load)
+    hit = not_modified(request, cached["etag"])
+    if hit is not None:
+        return hit
+    set_etag(response, cached["etag"])
+    return cached["body"]
 
 @projects_router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_project(project_id: int, repo = Depends(get_project_repo)):
+async def delete_project(project_id: int, request: Request, repo = Depends(get_project_repo),
+                         user=Depends(require_manager)):
+    await _check_if_match(request, repo, project_id)
     uc = DeleteProjectUseCase(repo)
     ok = await uc.execute(project_id)
     if not ok:
@@ -42,7 +115,9 @@ async def delete_project(project_id: int, repo = Depends(get_project_repo)):
     return None  # 204 No Content
 
 @projects_router.put("/{project_id}", response_model=ProjectOut)
-async def update_project(project_id: int, payload: ProjectUpdate, repo = Depends(get_project_repo)):
+async def update_project(project_id: int, payload: ProjectUpdate, request: Request,
+                         repo = Depends(get_project_repo), user=Depends(require_manager)):
+    await _check_if_match(request, repo, project_id)
     uc = UpdateProjectUseCase(repo)
     out = await uc.execute(project_id, payload)
     if not out:
@@ -53,33 +128,46 @@ async def update_project(project_id: int, payload: ProjectUpdate, repo = Depends
 async def create_project(
         payload: ProjectCreate,
         existing_project_id: int | None = Query(default=None),
-        repo = Depends(get_project_repo)
+        repo = Depends(get_project_repo),
+        user: CurrentUser = Depends(get_current_user),
 ):
+    if existing_project_id is not None:
+        # Copying defaults from a project reads it
+        await check_project_role(user, existing_project_id, "viewer")
     uc = CreateProjectUseCase(repo)
-    out = await uc.execute(payload, existing_project_id=existing_project_id)
+    # The creator manages the new project, so a non-admin can reach what they just made
+    out = await uc.execute(payload, existing_project_id=existing_project_id, manager_id=user.id)
     return out
 
 @projects_router.post("/{project_id}/refresh-caches", status_code=status.HTTP_202_ACCEPTED)
 async def refresh_caches_all(
         project_id: int,
+        request: Request,
+        response: Response,
         run_async: bool = Query(default=True),
+        force: bool = Query(default=False, description="Rebuild every rollup, not just the changed ones"),
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_manager),
 ):
-    uc = RefreshProjectCachesUseCase()
     if run_async:
-        asyncio.create_task(uc.execute(project_id, None, True))
-        return {"project_id": project_id, "status": "queued"}
+        job = await _enqueue_refresh(request, session, project_id, None, force)
+        return {"project_id": project_id, **job.model_dump()}
     else:
-        return await uc.execute(project_id, None, False)
+        return await _refresh_now(response, session, project_id, None, force)
 
 @projects_router.post("/{project_id}/refresh-caches/{release_id}", status_code=status.HTTP_202_ACCEPTED)
 async def refresh_caches_release(
         project_id: int,
         release_id: int,
+        request: Request,
+        response: Response,
         run_async: bool = Query(default=True),
+        force: bool = Query(default=False, description="Rebuild every rollup, not just the changed ones"),
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_manager),
 ):
-    uc = RefreshProjectCachesUseCase()
     if run_async:
-        asyncio.create_task(uc.execute(project_id, release_id, True))
-        return {"project_id": project_id, "release_id": release_id, "status": "queued"}
+        job = await _enqueue_refresh(request, session, project_id, release_id, force)
+        return {"project_id": project_id, "release_id": release_id, **job.model_dump()}
     else:
-        return await uc.execute(project_id, release_id, False)
+        return await _refresh_now(response, session, project_id, release_id, force)
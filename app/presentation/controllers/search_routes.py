@@ -0,0 +1,32 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.use_cases.search.global_search import GlobalSearchUseCase
+from app.core.db import get_session
+from app.infrastructure.repositories.search_index_repository_sqlalchemy import SearchIndexRepository
+from app.presentation.dependencies.current_user import CurrentUser, get_current_user
+from app.presentation.dependencies.project_access import visible_project_ids
+from app.presentation.schemas.search_schema import SearchResult
+
+search_router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def get_search_usecase(session: AsyncSession = Depends(get_session)):
+    return GlobalSearchUseCase(SearchIndexRepository(session))
+
+
+@search_router.get("", response_model=SearchResult)
+async def global_search(
+        q: str = Query(..., min_length=1, max_length=200, description="Web-search syntax: words, \"phrases\", -not, or"),
+        types: Optional[list[str]] = Query(default=None, description="portfolio, program, project, test_case"),
+        project_id: Optional[int] = None,
+        portfolio_id: Optional[int] = None,
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+        uc=Depends(get_search_usecase),
+        user: CurrentUser = Depends(get_current_user),
+):
+    return await uc.execute(q, types=types, project_id=project_id, portfolio_id=portfolio_id,
+                            project_ids=await visible_project_ids(user), limit=limit, offset=offset)
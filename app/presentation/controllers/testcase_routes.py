@@ -1,66 +1,238 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.use_cases.testcases.testcase_usecase import (
-    CreateTestCase, UpdateTestCaseWithSteps, GetTestCaseById,
-    SoftDeleteTestCase, MoveTestCase, CountTestCases, SearchTestCases
+    CreateTestCase, UpdateTestCaseWithSteps, GetTestCaseById, GetTestCaseVersion,
+    SoftDeleteTestCase, MoveTestCase, CountTestCases, FacetTestCases, SearchTestCases, SearchTestCasesByCursor,
+    InsertTestStep, MoveTestStep, DeleteTestStep, BulkMoveTestCases, BulkSoftDeleteTestCases, BulkRestoreTestCases,
+    BulkUpdateTestCases
 )
-from app.core.db import get_session
-from app.presentation.dependencies.current_user import CurrentUser as get_current_user  # your auth
+from app.application.use_cases.testcases.export_test_cases import ExportTestCases, MEDIA_TYPES
+from app.application.use_cases.testcases.import_test_cases import (
+    ImportTestCases, iter_csv_records, iter_ndjson_records
+)
+from app.core.db import AsyncSessionLocal, get_session
+from app.core.singleflight import coalesce
+from app.infrastructure.repositories._pagination import InvalidCursor
+from app.presentation.dependencies.conditional import check_if_match, has_if_match, make_etag, not_modified, set_etag
+from app.presentation.dependencies.project_access import require_viewer, require_tester, require_manager
 from app.presentation.schemas.testcase_schema import (
-    TestCaseCreate, TestCaseUpdate, TestCaseOut, PagedResult
+    TestCaseCreate, TestCaseUpdate, TestCaseOut, PagedResult, CursorPagedResult, FacetCounts, ImportReport,
+    TestStepInsert, TestStepMove, TestStepOut, TestCaseSelection, TestCaseBulkMove, BulkResult, BulkRestoreResult,
+    TestCaseBulkUpdate, BulkUpdateResult
 )
 
 test_router = APIRouter(prefix="/projects/{project_id}/test-cases", tags=["Test Cases"])
 
 
+async def _check_if_match(request: Request, session: AsyncSession, project_id: int, test_case_id: int) -> None:
+    # Optional for test cases; the locked row can't change between this check and the write
+    if not has_if_match(request):
+        return
+    current = await GetTestCaseVersion(session)(project_id, test_case_id, lock=True)
+    if current is None:
+        raise HTTPException(status_code=404, detail="Test case not found")
+    check_if_match(request, make_etag(current))
+
+
 @test_router.post("", response_model=TestCaseOut, status_code=201)
 async def create_test_case(
         project_id: int,
         payload: TestCaseCreate,
         session: AsyncSession = Depends(get_session),
-        user=Depends(get_current_user),
+        user=Depends(require_tester),
 ):
     usecase = CreateTestCase(session)
     try:
         obj = await usecase(project_id, payload.model_dump())
         await session.commit()
         return obj
+    except HTTPException:
+        await session.rollback()
+        raise
     except Exception as e:
         await session.rollback()
         # Handle unique violation gracefully
         raise HTTPException(status_code=409, detail=str(e))
 
 
+@test_router.post("/import", response_model=ImportReport)
+async def import_test_cases(
+        project_id: int,
+        request: Request,
+        format: Optional[str] = Query(None, pattern="^(ndjson|csv)$",
+                                      description="Defaults from Content-Type (text/csv => csv, else ndjson)"),
+        dry_run: bool = False,
+        batch_size: int = Query(500, ge=1, le=1000),
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    # Body is read incrementally; each batch commits on its own (see ImportTestCases)
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    parse = iter_csv_records if format == "csv" else iter_ndjson_records
+    usecase = ImportTestCases(session)
+    return await usecase(project_id, parse(request.stream()), dry_run=dry_run, batch_size=batch_size)
+
+
+@test_router.post("/export")
+async def export_test_cases(
+        project_id: int,
+        release_id: Optional[int] = None,
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        batch_size: int = Query(1000, ge=100, le=5000),
+        filters: dict = {},
+        user=Depends(require_viewer),
+):
+    # Same filters as /search; rows stream in id order straight from a server-side cursor
+    async def body():
+        # The response outlives the request-scoped session, so the stream owns its own
+        async with AsyncSessionLocal() as session:
+            async for chunk in ExportTestCases(session)(project_id, release_id, filters or {}, format, batch_size):
+                yield chunk
+
+    filename = f"project-{project_id}-test-cases.{format}"
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[format],
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+# Bulk routes are registered before /{test_case_id}/... so "bulk" is never parsed as an id
+
+@test_router.post("/bulk/move", response_model=BulkResult)
+async def bulk_move_test_cases(
+        project_id: int,
+        payload: TestCaseBulkMove,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    usecase = BulkMoveTestCases(session)
+    ids = await usecase(project_id, payload.folderId, payload.ids, payload.filters, payload.releaseId)
+    await session.commit()
+    return {"affected": len(ids), "ids": ids}
+
+
+@test_router.post("/bulk/update", response_model=BulkUpdateResult)
+async def bulk_update_test_cases(
+        project_id: int,
+        payload: TestCaseBulkUpdate,
+        dry_run: bool = False,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    usecase = BulkUpdateTestCases(session)
+    changes = payload.set.model_dump(include=payload.set.model_fields_set)
+    matched, ids = await usecase(project_id, changes, payload.ids, payload.filters, payload.releaseId, dry_run)
+    if dry_run:
+        await session.rollback()
+    else:
+        await session.commit()
+    return {"dry_run": dry_run, "matched": matched, "affected": len(ids), "ids": ids}
+
+
+@test_router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_test_cases(
+        project_id: int,
+        payload: TestCaseSelection,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_manager),
+):
+    usecase = BulkSoftDeleteTestCases(session)
+    ids = await usecase(project_id, payload.ids, payload.filters, payload.releaseId)
+    await session.commit()
+    return {"affected": len(ids), "ids": ids}
+
+
+@test_router.post("/bulk/restore", response_model=BulkRestoreResult)
+async def bulk_restore_test_cases(
+        project_id: int,
+        payload: TestCaseSelection,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_manager),
+):
+    usecase = BulkRestoreTestCases(session)
+    try:
+        ids, conflicts = await usecase(project_id, payload.ids, payload.filters, payload.releaseId)
+        await session.commit()
+    except IntegrityError as e:
+        # An active case with the same name was created concurrently
+        await session.rollback()
+        raise HTTPException(status_code=409, detail=str(e.orig))
+    return {"affected": len(ids), "ids": ids, "conflicts": conflicts}
+
+
 @test_router.put("", response_model=TestCaseOut)
 async def update_test_case(
         project_id: int,
         payload: TestCaseUpdate,
+        request: Request,
+        response: Response,
         session: AsyncSession = Depends(get_session),
-        user=Depends(get_current_user),
+        user=Depends(require_tester),
 ):
+    await _check_if_match(request, session, project_id, payload.id)
     usecase = UpdateTestCaseWithSteps(session)
     obj = await usecase(project_id, payload.model_dump())
     if not obj:
         await session.rollback()
         raise HTTPException(status_code=404, detail="Test case not found")
     await session.commit()
+    set_etag(response, make_etag(obj.updated_at))
     return obj
 
 
+# Literal paths go before /{test_case_id} so "count" is never parsed as an id
+@test_router.get("/count")
+async def count_test_cases_get(
+        project_id: int,
+        release_id: Optional[int] = None,
+        mode: str = Query("live", pattern="^(live|counter)$"),
+        user=Depends(require_viewer),
+):
+    # Identical counts in flight on this worker share one query (and one connection)
+    total = await coalesce("testcases.count", {"project_id": project_id, "release_id": release_id, "mode": mode},
+                           lambda session: CountTestCases(session)(project_id, release_id, None, mode))
+    return {"total": total}
+
+
+@test_router.post("/count")
+async def count_test_cases_post(
+        project_id: int,
+        release_id: Optional[int] = None,
+        mode: str = Query("live", pattern="^(live|counter)$"),
+        filters: dict = {},
+        user=Depends(require_viewer),
+):
+    params = {"project_id": project_id, "release_id": release_id, "mode": mode, "filters": filters or {}}
+    total = await coalesce("testcases.count", params,
+                           lambda session: CountTestCases(session)(project_id, release_id, filters or {}, mode))
+    return {"total": total}
+
+
 @test_router.get("/{test_case_id}", response_model=TestCaseOut)
 async def get_test_case(
         project_id: int,
         test_case_id: int,
+        request: Request,
+        response: Response,
         session: AsyncSession = Depends(get_session),
-        user=Depends(get_current_user),
+        user=Depends(require_viewer),
 ):
+    # Revalidation skips loading the case and its steps
+    current = await GetTestCaseVersion(session)(project_id, test_case_id)
+    if current is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    cached = not_modified(request, make_etag(current))
+    if cached is not None:
+        return cached
     usecase = GetTestCaseById(session)
     obj = await usecase(project_id, test_case_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Not found")
+    set_etag(response, make_etag(obj.updated_at))
     return obj
 
 
@@ -68,9 +240,11 @@ async def get_test_case(
 async def delete_test_case(
         project_id: int,
         test_case_id: int,
+        request: Request,
         session: AsyncSession = Depends(get_session),
-        user=Depends(get_current_user),
+        user=Depends(require_tester),
 ):
+    await _check_if_match(request, session, project_id, test_case_id)
     usecase = SoftDeleteTestCase(session)
     ok = await usecase(project_id, test_case_id)
     if not ok:
@@ -86,7 +260,7 @@ async def move_test_case(
         test_case_id: int,
         test_case_folder_id: int = Query(..., description="Destination folder"),
         session: AsyncSession = Depends(get_session),
-        user=Depends(get_current_user),
+        user=Depends(require_tester),
 ):
     usecase = MoveTestCase(session)
     ok = await usecase(project_id, test_case_id, test_case_folder_id)
@@ -97,32 +271,73 @@ async def move_test_case(
     return {"message": "Moved"}
 
 
-@test_router.get("/count")
-async def count_test_cases_get(
+@test_router.post("/{test_case_id}/steps", response_model=TestStepOut, status_code=201)
+async def insert_test_step(
         project_id: int,
-        release_id: Optional[int] = None,
+        test_case_id: int,
+        payload: TestStepInsert,
         session: AsyncSession = Depends(get_session),
-        user=Depends(get_current_user),
+        user=Depends(require_tester),
 ):
-    usecase = CountTestCases(session)
-    total = await usecase(project_id, release_id, None)
-    return {"total": total}
+    # Writes one row; other steps keep their positions
+    usecase = InsertTestStep(session)
+    step = await usecase(project_id, test_case_id, payload.model_dump())
+    if not step:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Test case not found")
+    await session.commit()
+    return step
 
 
-@test_router.post("/count")
-async def count_test_cases_post(
+@test_router.post("/{test_case_id}/steps/{step_id}/move", response_model=TestStepOut)
+async def move_test_step(
+        project_id: int,
+        test_case_id: int,
+        step_id: int,
+        payload: TestStepMove,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    usecase = MoveTestStep(session)
+    step = await usecase(project_id, test_case_id, step_id, payload.model_dump())
+    if not step:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Test case not found")
+    await session.commit()
+    return step
+
+
+@test_router.delete("/{test_case_id}/steps/{step_id}", status_code=200)
+async def delete_test_step(
+        project_id: int,
+        test_case_id: int,
+        step_id: int,
+        session: AsyncSession = Depends(get_session),
+        user=Depends(require_tester),
+):
+    usecase = DeleteTestStep(session)
+    ok = await usecase(project_id, test_case_id, step_id)
+    if not ok:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Not found")
+    await session.commit()
+    return {"message": "Step deleted successfully"}
+
+
+@test_router.post("/facets", response_model=FacetCounts)
+async def facet_test_cases(
         project_id: int,
         release_id: Optional[int] = None,
         filters: dict = {},
         session: AsyncSession = Depends(get_session),
-        user=Depends(get_current_user),
+        user=Depends(require_viewer),
 ):
-    usecase = CountTestCases(session)
-    total = await usecase(project_id, release_id, filters or {})
-    return {"total": total}
+    # Status/type/priority/folder/release counts for the sidebar in a single query
+    usecase = FacetTestCases(session)
+    return await usecase(project_id, release_id, filters or {})
 
 
-@test_router.post("/search", response_model=PagedResult)
+@test_router.post("/search", response_model=PagedResult | CursorPagedResult)
 async def search_test_cases(
         project_id: int,
         starting_row: int = 0,
@@ -130,12 +345,26 @@ async def search_test_cases(
         sort_field: str = "updated_at",
         sort_direction: str = "desc",
         release_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        paging: str = Query("offset", pattern="^(offset|cursor)$"),
+        total: str = Query("exact", pattern="^(exact|estimate|none)$"),
         filters: dict = {},
         session: AsyncSession = Depends(get_session),
-        user=Depends(get_current_user),
+        user=Depends(require_viewer),
 ):
+    # Keyset paging: seek past the cursor instead of OFFSET (starting_row is ignored)
+    if cursor or paging == "cursor":
+        usecase = SearchTestCasesByCursor(session)
+        try:
+            page = await usecase(project_id, number_of_rows, sort_field, sort_direction, release_id, filters or {},
+                                 cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"items": page.items, "next_cursor": page.next_cursor, "prev_cursor": page.prev_cursor,
+                "page_size": number_of_rows}
+
     usecase = SearchTestCases(session)
-    total, items = await usecase(project_id, starting_row, number_of_rows, sort_field, sort_direction, release_id,
-                                 filters or {})
+    count, items, has_more = await usecase(project_id, starting_row, number_of_rows, sort_field, sort_direction,
+                                           release_id, filters or {}, total)
     page = (starting_row // number_of_rows) + 1 if number_of_rows else 1
-    return {"total": total, "items": items, "page": page, "page_size": number_of_rows}
+    return {"total": count, "items": items, "page": page, "page_size": number_of_rows, "has_more": has_more}
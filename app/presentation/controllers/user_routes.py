@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.use_cases.create_user_usecase import CreateUserUseCase
 from app.application.use_cases.delete_user_usecase import DeleteUserUseCase
+from app.application.use_cases.provision_users_usecase import ProvisionUsersUseCase, parse_user_records
 from app.core.db import get_session
+from app.infrastructure.repositories._pagination import InvalidCursor
 from app.infrastructure.repositories.user_repository_sqlalchemy import SQLAlchemyUserRepository
-from app.presentation.schemas.user_schema import UserCreate, UserSummary, UserUpdate, UserDeleteResponse
+from app.presentation.dependencies.current_user import require_admin
+from app.presentation.schemas.user_schema import UserCreate, UserSummary, UserUpdate, UserDeleteResponse, \
+    UserCursorPage, UserProvisionReport, UserIds, UserBulkFlagResult
 
 user_router = APIRouter(prefix="/users", tags=["users"])
 
@@ -24,12 +30,62 @@ async def create_user(payload: UserCreate, repo=Depends(get_user_repo)):
         raise HTTPException(status_code=409, detail=str(ex))
 
 
-@user_router.get("/", response_model=list[UserSummary])
+@user_router.post("/bulk", response_model=UserProvisionReport)
+async def provision_users(
+        request: Request,
+        format: Optional[str] = Query(None, pattern="^(json|csv)$",
+                                      description="Defaults from Content-Type (text/csv => csv, else json)"),
+        repo=Depends(get_user_repo),
+        admin=Depends(require_admin),
+):
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "json"
+    try:
+        records = await parse_user_records(format, request.stream())
+        return await ProvisionUsersUseCase(repo).execute(records)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+
+
+async def _bulk_flags(payload: UserIds, repo, **flags: bool) -> UserBulkFlagResult:
+    ids = await repo.bulk_set_flags(payload.ids, **flags)
+    return UserBulkFlagResult(affected=len(ids), ids=ids, not_found=sorted(set(payload.ids) - set(ids)))
+
+
+@user_router.post("/bulk/approve", response_model=UserBulkFlagResult)
+async def bulk_approve_users(payload: UserIds, repo=Depends(get_user_repo), admin=Depends(require_admin)):
+    return await _bulk_flags(payload, repo, approved=True)
+
+
+@user_router.post("/bulk/lock", response_model=UserBulkFlagResult)
+async def bulk_lock_users(payload: UserIds, repo=Depends(get_user_repo), admin=Depends(require_admin)):
+    return await _bulk_flags(payload, repo, locked=True)
+
+
+@user_router.post("/bulk/unlock", response_model=UserBulkFlagResult)
+async def bulk_unlock_users(payload: UserIds, repo=Depends(get_user_repo), admin=Depends(require_admin)):
+    return await _bulk_flags(payload, repo, locked=False)
+
+
+@user_router.get("/", response_model=list[UserSummary] | UserCursorPage)
 async def list_users(
         limit: int = Query(50, ge=1, le=200),
         offset: int = Query(0, ge=0),
+        cursor: str | None = None,
+        paging: str = Query("offset", pattern="^(offset|cursor)$"),
         repo=Depends(get_user_repo)
 ):
+    if cursor or paging == "cursor":
+        try:
+            page = await repo.list_keyset(limit=limit, cursor=cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return UserCursorPage(
+            items=[UserSummary.model_validate(r) for r in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            page_size=limit,
+        )
     rows = await repo.list(limit=limit, offset=offset)
     if not rows:
         raise HTTPException(status_code=404, detail="No User not found")
@@ -0,0 +1,70 @@
+"""
+Conditional requests (RFC 9110 §13). Resources expose a strong ETag built from a cheap
+version read (concurrency_guid / updated_at), so a revalidating GET is answered with 304
+before the full row and its children are loaded, and writes can be guarded with If-Match
+instead of echoing concurrency_guid in the body.
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def _token(part) -> str:
+    if isinstance(part, uuid.UUID):
+        return part.hex
+    if isinstance(part, datetime):
+        # naive values are UTC in this schema; render both kinds the same way
+        if part.tzinfo is not None:
+            part = part.astimezone(timezone.utc).replace(tzinfo=None)
+        return part.strftime("%Y%m%d%H%M%S%f")
+    return "0" if part is None else str(part)
+
+
+def make_etag(*parts) -> str:
+    return '"' + "-".join(_token(p) for p in parts) + '"'
+
+
+def _tags(header: str) -> List[str]:
+    return [t.strip() for t in header.split(",") if t.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Cacheable, but always revalidated: a conditional GET is what makes the 304 path pay off
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 for the caller's cached copy, or None to send the full representation."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    # Weak comparison: a W/ prefix added by a proxy still revalidates
+    if header.strip() == "*" or any(_opaque(t) == etag for t in _tags(header)):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
+
+def has_if_match(request: Request) -> bool:
+    return request.headers.get("if-match") is not None
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """Raise 412 unless If-Match names the current version (strong comparison) or is '*'."""
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*" or etag in _tags(header):
+        return
+    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED,
+                        detail="Resource was modified; fetch it again and retry", headers={"ETag": etag})
+
+
+def precondition_required() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+                         detail="Send If-Match with the resource's ETag (or concurrency_guid)")
@@ -1,9 +1,50 @@
-from app.domain.users import User
+from dataclasses import dataclass
 
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.core.security import InvalidToken, TokenClaims, decode_access_token
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+@dataclass(frozen=True, slots=True)
 class CurrentUser:
-    def __init__(self, current_user: User):
-        self.current_user = "Felix"
+    """The authenticated caller, straight from the verified token claims (no DB lookup)."""
+    id: int
+    username: str
+    admin: bool
+    approved: bool
+    locked: bool
+
+    @classmethod
+    def from_claims(cls, claims: TokenClaims) -> "CurrentUser":
+        return cls(id=claims.user_id, username=claims.username, admin=claims.admin,
+                   approved=claims.approved, locked=claims.locked)
 
     def as_dict(self):
-        return self.current_user
+        return {"id": self.id, "username": self.username, "admin": self.admin}
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail,
+                         headers={"WWW-Authenticate": "Bearer"})
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials | None = Depends(_bearer)) -> CurrentUser:
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        raise _unauthorized("Not authenticated")
+    try:
+        claims = decode_access_token(credentials.credentials)
+    except InvalidToken as ex:
+        raise _unauthorized(f"Invalid token: {ex}")
+    if claims.locked or not claims.approved:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is locked or not approved")
+    return CurrentUser.from_claims(claims)
+
+
+
+async def require_admin(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    if not user.admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Requires an administrator")
+    return user
@@ -0,0 +1,46 @@
+from typing import Optional, Set
+
+from fastapi import Depends, HTTPException, status
+
+from app.core.authz import role_allows, roles_for
+from app.core.db import AsyncSessionLocal
+from app.infrastructure.repositories.project_member_repository_sqlalchemy import ProjectMemberRepository
+from app.presentation.dependencies.current_user import CurrentUser, get_current_user
+
+
+async def _load_roles(user_id: int) -> dict:
+    # Only on a cache miss; the request's own session is not involved
+    async with AsyncSessionLocal() as session:
+        return await ProjectMemberRepository(session).roles_for_user(user_id)
+
+
+async def check_project_role(user: CurrentUser, project_id: Optional[int], required: str) -> None:
+    """403 unless the caller holds at least `required` on `project_id`; admins always pass."""
+    if user.admin:
+        return
+    roles = await roles_for(user.id, _load_roles)
+    if project_id is None or not role_allows(roles.get(project_id), required):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail=f"Requires the {required} role on this project")
+
+
+async def visible_project_ids(user: CurrentUser) -> Optional[Set[int]]:
+    """Projects the caller may read, or None for no restriction (admins)."""
+    if user.admin:
+        return None
+    return set(await roles_for(user.id, _load_roles))
+
+
+def require_project_role(required: str):
+    """Dependency for routes under /projects/{project_id}: the caller needs at least `required` there."""
+
+    async def dependency(project_id: int, user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+        await check_project_role(user, project_id, required)
+        return user
+
+    return dependency
+
+
+require_viewer = require_project_role("viewer")
+require_tester = require_project_role("tester")
+require_manager = require_project_role("manager")
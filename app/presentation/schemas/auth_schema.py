@@ -0,0 +1,14 @@
+from pydantic import Field
+
+from .common import CamelModel
+
+
+class TokenRequest(CamelModel):
+    username: str = Field(min_length=1, max_length=128)
+    password: str = Field(min_length=1)
+
+
+class TokenResponse(CamelModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class FolderCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+    parentId: Optional[int] = None
+
+
+class FolderRename(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+
+
+class FolderMove(BaseModel):
+    parentId: Optional[int] = None  # null moves the folder to the top level
+
+
+class FolderOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    project_id: int
+    parent_id: Optional[int]
+    name: str
+    depth: Optional[int] = None  # set on list responses
+    created_at: datetime
+    updated_at: datetime
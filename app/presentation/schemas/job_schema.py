@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    status: str  # queued | running | succeeded | failed
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class JobAccepted(BaseModel):
+    job_id: int
+    status: str
+    # False when the request was folded into a job that was already waiting to run
+    created: bool
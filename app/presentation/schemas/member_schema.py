@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+ProjectRole = Literal["viewer", "tester", "manager"]
+
+
+class MemberSet(BaseModel):
+    role: ProjectRole
+
+
+class MemberOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    user_id: int
+    username: str
+    role: ProjectRole
+    created_at: datetime
+    updated_at: datetime
@@ -31,8 +31,8 @@ class PortfolioUpdate(CamelModel):
     is_active: Optional[bool] = None
     is_default: Optional[bool] = None
     custom_properties: Optional[Dict[str, Any]] = None
-    # Optimistic concurrency
-    concurrency_guid: UUID
+    # Optimistic concurrency; may come as If-Match: <ETag> instead
+    concurrency_guid: Optional[UUID] = None
 
 
 class PortfolioOut(CamelModel):
@@ -46,10 +46,18 @@ class PortfolioOut(CamelModel):
 
 
 class PortfolioPagedResult(CamelModel):
-    total: int
+    total: Optional[int]  # None when total=none; planner estimate when total=estimate
     items: List[PortfolioOut]
     page: int
     page_size: int
+    has_more: Optional[bool] = None
+
+
+class PortfolioCursorPage(CamelModel):
+    items: List[PortfolioOut]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    page_size: int
 
 
 class PortfolioDeleteResponse(CamelModel):
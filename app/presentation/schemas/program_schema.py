@@ -1,4 +1,5 @@
-from typing import Optional, Any, Dict
+from datetime import datetime
+from typing import Optional, Any, Dict, List
 from uuid import UUID
 
 from pydantic import Field
@@ -34,12 +35,19 @@ class ProgramUpdate(CamelModel):
     is_active: Optional[bool] = None
     is_default: Optional[bool] = None
     custom_properties: Optional[Dict[str, Any]] = None
-    # Optimistic concurrency
-    concurrency_guid: UUID
+    # Optimistic concurrency; may come as If-Match: <ETag> instead
+    concurrency_guid: Optional[UUID] = None
 
 
 class ProgramOut(ProgramBase):
     id: int
     guid: UUID
     concurrency_guid: UUID
-    last_updated_date: UUID
+    last_updated_date: datetime
+
+
+class ProgramCursorPage(CamelModel):
+    items: List[ProgramOut]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    page_size: int
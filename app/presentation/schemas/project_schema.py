@@ -1,11 +1,36 @@
 from datetime import datetime, date
-from typing import Optional
+from typing import Dict, Optional, List
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import AliasChoices, AliasGenerator, BaseModel, ConfigDict, Field, field_validator
+
+
+# Schema field -> Project model attribute, so ORM rows validate straight into the read schemas
+_MODEL_ATTRS = {
+    "ProjectId": "project_id",
+    "ProjectTemplateId": "project_template_id",
+    "ProjectGroupId": "project_group_id",
+    "Name": "name",
+    "Description": "description",
+    "Website": "website",
+    "Active": "is_active",
+    "Status": "status",
+    "WorkingHours": "working_hours",
+    "WorkingDays": "working_days",
+    "NonWorkingHours": "non_working_hours",
+    "StartDate": "start_date",
+    "EndDate": "end_date",
+    "PercentComplete": "percent_complete",
+    "CreationDate": "creation_date",
+}
+
+
+def _read_alias(field_name: str) -> AliasChoices:
+    return AliasChoices(field_name, _MODEL_ATTRS.get(field_name, field_name))
 
 
 class ProjectBase(BaseModel):
-    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True,
+                              alias_generator=AliasGenerator(validation_alias=_read_alias))
     ProjectTemplateId: Optional[int] = None
     ProjectGroupId: Optional[int] = None
     Name: str = Field(min_length=1, max_length=255)
@@ -61,15 +86,41 @@ class ProjectUpdate(BaseModel):
     PercentComplete: Optional[int] = Field(default=None, ge=0, le=100)
 
 
+class ProgressRollup(BaseModel):
+    """Persisted test progress (see ProjectProgressRepository); counts are keyed by id as string."""
+    model_config = ConfigDict(from_attributes=True)
+    release_id: Optional[int] = None
+    total_cases: int
+    done_cases: int
+    percent_complete: Optional[int] = None
+    by_status: Dict[str, int] = {}
+    by_type: Dict[str, int] = {}
+    by_priority: Dict[str, int] = {}
+    computed_at: datetime
+
+
+class ProjectProgressOut(ProgressRollup):
+    releases: List[ProgressRollup] = []
+
+
 class ProjectOut(ProjectBase):
     ProjectId: int
     CreationDate: datetime
+    Progress: Optional[ProjectProgressOut] = None  # None until the first refresh-caches run
 
 
 class ProjectSummary(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, alias_generator=AliasGenerator(validation_alias=_read_alias))
     ProjectId: int
     Environment: str
     Name: str
     Active: bool
     PercentComplete: Optional[int] = None
+    Progress: Optional[ProgressRollup] = None
+
+
+class ProjectCursorPage(BaseModel):
+    items: List[ProjectSummary]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    page_size: int
@@ -0,0 +1,22 @@
+from typing import Optional, List
+
+from .common import CamelModel
+
+
+class SearchHit(CamelModel):
+    entity_type: str
+    entity_id: int
+    project_id: Optional[int] = None
+    portfolio_id: Optional[int] = None
+    title: str
+    rank: float
+    # ts_headline fragments with matches wrapped in <mark>…</mark>
+    title_highlight: str
+    body_highlight: str
+
+
+class SearchResult(CamelModel):
+    q: str
+    items: List[SearchHit]
+    limit: int
+    offset: int
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class TestStepIn(BaseModel):
@@ -15,11 +15,37 @@ class TestStepIn(BaseModel):
 class TestStepOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    sequence: int
+    sequence: int = 0  # dense 1..n order; derived from position (see TestCaseOut)
+    position: int
     action: str
     expected_result: Optional[str]
 
 
+class TestStepInsert(BaseModel):
+    action: str
+    expected_result: Optional[str] = None
+    # Anchor: at most one; neither appends at the end
+    before_step_id: Optional[int] = None
+    after_step_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def one_anchor(self):
+        if self.before_step_id is not None and self.after_step_id is not None:
+            raise ValueError("give before_step_id or after_step_id, not both")
+        return self
+
+
+class TestStepMove(BaseModel):
+    before_step_id: Optional[int] = None
+    after_step_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def exactly_one_anchor(self):
+        if (self.before_step_id is None) == (self.after_step_id is None):
+            raise ValueError("give exactly one of before_step_id or after_step_id")
+        return self
+
+
 class TestCaseCreate(BaseModel):
     name: str
     description: Optional[str] = None
@@ -30,6 +56,64 @@ class TestCaseCreate(BaseModel):
     folderId: Optional[int] = None
 
 
+class TestStepImport(BaseModel):
+    sequence: int = Field(ge=1)
+    action: str
+    expected_result: Optional[str] = None
+
+
+class TestCaseImportRow(TestCaseCreate):
+    """One line of an NDJSON import (or one CSV row, with steps as a JSON array column)."""
+    steps: List[TestStepImport] = []
+
+    @field_validator("steps")
+    @classmethod
+    def unique_sequences(cls, steps: List[TestStepImport]) -> List[TestStepImport]:
+        seen = [s.sequence for s in steps]
+        if len(seen) != len(set(seen)):
+            raise ValueError("step sequence numbers must be unique")
+        return steps
+
+
+class TestCaseSelection(BaseModel):
+    """Targets of a bulk operation: explicit ids, or the /search filter grammar (an empty object selects all)."""
+    ids: Optional[List[int]] = Field(default=None, min_length=1)
+    filters: Optional[dict] = None
+    releaseId: Optional[int] = None
+
+    @model_validator(mode="after")
+    def ids_or_filters(self):
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("give exactly one of ids or filters")
+        return self
+
+
+class TestCaseBulkMove(TestCaseSelection):
+    folderId: Optional[int]
+
+
+class TestCaseBulkFields(BaseModel):
+    """Attributes a mass edit may set. Omitted fields are left alone; null clears a nullable one."""
+    testCaseStatusId: Optional[int] = None
+    testCaseTypeId: Optional[int] = None
+    priorityId: Optional[int] = None
+    releaseId: Optional[int] = None
+    folderId: Optional[int] = None
+
+    @model_validator(mode="after")
+    def something_to_set(self):
+        if not self.model_fields_set:
+            raise ValueError("set at least one field")
+        for required in ("testCaseStatusId", "testCaseTypeId"):
+            if required in self.model_fields_set and getattr(self, required) is None:
+                raise ValueError(f"{required} cannot be null")
+        return self
+
+
+class TestCaseBulkUpdate(TestCaseSelection):
+    set: TestCaseBulkFields
+
+
 class TestCaseUpdate(BaseModel):
     id: int
     name: Optional[str] = None
@@ -58,9 +142,66 @@ class TestCaseOut(BaseModel):
     updated_at: datetime
     steps: List[TestStepOut] = []
 
+    @model_validator(mode="after")
+    def number_steps(self):
+        # steps arrive ordered by position; expose the familiar dense sequence
+        for i, step in enumerate(self.steps, start=1):
+            step.sequence = i
+        return self
 
-class PagedResult(BaseModel):
+
+class FacetBucket(BaseModel):
+    value: Optional[int]
+    count: int
+
+
+class FacetCounts(BaseModel):
     total: int
+    facets: Dict[str, List[FacetBucket]]
+
+
+class PagedResult(BaseModel):
+    total: Optional[int]  # None when total=none; planner estimate when total=estimate
     items: List[TestCaseOut]
     page: int
     page_size: int
+    has_more: Optional[bool] = None
+
+
+class CursorPagedResult(BaseModel):
+    items: List[TestCaseOut]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    page_size: int
+
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based record number in the uploaded file (header excluded for CSV)
+    name: Optional[str] = None
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    dry_run: bool
+    rows: int
+    created: int
+    steps_created: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool = False
+
+
+class BulkResult(BaseModel):
+    affected: int
+    ids: List[int]
+
+
+class BulkRestoreResult(BulkResult):
+    # Selected cases left deleted because an active case (or a newer duplicate) owns the name
+    conflicts: List[int] = []
+
+
+class BulkUpdateResult(BulkResult):
+    dry_run: bool
+    # Cases that match the selection and would change (dry run) / did change
+    matched: int
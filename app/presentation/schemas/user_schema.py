@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 from pydantic import EmailStr, Field
 
@@ -45,6 +45,13 @@ class UserSummary(CamelModel):
     is_deleted: bool
 
 
+class UserCursorPage(CamelModel):
+    items: List[UserSummary]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    page_size: int
+
+
 class UserUpdate(CamelModel):
     username: Optional[str] = None
     email: Optional[EmailStr] = None
@@ -63,3 +70,28 @@ class UserUpdate(CamelModel):
 class UserDeleteResponse(CamelModel):
     message: str
     data: UserOut
+
+
+class UserProvisionResult(CamelModel):
+    row: int  # 1-based record number in the upload (header excluded for CSV)
+    username: Optional[str] = None
+    status: str  # created | failed
+    id: Optional[int] = None
+    errors: List[str] = []
+
+
+class UserProvisionReport(CamelModel):
+    rows: int
+    created: int
+    failed: int
+    results: List[UserProvisionResult]
+
+
+class UserIds(CamelModel):
+    ids: List[int] = Field(min_length=1, max_length=1000)
+
+
+class UserBulkFlagResult(CamelModel):
+    affected: int
+    ids: List[int]
+    not_found: List[int]
@@ -40,7 +40,9 @@ if db_url:
 from app.infrastructure.models.base import Base
 # Import each model module so tables register on Base.metadata
 from app.infrastructure.models import user_model, project_model, portfolio_model, program_model, \
-    testcase_model  # noqa: F401
+    testcase_model, test_case_counter_model, search_document_model, folder_model, \
+    project_progress_model, job_model, token_revocation_model, \
+    project_member_model  # noqa: F401
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,51 @@
+"""enable pg_trgm and add trigram name indexes
+
+Revision ID: 3f2a9c1d7b40
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b40'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column) — mirrors the gin_trgm_ops indexes declared on the models
+TRGM_INDEXES = [
+    ("ix_portfolios_name_trgm", "portfolios", "name"),
+    ("ix_programs_name_trgm", "programs", "name"),
+    ("ix_projects_name_trgm", "projects", "name"),
+    ("ix_test_cases_name_trgm", "test_cases", "name"),
+    ("ix_users_username_trgm", "users", "Username"),
+    ("ix_users_email_trgm", "users", "Email"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    # CONCURRENTLY so large tables stay writable; it cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, column in TRGM_INDEXES:
+            if table not in existing:
+                continue
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON {table} USING gin ("{column}" gin_trgm_ops)'
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in TRGM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    # The extension is left installed; other objects may depend on it
@@ -0,0 +1,59 @@
+"""test case counters per project / release / status / type
+
+Revision ID: 5a8c2e7f1d94
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8c2e7f1d94'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "test_cases" not in tables or "test_case_counters" in tables:
+        # Fresh database: autogenerate creates everything from the models
+        return
+
+    op.create_table(
+        "test_case_counters",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("release_id", sa.Integer(), nullable=True),
+        sa.Column("status_id", sa.Integer(), nullable=False),
+        sa.Column("type_id", sa.Integer(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.project_id"], ondelete="CASCADE",
+                                name="fk_test_case_counters_project_id_projects"),
+        sa.PrimaryKeyConstraint("id", name="pk_test_case_counters"),
+    )
+    op.create_index("uq_test_case_counters_key", "test_case_counters",
+                    ["project_id", "release_id", "status_id", "type_id"],
+                    unique=True, postgresql_nulls_not_distinct=True)
+
+    # Same numbers the reconcile command would produce, so counts are right from the first request
+    op.execute(
+        "INSERT INTO test_case_counters (project_id, release_id, status_id, type_id, count) "
+        "SELECT project_id, release_id, test_case_status_id, test_case_type_id, count(*) "
+        "FROM test_cases WHERE is_deleted = false "
+        "GROUP BY project_id, release_id, test_case_status_id, test_case_type_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "test_case_counters" not in tables:
+        return
+    op.drop_table("test_case_counters")
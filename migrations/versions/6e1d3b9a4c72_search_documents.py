@@ -0,0 +1,64 @@
+"""search documents with a generated tsvector
+
+Revision ID: 6e1d3b9a4c72
+Revises: 5a8c2e7f1d94
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1d3b9a4c72'
+down_revision: Union[str, Sequence[str], None] = '5a8c2e7f1d94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.infrastructure.models.search_document_model.SEARCH_CONFIG
+SEARCH_CONFIG = "english"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "test_cases" not in tables or "search_documents" in tables:
+        # Fresh database: autogenerate creates everything from the models
+        return
+
+    op.create_table(
+        "search_documents",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("entity_type", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=True),
+        sa.Column("portfolio_id", sa.Integer(), nullable=True),
+        sa.Column("title", sa.Text(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=True),
+        sa.Column(
+            "tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(body, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id", name="pk_search_documents"),
+        sa.UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+    )
+    op.create_index("ix_search_documents_tsv", "search_documents", ["tsv"], postgresql_using="gin")
+    op.create_index("ix_search_documents_project_type", "search_documents", ["project_id", "entity_type"])
+    # Existing rows are indexed by: python -m app.infrastructure.commands.rebuild_search_index
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "search_documents" not in tables:
+        return
+    op.drop_table("search_documents")
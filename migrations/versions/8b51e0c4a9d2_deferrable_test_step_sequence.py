@@ -0,0 +1,42 @@
+"""make uq_test_step_sequence_per_case deferrable
+
+Revision ID: 8b51e0c4a9d2
+Revises: 6e1d3b9a4c72
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b51e0c4a9d2'
+down_revision: Union[str, Sequence[str], None] = '6e1d3b9a4c72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT = "uq_test_step_sequence_per_case"
+
+
+def _has_test_steps() -> bool:
+    return "test_steps" in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_test_steps():
+        return
+    # Postgres can only ALTER CONSTRAINT foreign keys; unique constraints are recreated
+    op.drop_constraint(CONSTRAINT, "test_steps", type_="unique")
+    op.create_unique_constraint(CONSTRAINT, "test_steps", ["test_case_id", "sequence"],
+                                deferrable=True, initially="IMMEDIATE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _has_test_steps():
+        return
+    op.drop_constraint(CONSTRAINT, "test_steps", type_="unique")
+    op.create_unique_constraint(CONSTRAINT, "test_steps", ["test_case_id", "sequence"])
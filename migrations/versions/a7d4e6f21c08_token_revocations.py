@@ -0,0 +1,42 @@
+"""access token revocation list
+
+Revision ID: a7d4e6f21c08
+Revises: f3b7d1c98e24
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e6f21c08'
+down_revision: Union[str, Sequence[str], None] = 'f3b7d1c98e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "users" not in tables or "token_revocations" in tables:
+        # Fresh database: autogenerate creates everything from the models
+        return
+
+    op.create_table(
+        "token_revocations",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", name="pk_token_revocations"),
+    )
+    op.create_index("ix_token_revocations_revoked_at", "token_revocations", ["revoked_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "token_revocations" not in tables:
+        return
+    op.drop_table("token_revocations")
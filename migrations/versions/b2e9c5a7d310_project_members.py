@@ -0,0 +1,50 @@
+"""project memberships and roles
+
+Revision ID: b2e9c5a7d310
+Revises: a7d4e6f21c08
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e9c5a7d310'
+down_revision: Union[str, Sequence[str], None] = 'a7d4e6f21c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "projects" not in tables or "project_members" in tables:
+        # Fresh database: autogenerate creates everything from the models
+        return
+
+    op.create_table(
+        "project_members",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(length=16), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint("role IN ('viewer', 'tester', 'manager')", name="ck_project_members_role"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.project_id"], ondelete="CASCADE",
+                                name="fk_project_members_project_id_projects"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE",
+                                name="fk_project_members_user_id_users"),
+        sa.PrimaryKeyConstraint("project_id", "user_id", name="pk_project_members"),
+    )
+    op.create_index("ix_project_members_user_id", "project_members", ["user_id", "project_id", "role"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "project_members" not in tables:
+        return
+    op.drop_table("project_members")
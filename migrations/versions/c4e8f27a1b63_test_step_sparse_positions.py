@@ -0,0 +1,55 @@
+"""replace test_steps.sequence with sparse position
+
+Revision ID: c4e8f27a1b63
+Revises: 8b51e0c4a9d2
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8f27a1b63'
+down_revision: Union[str, Sequence[str], None] = '8b51e0c4a9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match STEP_POSITION_GAP in app.infrastructure.models.testcase_model
+GAP = 65536
+
+
+def _has_test_steps() -> bool:
+    return "test_steps" in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_test_steps():
+        return
+    op.add_column("test_steps", sa.Column("position", sa.BigInteger(), nullable=True))
+    op.execute(f"UPDATE test_steps SET position = sequence::bigint * {GAP}")
+    op.alter_column("test_steps", "position", nullable=False)
+    op.drop_constraint("uq_test_step_sequence_per_case", "test_steps", type_="unique")
+    op.drop_column("test_steps", "sequence")
+    op.create_unique_constraint("uq_test_step_position_per_case", "test_steps", ["test_case_id", "position"],
+                                deferrable=True, initially="IMMEDIATE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _has_test_steps():
+        return
+    op.add_column("test_steps", sa.Column("sequence", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE test_steps SET sequence = r.rn FROM ("
+        " SELECT id, row_number() OVER (PARTITION BY test_case_id ORDER BY position) AS rn FROM test_steps"
+        ") r WHERE test_steps.id = r.id"
+    )
+    op.alter_column("test_steps", "sequence", nullable=False)
+    op.drop_constraint("uq_test_step_position_per_case", "test_steps", type_="unique")
+    op.drop_column("test_steps", "position")
+    op.create_unique_constraint("uq_test_step_sequence_per_case", "test_steps", ["test_case_id", "sequence"],
+                                deferrable=True, initially="IMMEDIATE")
@@ -0,0 +1,42 @@
+"""projects.concurrency_guid for ETags / If-Match
+
+Revision ID: c6f1a9e3d527
+Revises: b2e9c5a7d310
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a9e3d527'
+down_revision: Union[str, Sequence[str], None] = 'b2e9c5a7d310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "projects" not in tables or "concurrency_guid" in _columns("projects"):
+        # Fresh database: autogenerate creates everything from the models
+        return
+    # gen_random_uuid() is volatile, so existing rows are rewritten once with distinct values
+    op.add_column("projects", sa.Column("concurrency_guid", postgresql.UUID(as_uuid=True), nullable=False,
+                                        server_default=sa.text("gen_random_uuid()")))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "projects" not in tables or "concurrency_guid" not in _columns("projects"):
+        return
+    op.drop_column("projects", "concurrency_guid")
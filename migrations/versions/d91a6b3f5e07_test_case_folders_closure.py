@@ -0,0 +1,99 @@
+"""test case folders with closure table
+
+Revision ID: d91a6b3f5e07
+Revises: c4e8f27a1b63
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91a6b3f5e07'
+down_revision: Union[str, Sequence[str], None] = 'c4e8f27a1b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "test_cases" not in tables or "test_case_folders" in tables:
+        # Fresh database: autogenerate creates everything from the models
+        return
+
+    op.create_table(
+        "test_case_folders",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.project_id"], ondelete="CASCADE",
+                                name="fk_test_case_folders_project_id_projects"),
+        sa.ForeignKeyConstraint(["parent_id"], ["test_case_folders.id"], ondelete="CASCADE",
+                                name="fk_test_case_folders_parent_id_test_case_folders"),
+        sa.PrimaryKeyConstraint("id", name="pk_test_case_folders"),
+    )
+    op.create_index("uq_test_case_folders_sibling_name", "test_case_folders", ["project_id", "parent_id", "name"],
+                    unique=True, postgresql_nulls_not_distinct=True)
+    op.create_table(
+        "test_case_folder_closure",
+        sa.Column("ancestor_id", sa.Integer(), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["test_case_folders.id"], ondelete="CASCADE",
+                                name="fk_test_case_folder_closure_ancestor_id_test_case_folders"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["test_case_folders.id"], ondelete="CASCADE",
+                                name="fk_test_case_folder_closure_descendant_id_test_case_folders"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id", name="pk_test_case_folder_closure"),
+    )
+    op.create_index("ix_test_case_folder_closure_descendant", "test_case_folder_closure",
+                    ["descendant_id", "depth"])
+
+    # Existing bare folder ids become top-level placeholder folders so no case loses its folder.
+    # The lowest project using an id keeps it; every other project using the same id gets a
+    # placeholder of its own and its cases are remapped, so a case's folder is always in its project.
+    op.execute(
+        "INSERT INTO test_case_folders (id, project_id, name) "
+        "SELECT DISTINCT ON (folder_id) folder_id, project_id, 'Folder ' || folder_id "
+        "FROM test_cases WHERE folder_id IS NOT NULL ORDER BY folder_id, project_id"
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('test_case_folders', 'id'), "
+        "COALESCE((SELECT max(id) FROM test_case_folders), 0) + 1, false)"
+    )
+    op.execute(
+        "WITH shared AS ("
+        "  SELECT DISTINCT tc.project_id, tc.folder_id FROM test_cases tc"
+        "  JOIN test_case_folders f ON f.id = tc.folder_id WHERE f.project_id <> tc.project_id"
+        "), made AS ("
+        "  INSERT INTO test_case_folders (project_id, name)"
+        "  SELECT project_id, 'Folder ' || folder_id FROM shared RETURNING id, project_id, name"
+        ") "
+        "UPDATE test_cases tc SET folder_id = made.id FROM made "
+        "WHERE made.project_id = tc.project_id AND made.name = 'Folder ' || tc.folder_id"
+    )
+    op.execute(
+        "INSERT INTO test_case_folder_closure (ancestor_id, descendant_id, depth) "
+        "SELECT id, id, 0 FROM test_case_folders"
+    )
+
+    op.create_index("ix_test_cases_folder_id", "test_cases", ["folder_id"])
+    op.create_foreign_key("fk_test_cases_folder_id_test_case_folders", "test_cases", "test_case_folders",
+                          ["folder_id"], ["id"], ondelete="SET NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "test_case_folders" not in tables:
+        return
+    op.drop_constraint("fk_test_cases_folder_id_test_case_folders", "test_cases", type_="foreignkey")
+    op.drop_index("ix_test_cases_folder_id", table_name="test_cases")
+    op.drop_table("test_case_folder_closure")
+    op.drop_table("test_case_folders")
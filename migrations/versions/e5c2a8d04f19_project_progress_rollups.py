@@ -0,0 +1,58 @@
+"""persisted project progress rollups
+
+Revision ID: e5c2a8d04f19
+Revises: d91a6b3f5e07
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c2a8d04f19'
+down_revision: Union[str, Sequence[str], None] = 'd91a6b3f5e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "test_cases" not in tables or "project_progress" in tables:
+        # Fresh database: autogenerate creates everything from the models
+        return
+
+    op.create_table(
+        "project_progress",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("release_id", sa.Integer(), nullable=True),
+        sa.Column("total_cases", sa.BigInteger(), nullable=False),
+        sa.Column("done_cases", sa.BigInteger(), nullable=False),
+        sa.Column("percent_complete", sa.Integer(), nullable=True),
+        sa.Column("by_status", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("by_type", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("by_priority", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("cases_watermark", sa.DateTime(), nullable=True),
+        sa.Column("counters_watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.project_id"], ondelete="CASCADE",
+                                name="fk_project_progress_project_id_projects"),
+        sa.PrimaryKeyConstraint("id", name="pk_project_progress"),
+    )
+    op.create_index("uq_project_progress_scope", "project_progress", ["project_id", "release_id"],
+                    unique=True, postgresql_nulls_not_distinct=True)
+    op.create_index("ix_test_cases_updated_at", "test_cases", ["updated_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "project_progress" not in tables:
+        return
+    op.drop_index("ix_test_cases_updated_at", table_name="test_cases")
+    op.drop_table("project_progress")
@@ -0,0 +1,73 @@
+"""
+Event-loop latency while passwords are being hashed: inline bcrypt vs. the process pool.
+
+A probe coroutine stands in for unrelated GETs (a short awaited I/O call, 5 ms by default)
+and is timed repeatedly while `--concurrency` user creations hash passwords in parallel.
+Inline hashing holds the loop for the whole bcrypt call, so probe latency jumps to the
+hash time; with the pool the probes stay close to their I/O time.
+
+    PYTHONPATH=. python scripts/bench_password_hashing.py [--concurrency 8] [--hashes 32]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.hashing import PasswordHasher
+from app.core.settings import get_password_hash
+
+
+def pct(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))] * 1000
+
+
+async def probe(stop: asyncio.Event, io_seconds: float, samples: list) -> None:
+    while not stop.is_set():
+        t = time.perf_counter()
+        await asyncio.sleep(io_seconds)
+        samples.append(time.perf_counter() - t)
+
+
+async def run(mode: str, concurrency: int, hashes: int, workers: int, io_seconds: float) -> None:
+    hasher = PasswordHasher(workers, max_pending=hashes)
+    if mode == "pool":
+        await hasher.hash("warm-up")  # start the worker processes outside the measurement
+    sem = asyncio.Semaphore(concurrency)
+
+    async def create_user(n: int) -> None:
+        async with sem:
+            if mode == "inline":
+                get_password_hash(f"password-{n}")
+            else:
+                await hasher.hash(f"password-{n}")
+            await asyncio.sleep(0)
+
+    stop = asyncio.Event()
+    samples: list = []
+    probes = [asyncio.create_task(probe(stop, io_seconds, samples)) for _ in range(4)]
+    started = time.perf_counter()
+    await asyncio.gather(*(create_user(n) for n in range(hashes)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*probes)
+    hasher.shutdown()
+
+    print(f"{mode:>6}: {hashes} hashes in {elapsed:6.2f}s | probe GETs n={len(samples):5d} "
+          f"p50={pct(samples, 50):7.1f}ms p99={pct(samples, 99):7.1f}ms "
+          f"max={max(samples) * 1000:7.1f}ms mean={statistics.mean(samples) * 1000:6.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="user creations in flight")
+    parser.add_argument("--hashes", type=int, default=32, help="total user creations")
+    parser.add_argument("--workers", type=int, default=2, help="process pool size")
+    parser.add_argument("--io-ms", type=float, default=5.0, help="simulated I/O time of a probe GET")
+    args = parser.parse_args()
+    for mode in ("inline", "pool"):
+        asyncio.run(run(mode, args.concurrency, args.hashes, args.workers, args.io_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()